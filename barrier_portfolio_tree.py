@@ -0,0 +1,123 @@
+import numpy as np
+
+from portfolios import OptionExecutionPortfolio, OptionReplicatingPortfolio
+
+
+class BarrierPortfolioTree:
+    NOT_KNOCKED_IN = 0
+    KNOCKED_IN = 1
+
+    class _PriceInfo:
+        def __init__(self, curr, max_encountered):
+            self.curr = curr
+            self.max_encountered = max_encountered
+
+    def __init__(self, share_weights, bond_weights, stock_prices, barrier_price, period_count):
+        # one (node, knock state) array per level; node index is the number of down moves taken to reach the node
+        self._share_weights = share_weights
+        self._bond_weights = bond_weights
+        self._stock_prices = stock_prices
+        self._prices = [
+            (share_weights[level] + bond_weights[level]) * stock_prices[level][:, np.newaxis]
+            for level in range(period_count)
+        ]
+        self._should_execute = [np.zeros((level + 1, 2), dtype=bool) for level in range(period_count)]
+        self._is_execution = [np.zeros((level + 1, 2), dtype=bool) for level in range(period_count)]
+        self.barrier_price = barrier_price
+        self.period_count = period_count
+
+    @staticmethod
+    def split_children_values(values, is_child_hit):
+        # values are (node, knock state) arrays of the child level; a parent that is not knocked in moves
+        # to the knocked in state of every child node at or above the barrier
+        children_values = np.column_stack([
+            np.where(is_child_hit, values[:, BarrierPortfolioTree.KNOCKED_IN], values[:, BarrierPortfolioTree.NOT_KNOCKED_IN]),
+            values[:, BarrierPortfolioTree.KNOCKED_IN],
+        ])
+        return children_values[:-1], children_values[1:]
+
+    @staticmethod
+    def get_payouts(option, stock_prices):
+        return np.column_stack([
+            option.get_payouts(stock_prices, stock_prices),
+            option.get_payouts(stock_prices, np.maximum(stock_prices, option.barrier_price)),
+        ])
+
+    def is_barrier_hit(self, level, index):
+        return self._stock_prices[0][0] >= self.barrier_price or self._stock_prices[level][index] >= self.barrier_price
+
+    def get_stock_price_data(self, level, index):
+        # running maximum is path dependent; the lattice only tracks whether the barrier has been hit
+        return BarrierPortfolioTree._PriceInfo(self._stock_prices[level][index], np.nan)
+
+    def get_children_stock_price_data(self, level, index):
+        return self.get_stock_price_data(level + 1, index), self.get_stock_price_data(level + 1, index + 1)
+
+    def update_portfolio(self, level, index, portfolio, knocked_in=None):
+        state = self._get_state(level, index, knocked_in)
+
+        if isinstance(portfolio, OptionExecutionPortfolio):
+            self._prices[level][index, state] = portfolio.price
+            self._should_execute[level][index, state] = portfolio.should_execute
+            self._is_execution[level][index, state] = True
+        else:
+            self._share_weights[level][index, state] = portfolio.share_weight
+            self._bond_weights[level][index, state] = portfolio.bond_weight
+            self._prices[level][index, state] = portfolio.get_price()
+            self._is_execution[level][index, state] = False
+
+    def get_root_portfolio(self):
+        return self.get_portfolio(0, 0)
+
+    def get_portfolio(self, level, index, knocked_in=None):
+        # without an explicit knock state the least knocked state consistent with the node is returned
+        state = self._get_state(level, index, knocked_in)
+
+        if self._is_execution[level][index, state]:
+            return OptionExecutionPortfolio(
+                self._prices[level][index, state], bool(self._should_execute[level][index, state])
+            )
+
+        return OptionReplicatingPortfolio(
+            self._share_weights[level][index, state],
+            self._bond_weights[level][index, state],
+            self._stock_prices[level][index],
+        )
+
+    def get_children_portfolios(self, level, index, knocked_in=None):
+        knocked_in = bool(self._get_state(level, index, knocked_in))
+        return (
+            self.get_portfolio(level + 1, index, knocked_in or self.is_barrier_hit(level + 1, index)),
+            self.get_portfolio(level + 1, index + 1, knocked_in or self.is_barrier_hit(level + 1, index + 1)),
+        )
+
+    def has_children_portfolios(self, level, _):
+        return level < self.period_count - 1
+
+    def get_period_count(self):
+        return self.period_count
+
+    def get_node_count_at_period(self, period):
+        assert period < self.period_count
+        return period + 1
+
+    def get_node_count(self):
+        return 2 * sum(len(level_stock_prices) for level_stock_prices in self._stock_prices)
+
+    def get_memory_size(self):
+        return sum(
+            level_values.nbytes
+            for field_levels in [
+                self._stock_prices, self._share_weights, self._bond_weights, self._prices, self._should_execute,
+                self._is_execution,
+            ]
+            for level_values in field_levels
+        )
+
+    def _get_state(self, level, index, knocked_in):
+        if knocked_in is None:
+            knocked_in = self.is_barrier_hit(level, index)
+        elif not knocked_in and self.is_barrier_hit(level, index):
+            raise RuntimeError("node (%d, %d) can not be reached without hitting the barrier" % (level, index))
+
+        return BarrierPortfolioTree.KNOCKED_IN if knocked_in else BarrierPortfolioTree.NOT_KNOCKED_IN
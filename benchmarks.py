@@ -0,0 +1,256 @@
+import argparse
+import json
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+import black_scholes
+from binomial_tree_american import BinomialTreeAmerican
+from binomial_tree_european import BinomialTreeEuropean
+from crr import CRRBinomialTreeParameters
+from extrapolated_pricer import ExtrapolatedBinomialPricer
+from greek_calculator import GreekCalculator
+from option import Option, BarrierOption
+from utils import get_discount_rate
+
+
+class BenchmarkSuite:
+    FULL_TREE_PERIOD_COUNTS = [4, 8, 12, 16]
+    LATTICE_PERIOD_COUNTS = [100, 500, 1000, 2000]
+    BOOK_SIZES = [1_000, 10_000, 100_000]
+    GREEK_BOOK_SIZES = [10, 100]
+
+    QUICK_FULL_TREE_PERIOD_COUNTS = [4, 8]
+    QUICK_LATTICE_PERIOD_COUNTS = [50, 100]
+    QUICK_BOOK_SIZES = [100, 1_000]
+    QUICK_GREEK_BOOK_SIZES = [10]
+
+    SINGLE_QUOTE_COUNT = 1_000
+    IMPORTED_MODULES = ["black_scholes", "book_pricer"]
+
+    def __init__(self, quick=False, repeat_count=3):
+        self.quick = quick
+        self.repeat_count = repeat_count
+
+    def run(self):
+        full_tree_period_counts = self.QUICK_FULL_TREE_PERIOD_COUNTS if self.quick else self.FULL_TREE_PERIOD_COUNTS
+        lattice_period_counts = self.QUICK_LATTICE_PERIOD_COUNTS if self.quick else self.LATTICE_PERIOD_COUNTS
+        book_sizes = self.QUICK_BOOK_SIZES if self.quick else self.BOOK_SIZES
+        greek_book_sizes = self.QUICK_GREEK_BOOK_SIZES if self.quick else self.GREEK_BOOK_SIZES
+
+        results = []
+
+        for period_count in full_tree_period_counts:
+            for name, tree_kwargs, option in [
+                ("european_tree", {}, Option.long_call_option(100)),
+                ("american_tree", {"american": True}, Option.long_put_option(100)),
+                ("american_barrier_tree", {"american": True}, BarrierOption(Option.long_put_option(100), 110)),
+            ]:
+                results.append(self._measure(name, period_count, lambda: self._build_tree(
+                    period_count, option, **tree_kwargs
+                ).calculate_replicating_portfolios()))
+
+        for period_count in lattice_period_counts:
+            for name, tree_kwargs, option in [
+                ("european_lattice", {"recombining": True}, Option.long_call_option(100)),
+                ("european_lattice_price_only", {"recombining": True, "price_only": True}, Option.long_call_option(100)),
+                ("american_lattice_price_only", {"recombining": True, "price_only": True, "american": True}, Option.long_put_option(100)),
+                ("barrier_lattice_price_only", {"recombining": True, "price_only": True}, BarrierOption(Option.long_put_option(100), 110)),
+            ]:
+                results.append(self._measure(name, period_count, lambda: self._build_tree(
+                    period_count, option, **tree_kwargs
+                ).calculate_price()))
+
+            results.append(self._measure("american_lattice_bbsr", period_count, lambda: ExtrapolatedBinomialPricer(
+                100, 0.2, 1, 0.05, Option.long_put_option(100), period_count, early_exercise=True
+            ).calculate_price()))
+
+        # start up cost of short lived jobs: a fresh interpreter importing the module, to be read against interpreter_start
+        for module_name in self.IMPORTED_MODULES:
+            results.append(self._measure("import_" + module_name, 1, lambda: subprocess.run(
+                [sys.executable, "-c", "import " + module_name], check=True
+            )))
+        results.append(self._measure("interpreter_start", 1, lambda: subprocess.run([sys.executable, "-c", "pass"], check=True)))
+
+        bs_option = black_scholes.Option()
+        single_quote_parameters = black_scholes.Option.OptionParameters(230, 235, 5e-3, 0.3, 1 / 12)
+        results.append(self._measure("black_scholes_single_quote", self.SINGLE_QUOTE_COUNT, lambda: [
+            bs_option.get_call_price(single_quote_parameters) for _ in range(self.SINGLE_QUOTE_COUNT)
+        ]))
+
+        for book_size in book_sizes:
+            parameters, is_call = self._get_book(book_size)
+
+            results.append(self._measure("black_scholes_scalar", book_size, lambda: [
+                (bs_option.get_call_price if is_call[index] else bs_option.get_put_price)(self._get_position(parameters, index))
+                for index in range(book_size)
+            ]))
+            results.append(self._measure("black_scholes_batch", book_size, lambda: bs_option.get_prices(parameters, is_call)))
+            results.append(self._measure("black_scholes_batch_greeks", book_size, lambda: bs_option.get_greeks(parameters, is_call)))
+
+        for book_size in greek_book_sizes:
+            parameters, is_call = self._get_book(book_size)
+
+            results.append(self._measure("greek_calculator_single_greeks", book_size, lambda: [
+                [
+                    getattr(GreekCalculator(bs_option.get_call_price), name)(self._get_position(parameters, index))
+                    for name in ["delta", "gamma", "theta", "vega", "rho"]
+                ]
+                for index in range(book_size)
+            ]))
+            results.append(self._measure("greek_calculator_all_greeks", book_size, lambda: [
+                GreekCalculator(bs_option.get_call_price).all_greeks(self._get_position(parameters, index))
+                for index in range(book_size)
+            ]))
+
+        return results
+
+    @staticmethod
+    def compare(results, baseline, threshold=0.2):
+        # returns the benchmarks whose wall time grew by more than threshold relative to the baseline
+        baseline_wall_times = {(result["name"], result["size"]): result["wall_time"] for result in baseline}
+
+        regressions = []
+        for result in results:
+            baseline_wall_time = baseline_wall_times.get((result["name"], result["size"]))
+            if baseline_wall_time is not None and result["wall_time"] > baseline_wall_time * (1 + threshold):
+                regressions.append(dict(result, baseline_wall_time=baseline_wall_time))
+
+        return regressions
+
+    def _measure(self, name, size, callback):
+        wall_time = float("inf")
+        for _ in range(self.repeat_count):
+            start = time.perf_counter()
+            callback()
+            wall_time = min(wall_time, time.perf_counter() - start)
+
+        # memory is traced in a separate run so that tracing overhead does not distort the timings
+        tracemalloc.start()
+        try:
+            allocated_blocks, allocated_bytes = self._count_allocations(callback)
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return {
+            "name": name,
+            "size": size,
+            "wall_time": wall_time,
+            "peak_memory_bytes": peak_memory,
+            "allocated_blocks": allocated_blocks,
+            "allocated_bytes": allocated_bytes,
+        }
+
+    @staticmethod
+    def _count_allocations(callback):
+        # python has no allocation counter, so the allocated pymalloc blocks and traced bytes are sampled on
+        # every profiler event of the run and their increases summed, unlike the net growth that barely moves
+        # for engines which free everything they allocate. The sampler's own allocations, measured on an empty
+        # run, are subtracted; memory allocated and freed within one c call is missed, so the totals are
+        # approximate
+        baseline_blocks, baseline_bytes = BenchmarkSuite._sample_allocations(lambda: None)
+        allocated_blocks, allocated_bytes = BenchmarkSuite._sample_allocations(callback)
+
+        return max(allocated_blocks - baseline_blocks, 0), max(allocated_bytes - baseline_bytes, 0)
+
+    @staticmethod
+    def _sample_allocations(callback):
+        totals = [0, 0]
+        last_samples = [sys.getallocatedblocks(), tracemalloc.get_traced_memory()[0]]
+
+        def sample(*_):
+            samples = (sys.getallocatedblocks(), tracemalloc.get_traced_memory()[0])
+            for index, value in enumerate(samples):
+                totals[index] += max(value - last_samples[index], 0)
+                last_samples[index] = value
+
+        sys.setprofile(sample)
+        try:
+            callback()
+        finally:
+            sys.setprofile(None)
+        sample()
+
+        return totals[0], totals[1]
+
+    @staticmethod
+    def _build_tree(period_count, option, american=False, **kwargs):
+        crr_parameters = CRRBinomialTreeParameters(stock_price_volatility=0.2, time_horizon=1, period_count=period_count)
+
+        tree = BinomialTreeEuropean(
+            up_factor=crr_parameters.get_up_factor(),
+            down_factor=crr_parameters.get_down_factor(),
+            period_discount_rate=get_discount_rate(continuous_interest_rate=0.05, period_length=1 / period_count),
+            period_count=period_count,
+            stock_price=100,
+            option=option,
+            **kwargs
+        )
+
+        return BinomialTreeAmerican(tree) if american else tree
+
+    @staticmethod
+    def _get_book(book_size):
+        random_state = np.random.RandomState(0)
+
+        parameters = black_scholes.Option.OptionParameters(
+            stock_price=100,
+            strike_price=random_state.uniform(60, 140, book_size),
+            risk_free_rate=0.02,
+            volatility=random_state.uniform(0.1, 0.6, book_size),
+            maturity_time=random_state.uniform(0.05, 3, book_size),
+        )
+        return parameters, random_state.uniform(size=book_size) < 0.5
+
+    @staticmethod
+    def _get_position(parameters, index):
+        return black_scholes.Option.OptionParameters(
+            parameters.stock_price,
+            parameters.strike_price[index],
+            parameters.risk_free_rate,
+            parameters.volatility[index],
+            parameters.maturity_time[index],
+        )
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Benchmark the pricing engines")
+    parser.add_argument("--quick", action="store_true", help="run the reduced sweep")
+    parser.add_argument("--repeat", type=int, default=3, help="timing repetitions, the best one is reported")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="compare against results previously written with --output")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative wall time growth")
+    arguments = parser.parse_args(arguments)
+
+    results = BenchmarkSuite(quick=arguments.quick, repeat_count=arguments.repeat).run()
+
+    for result in results:
+        print("%-35s %8d %12.6fs %14d B %10d blocks %14d B allocated" % (
+            result["name"], result["size"], result["wall_time"], result["peak_memory_bytes"],
+            result["allocated_blocks"], result["allocated_bytes"],
+        ))
+
+    if arguments.output:
+        with open(arguments.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+
+    if arguments.baseline:
+        with open(arguments.baseline) as baseline_file:
+            regressions = BenchmarkSuite.compare(results, json.load(baseline_file), arguments.threshold)
+
+        for regression in regressions:
+            print("REGRESSION %s[%d]: %.6fs vs baseline %.6fs" % (
+                regression["name"], regression["size"], regression["wall_time"], regression["baseline_wall_time"]
+            ))
+
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
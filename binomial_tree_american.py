@@ -1,10 +1,14 @@
-from option import PriceInfo
-from portfolios import OptionExecutionPortfolio
+import numpy as np
+
+from barrier_portfolio_tree import BarrierPortfolioTree
+from lattice_greeks import LatticeGreekCalculator
+from option import BarrierOption
+from rolling_lattice import RollingLattice
 from utils import get_risk_neutral_probability
 
 
 class BinomialTreeAmerican:
-    def __init__(self, european_tree):
+    def __init__(self, european_tree, price_only=None, instrumentation=None):
         self.european_tree = european_tree
         self.up_factor = european_tree.up_factor
         self.down_factor = european_tree.down_factor
@@ -13,59 +17,138 @@ class BinomialTreeAmerican:
         self.stock_price = european_tree.stock_price
         self.option = european_tree.option
         self.discount_rate_factor_gen = european_tree.discount_rate_factor_gen
+        self.price_only = european_tree.price_only if price_only is None else price_only
+        self.instrumentation = instrumentation or european_tree.instrumentation
+
+        if self.price_only and not european_tree.recombining:
+            raise RuntimeError("price only mode requires the recombining lattice")
+
+    def calculate_price(self):
+        if self.price_only:
+            return RollingLattice(self.european_tree, early_exercise=True, instrumentation=self.instrumentation).calculate_price()
+
+        return self.calculate_exercise_region()[0]
+
+    def calculate_greeks(self, tree_parameters, volatility_step=1e-3, rate_step=1e-4):
+        greek_calculator = LatticeGreekCalculator(self.european_tree, tree_parameters, early_exercise=True)
+
+        if self.price_only:
+            top_prices = greek_calculator.calculate_rolling_top_prices()
+        else:
+            top_prices = greek_calculator.get_top_prices(self.calculate_replicating_portfolios())
+
+        return greek_calculator.calculate_greeks(top_prices, volatility_step, rate_step)
 
     def calculate_replicating_portfolios(self):
-        portfolio_tree = self.european_tree.calculate_replicating_portfolios()
-        up_probability = get_risk_neutral_probability(self.discount_rate_factor_gen(self.period_discount_rate), self.up_factor, self.down_factor)
+        if self.price_only:
+            raise RuntimeError("replicating portfolios are not kept in price only mode")
+        if self._is_barrier_lattice():
+            raise RuntimeError("replicating portfolios are not supported on the recombining barrier lattice")
 
-        for period_index in reversed(range(portfolio_tree.get_period_count())):
-            for node_index in range(portfolio_tree.get_node_count_at_period(period_index)):
-                portfolio = portfolio_tree.get_portfolio(period_index, node_index)
-
-                up_price, down_price = self._get_price_pair(portfolio_tree, period_index, node_index)
-
-                continuation_price = (up_price * up_probability + down_price * (1 - up_probability)) / self.discount_rate_factor_gen(self.period_discount_rate)
-                execution_price = self.option.get_payout(PriceInfo(
-                    portfolio.stock_price,
-                    portfolio_tree.get_stock_price_data(period_index, node_index).max_encountered,
-                ))
-
-                if execution_price > continuation_price:
-                    portfolio_tree.update_portfolio(
-                        period_index, node_index,
-                        OptionExecutionPortfolio(execution_price, should_execute=True)
-                    )
-                else:
-                    portfolio_tree.update_portfolio(
-                        period_index, node_index,
-                        OptionExecutionPortfolio(continuation_price, should_execute=False)
-                    )
+        with self.instrumentation.run():
+            with self.instrumentation.phase("european_tree"):
+                portfolio_tree = self.european_tree.calculate_replicating_portfolios()
+
+            with self.instrumentation.phase("early_exercise"):
+                self._update_exercise_portfolios(portfolio_tree)
 
         return portfolio_tree
 
-    def _get_price_pair(self, portfolio_tree, period_index, node_index):
-        if not portfolio_tree.has_children_portfolios(period_index, node_index):
-            return self._get_terminal_price_pair(portfolio_tree, period_index, node_index)
-        else:
-            return self._get_non_terminal_price_pair(portfolio_tree, period_index, node_index)
+    def _update_exercise_portfolios(self, portfolio_tree):
+        discount_factor = self.discount_rate_factor_gen(self.period_discount_rate)
+        up_probability = get_risk_neutral_probability(discount_factor, self.up_factor, self.down_factor)
+
+        prices = self.option.get_payouts(
+            portfolio_tree.get_stock_prices(self.period_count), portfolio_tree.get_max_encountered(self.period_count)
+        )
+
+        for period_index in reversed(range(portfolio_tree.get_period_count())):
+            up_prices, down_prices = portfolio_tree.split_children_values(prices)
+
+            continuation_prices = (up_prices * up_probability + down_prices * (1 - up_probability)) / discount_factor
+            execution_prices = self.option.get_payouts(
+                portfolio_tree.get_stock_prices(period_index), portfolio_tree.get_max_encountered(period_index)
+            )
+
+            should_execute = portfolio_tree.get_should_execute(period_index)
+            np.greater(execution_prices, continuation_prices, out=should_execute)
+
+            prices = portfolio_tree.get_prices(period_index)
+            prices[:] = np.where(should_execute, execution_prices, continuation_prices)
+
+        self.instrumentation.add_payout_call_count(self.period_count + 1)
+
+    def calculate_exercise_region(self):
+        # single backward pass over the stock lattice without building the european replicating portfolios;
+        # returns the root price and the per level early exercise flags
+        with self.instrumentation.run():
+            return self._calculate_exercise_region()
+
+    def _calculate_exercise_region(self):
+        discount_factor = self.discount_rate_factor_gen(self.period_discount_rate)
+        up_probability = get_risk_neutral_probability(discount_factor, self.up_factor, self.down_factor)
+        up_weight = up_probability / discount_factor
+        down_weight = (1 - up_probability) / discount_factor
+
+        if self._is_barrier_lattice():
+            return self._calculate_barrier_exercise_region(up_weight, down_weight)
+
+        with self.instrumentation.phase("stock_tree"):
+            stock_prices, max_encountered = self.european_tree.calculate_stock_prices()
+
+        exercise_flags = [None] * self.period_count
+
+        with self.instrumentation.phase("backward_induction"):
+            prices = self.option.get_payouts(stock_prices[self.period_count], max_encountered[self.period_count])
+
+            for level in reversed(range(self.period_count)):
+                up_prices, down_prices = self.european_tree.split_children_values(prices)
+
+                continuation_prices = up_prices * up_weight + down_prices * down_weight
+                execution_prices = self.option.get_payouts(stock_prices[level], max_encountered[level])
+
+                exercise_flags[level] = execution_prices > continuation_prices
+                prices = np.where(exercise_flags[level], execution_prices, continuation_prices)
+
+        self._record_exercise_region(stock_prices + max_encountered + exercise_flags, payout_call_count=self.period_count + 1)
+
+        return prices[0], exercise_flags
+
+    def _calculate_barrier_exercise_region(self, up_weight, down_weight):
+        # exercise flags are (node, knock state) arrays, see BarrierPortfolioTree
+        with self.instrumentation.phase("stock_tree"):
+            stock_prices, _ = self.european_tree.calculate_stock_prices()
+
+        is_root_hit = self.stock_price >= self.option.barrier_price
+        exercise_flags = [None] * self.period_count
+
+        with self.instrumentation.phase("backward_induction"):
+            prices = BarrierPortfolioTree.get_payouts(self.option, stock_prices[self.period_count])
+
+            for level in reversed(range(self.period_count)):
+                is_child_hit = is_root_hit | (stock_prices[level + 1] >= self.option.barrier_price)
+                up_prices, down_prices = BarrierPortfolioTree.split_children_values(prices, is_child_hit)
+
+                continuation_prices = up_prices * up_weight + down_prices * down_weight
+                execution_prices = BarrierPortfolioTree.get_payouts(self.option, stock_prices[level])
 
-    def _get_terminal_price_pair(self, portfolio_tree, period_index, node_index):
-        portfolio = portfolio_tree.get_portfolio(period_index, node_index)
+                exercise_flags[level] = execution_prices > continuation_prices
+                prices = np.where(exercise_flags[level], execution_prices, continuation_prices)
 
-        price_info_up = portfolio_tree.get_stock_price_data(period_index + 1, node_index * 2)
-        price_info_down = portfolio_tree.get_stock_price_data(period_index + 1, node_index * 2 + 1)
+        self._record_exercise_region(
+            stock_prices + exercise_flags, payout_call_count=2 * (self.period_count + 1), state_count=2
+        )
 
-        up_price = self.option.get_payout(PriceInfo(
-            portfolio.stock_price * self.up_factor,
-            price_info_up.max_encountered,
-        ))
-        down_price = self.option.get_payout(PriceInfo(
-            portfolio.stock_price * self.down_factor,
-            price_info_down.max_encountered,
-        ))
+        root_state = BarrierPortfolioTree.KNOCKED_IN if is_root_hit else BarrierPortfolioTree.NOT_KNOCKED_IN
+        return prices[0, root_state], exercise_flags
 
-        return up_price, down_price
+    def _record_exercise_region(self, level_arrays, payout_call_count, state_count=1):
+        # nodes are counted once per knock state, as in RollingLattice and BarrierPortfolioTree
+        self.instrumentation.add_node_count(
+            state_count * sum(level_array.size for level_array in level_arrays[:self.period_count + 1])
+        )
+        self.instrumentation.add_payout_call_count(payout_call_count)
+        self.instrumentation.record_node_memory(sum(level_array.nbytes for level_array in level_arrays))
 
-    def _get_non_terminal_price_pair(self, portfolio_tree, period_index, node_index):
-        portfolio_up, portfolio_down = portfolio_tree.get_children_portfolios(period_index, node_index)
-        return portfolio_up.get_price(), portfolio_down.get_price()
+    def _is_barrier_lattice(self):
+        return self.european_tree.recombining and isinstance(self.option, BarrierOption)
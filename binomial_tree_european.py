@@ -1,17 +1,22 @@
-from option import PriceInfo
+import functools
+
+import numpy as np
+
+from barrier_portfolio_tree import BarrierPortfolioTree
+from instrumentation import NULL_INSTRUMENTATION
+from lattice_greeks import LatticeGreekCalculator
+from option import BarrierOption, Option
 from portfolio_tree import PortfolioTree
-from portfolios import OptionReplicatingPortfolio
+from recombining_portfolio_tree import RecombiningPortfolioTree
+from rolling_lattice import RollingLattice
+from stock_lattice import StockLattice
 from utils import get_discount_factor
 
 
 class BinomialTreeEuropean:
-    class _PriceInfo:
-        def __init__(self, curr, max_encountered):
-            self.curr = curr
-            self.max_encountered = max_encountered
-
     def __init__(self, up_factor, down_factor, period_discount_rate, period_count, stock_price, option,
-                 discount_rate_factor_gen=get_discount_factor):
+                 discount_rate_factor_gen=get_discount_factor, recombining=False, price_only=False,
+                 instrumentation=None, max_encountered=None):
         self.up_factor = up_factor
         self.down_factor = down_factor
         self.period_discount_rate = period_discount_rate
@@ -19,76 +24,187 @@ class BinomialTreeEuropean:
         self.stock_price = stock_price
         self.option = option
         self.discount_rate_factor_gen = discount_rate_factor_gen
+        self.recombining = recombining
+        self.price_only = price_only
+        self.instrumentation = instrumentation or NULL_INSTRUMENTATION
+        # running maximum of the path leading to the root, lets a subtree of a larger tree be priced on its own
+        self.max_encountered = stock_price if max_encountered is None else max_encountered
+
+        if recombining and max_encountered is not None:
+            raise RuntimeError("recombining lattice does not track the running maximum")
+        if recombining and not isinstance(option, (Option, BarrierOption)):
+            raise RuntimeError("recombining lattice supports only vanilla and barrier options")
+        if price_only and not recombining:
+            raise RuntimeError("price only mode requires the recombining lattice")
+
+    def calculate_price(self):
+        if self.price_only:
+            return RollingLattice(self).calculate_price()
+
+        return self.calculate_replicating_portfolios().get_root_portfolio().get_price()
+
+    def calculate_parallel_price(self, split_level, executor=None):
+        # the 2 ** split_level subtrees hanging from split_level are priced independently through executor.map
+        # (a concurrent.futures pool, so discount_rate_factor_gen must be picklable; serially without one), only
+        # their root prices come back and the top levels are rolled back here
+        if self.recombining:
+            raise RuntimeError("parallel pricing requires the binary tree")
+        if not 0 < split_level < self.period_count:
+            raise RuntimeError("split level %s is out of range (0, %s)" % (split_level, self.period_count))
+
+        stock_prices, max_encountered = self.calculate_stock_prices(split_level)
+        subtree_count = 2 ** split_level
+
+        subtree_price_gen = functools.partial(
+            _calculate_subtree_price, self.up_factor, self.down_factor, self.period_discount_rate,
+            self.period_count - split_level, self.option, self.discount_rate_factor_gen,
+        )
+        map_gen = map if executor is None else executor.map
+        prices = np.fromiter(
+            map_gen(subtree_price_gen, stock_prices[split_level], max_encountered[split_level]),
+            dtype=float, count=subtree_count,
+        )
+
+        discount_factor = self.discount_rate_factor_gen(self.period_discount_rate)
+
+        for level in reversed(range(split_level)):
+            payout_up, payout_down = PortfolioTree.split_children_values(prices)
+
+            share_weights = (payout_up - payout_down) / (self.up_factor - self.down_factor) / stock_prices[level]
+            bond_weights = (payout_up / stock_prices[level] - share_weights * self.up_factor) / discount_factor
+            prices = (share_weights + bond_weights) * stock_prices[level]
+
+        return prices[0]
+
+    def calculate_greeks(self, tree_parameters, volatility_step=1e-3, rate_step=1e-4):
+        greek_calculator = LatticeGreekCalculator(self, tree_parameters)
+
+        if self.price_only:
+            top_prices = greek_calculator.calculate_rolling_top_prices()
+        else:
+            top_prices = greek_calculator.get_top_prices(self.calculate_replicating_portfolios())
+
+        return greek_calculator.calculate_greeks(top_prices, volatility_step, rate_step)
 
     def calculate_replicating_portfolios(self):
-        replicating_portfolios = {}
-        stock_price_tree = self._get_stock_price_tree()
-
-        def do_calculate(curr_level):
-            if curr_level == self.period_count - 1:
-                for parent_index in range(2 ** curr_level):
-                    replicating_portfolios[(curr_level, parent_index)] = self._calculate_terminal_portfolio(
-                        stock_price_tree, curr_level, parent_index
-                    )
+        if self.price_only:
+            raise RuntimeError("replicating portfolios are not kept in price only mode")
+
+        with self.instrumentation.run():
+            if self.recombining and isinstance(self.option, BarrierOption):
+                portfolio_tree = self._calculate_barrier_portfolios()
             else:
-                do_calculate(curr_level + 1)
-
-                for parent_index in range(2 ** curr_level):
-                    replicating_portfolios[(curr_level, parent_index)] = self._calculate_non_terminal_portfolio(
-                        replicating_portfolios, stock_price_tree, curr_level, parent_index
-                    )
-
-        do_calculate(0)
-
-        return PortfolioTree(replicating_portfolios, stock_price_tree, self.period_count)
-
-    def _calculate_terminal_portfolio(self, stock_price_tree, curr_level, parent_index):
-        price_info_up = stock_price_tree[(curr_level + 1, parent_index * 2)]
-        price_info_down = stock_price_tree[(curr_level + 1, parent_index * 2 + 1)]
-
-        return self._calculate_replicating_portfolio(
-            self.option.get_payout(PriceInfo(
-                price_info_up.curr,
-                max_encountered=price_info_up.max_encountered,
-            )),
-            self.option.get_payout(PriceInfo(
-                price_info_down.curr,
-                max_encountered=price_info_down.max_encountered,
-            )),
-            stock_price_tree[(curr_level, parent_index)].curr,
-        )
+                portfolio_tree = self._calculate_portfolios()
 
-    def _calculate_non_terminal_portfolio(self, replicating_portfolios, stock_price_tree, curr_level, parent_index):
-        key_up = (curr_level + 1, parent_index * 2)
-        key_down = (curr_level + 1, parent_index * 2 + 1)
+            self.instrumentation.add_node_count(portfolio_tree.get_node_count())
+            self.instrumentation.record_node_memory(portfolio_tree.get_memory_size())
 
-        portfolio_up = replicating_portfolios[key_up]
-        portfolio_down = replicating_portfolios[key_down]
+        return portfolio_tree
+
+    def _calculate_portfolios(self):
+        with self.instrumentation.phase("stock_tree"):
+            portfolio_tree = self._get_portfolio_tree_type()(self.period_count, *self.calculate_stock_prices())
+
+        discount_factor = self.discount_rate_factor_gen(self.period_discount_rate)
+
+        with self.instrumentation.phase("payout"):
+            prices = self.option.get_payouts(
+                portfolio_tree.get_stock_prices(self.period_count), portfolio_tree.get_max_encountered(self.period_count)
+            )
+            self.instrumentation.add_payout_call_count()
+
+        with self.instrumentation.phase("portfolios"):
+            for level in reversed(range(self.period_count)):
+                stock_prices = portfolio_tree.get_stock_prices(level)
+                share_weights = portfolio_tree.get_share_weights(level)
+                bond_weights = portfolio_tree.get_bond_weights(level)
+                payout_up, payout_down = portfolio_tree.split_children_values(prices)
+
+                share_weights[:] = (payout_up - payout_down) / (self.up_factor - self.down_factor) / stock_prices
+                bond_weights[:] = (payout_up / stock_prices - share_weights * self.up_factor) / discount_factor
+
+                prices = portfolio_tree.get_prices(level)
+                prices[:] = (share_weights + bond_weights) * stock_prices
+
+        return portfolio_tree
+
+    def calculate_stock_prices(self, level_count=None):
+        # levels 0..level_count, the whole tree by default
+        if level_count is None:
+            level_count = self.period_count
+
+        if self.recombining:
+            stock_prices = self._get_recombining_stock_prices()[:level_count + 1]
+            return stock_prices, [np.full(len(level_stock_prices), np.nan) for level_stock_prices in stock_prices]
+
+        stock_prices = [np.array([self.stock_price], dtype=float)]
+        max_encountered = [np.array([self.max_encountered], dtype=float)]
+
+        for level in range(1, level_count + 1):
+            prices = np.empty(2 ** level)
+            level_max_encountered = np.empty(2 ** level)
+
+            # even children are reached by an up move, odd ones by a down move
+            prices[0::2] = stock_prices[-1] * self.up_factor
+            prices[1::2] = stock_prices[-1] * self.down_factor
+            level_max_encountered[0::2] = np.maximum(prices[0::2], max_encountered[-1])
+            level_max_encountered[1::2] = np.maximum(prices[1::2], max_encountered[-1])
+
+            stock_prices.append(prices)
+            max_encountered.append(level_max_encountered)
+
+        return stock_prices, max_encountered
+
+    def split_children_values(self, values):
+        return self._get_portfolio_tree_type().split_children_values(values)
+
+    def _calculate_barrier_portfolios(self):
+        # the running maximum only matters through whether it reached the barrier, so every lattice node
+        # carries two states: not yet knocked in and knocked in
+        with self.instrumentation.phase("stock_tree"):
+            stock_prices = self._get_recombining_stock_prices()
+
+        discount_factor = self.discount_rate_factor_gen(self.period_discount_rate)
+        barrier_price = self.option.barrier_price
+        is_root_hit = self.stock_price >= barrier_price
+
+        share_weights = [None] * self.period_count
+        bond_weights = [None] * self.period_count
+
+        with self.instrumentation.phase("payout"):
+            prices = BarrierPortfolioTree.get_payouts(self.option, stock_prices[self.period_count])
+            self.instrumentation.add_payout_call_count(2)
+
+        with self.instrumentation.phase("portfolios"):
+            for level in reversed(range(self.period_count)):
+                is_child_hit = is_root_hit | (stock_prices[level + 1] >= barrier_price)
+                payout_up, payout_down = BarrierPortfolioTree.split_children_values(prices, is_child_hit)
+
+                level_stock_prices = stock_prices[level][:, np.newaxis]
+
+                share_weight = (payout_up - payout_down) / (self.up_factor - self.down_factor) / level_stock_prices
+                bond_weight = (payout_up / level_stock_prices - share_weight * self.up_factor) / discount_factor
+
+                share_weights[level] = share_weight
+                bond_weights[level] = bond_weight
+                prices = (share_weight + bond_weight) * level_stock_prices
+
+        return BarrierPortfolioTree(share_weights, bond_weights, stock_prices, barrier_price, self.period_count)
+
+    def _get_recombining_stock_prices(self):
+        return [
+            StockLattice.get_level_stock_prices(self.stock_price, self.up_factor, self.down_factor, level)
+            for level in range(self.period_count + 1)
+        ]
+
+    def _get_portfolio_tree_type(self):
+        return RecombiningPortfolioTree if self.recombining else PortfolioTree
 
-        return self._calculate_replicating_portfolio(
-            portfolio_up.get_price(),
-            portfolio_down.get_price(),
-            stock_price_tree[(curr_level, parent_index)].curr,
-        )
 
-    def _calculate_replicating_portfolio(self, payout_up, payout_down, stock_price):
-        share_weight = (payout_up - payout_down) / (self.up_factor - self.down_factor) / stock_price
-        bond_weight = (payout_up / stock_price - share_weight * self.up_factor) / self.discount_rate_factor_gen(self.period_discount_rate)
-        return OptionReplicatingPortfolio(share_weight, bond_weight, stock_price)
-
-    def _get_stock_price_tree(self):
-        result = {
-            (0, 0): BinomialTreeEuropean._PriceInfo(self.stock_price, self.stock_price)
-        }
-        for period_index in range(1, self.period_count + 1):
-            for node_index in range(2 ** period_index):
-                parent_id = (period_index - 1, node_index // 2)
-                price_data = result[parent_id]
-                price_factor = self.up_factor if node_index % 2 == 0 else self.down_factor
-                curr_price = price_data.curr * price_factor
-                result[(period_index, node_index)] = BinomialTreeEuropean._PriceInfo(
-                    curr_price,
-                    max(curr_price, price_data.max_encountered)
-                )
-
-        return result
+def _calculate_subtree_price(up_factor, down_factor, period_discount_rate, period_count, option,
+                             discount_rate_factor_gen, stock_price, max_encountered):
+    # module level so that process pools can pickle it
+    return BinomialTreeEuropean(
+        up_factor, down_factor, period_discount_rate, period_count, stock_price, option, discount_rate_factor_gen,
+        max_encountered=max_encountered,
+    ).calculate_price()
@@ -1,5 +1,24 @@
+import math
+
 import numpy as np
-import scipy.stats
+
+_SCALAR_TYPES = (int, float, np.integer, np.floating)
+_SQRT_2 = math.sqrt(2)
+_SQRT_2_PI = math.sqrt(2 * math.pi)
+
+
+def _norm_cdf(values):
+    # scalars go through math.erfc, which is far cheaper than a distribution object call; scipy is only
+    # imported once arrays are priced
+    if np.ndim(values) == 0:
+        return 0.5 * math.erfc(-values / _SQRT_2)
+
+    import scipy.special
+    return scipy.special.ndtr(values)
+
+
+def _norm_pdf(values):
+    return np.exp(-np.square(values) / 2) / _SQRT_2_PI
 
 
 class Option:
@@ -23,27 +42,92 @@ class Option:
             )
 
     def get_call_price(self, parameters):
-        d1 = self._d1(parameters)
-        d2 = self._d2(parameters)
+        if self._is_scalar(parameters):
+            return self._get_scalar_price(parameters, 1)
+
+        d1, d2 = self._get_d1_d2(parameters)
 
-        stock_term = parameters.stock_price * scipy.stats.norm.cdf(d1)
-        bond_term = np.exp(-parameters.risk_free_rate * parameters.maturity_time) * parameters.strike_price * scipy.stats.norm.cdf(d2)
+        stock_term = parameters.stock_price * _norm_cdf(d1)
+        bond_term = np.exp(-parameters.risk_free_rate * parameters.maturity_time) * parameters.strike_price * _norm_cdf(d2)
 
         return stock_term - bond_term
 
     def get_put_price(self, parameters):
-        d1 = self._d1(parameters)
-        d2 = self._d2(parameters)
+        if self._is_scalar(parameters):
+            return self._get_scalar_price(parameters, -1)
+
+        d1, d2 = self._get_d1_d2(parameters)
 
-        bond_term = np.exp(parameters.risk_free_rate * parameters.maturity_time) * parameters.strike_price * scipy.stats.norm.cdf(-d2)
-        stock_term = parameters.stock_price * scipy.stats.norm.cdf(-d1)
+        bond_term = np.exp(-parameters.risk_free_rate * parameters.maturity_time) * parameters.strike_price * _norm_cdf(-d2)
+        stock_term = parameters.stock_price * _norm_cdf(-d1)
 
         return bond_term - stock_term
 
-    def _d2(self, parameters):
-        return self._d1(parameters) - parameters.volatility * np.sqrt(parameters.maturity_time)
+    def get_prices(self, parameters, is_call, out=None):
+        # parameters fields may be arrays of a common (broadcastable) shape; is_call selects call or put per entry
+        d1, d2 = self._get_d1_d2(parameters)
+        sign = np.where(is_call, 1.0, -1.0)
+
+        stock_term = parameters.stock_price * _norm_cdf(sign * d1)
+        bond_term = np.exp(-parameters.risk_free_rate * parameters.maturity_time) * parameters.strike_price * _norm_cdf(sign * d2)
+
+        return np.multiply(sign, stock_term - bond_term, out=out)
 
-    def _d1(self, parameters):
-        return 1 / (parameters.volatility * np.sqrt(parameters.maturity_time)) * (
-                np.log(parameters.stock_price / parameters.strike_price) + (parameters.risk_free_rate + 1/2 * parameters.volatility**2) * parameters.maturity_time
+    def get_call_greeks(self, parameters):
+        return self.get_greeks(parameters, True)
+
+    def get_put_greeks(self, parameters):
+        return self.get_greeks(parameters, False)
+
+    def get_greeks(self, parameters, is_call):
+        # same conventions as GreekCalculator: theta is the derivative with respect to maturity time
+        d1, d2 = self._get_d1_d2(parameters)
+        sign = np.where(is_call, 1.0, -1.0)
+
+        sqrt_maturity_time = np.sqrt(parameters.maturity_time)
+        pdf_d1 = _norm_pdf(d1)
+        cdf_d1 = _norm_cdf(sign * d1)
+        cdf_d2 = _norm_cdf(sign * d2)
+        discounted_strike_price = np.exp(-parameters.risk_free_rate * parameters.maturity_time) * parameters.strike_price
+
+        return {
+            "delta": sign * cdf_d1,
+            "gamma": pdf_d1 / (parameters.stock_price * parameters.volatility * sqrt_maturity_time),
+            "theta": parameters.stock_price * pdf_d1 * parameters.volatility / (2 * sqrt_maturity_time) + sign * parameters.risk_free_rate * discounted_strike_price * cdf_d2,
+            "vega": parameters.stock_price * pdf_d1 * sqrt_maturity_time,
+            "rho": sign * parameters.maturity_time * discounted_strike_price * cdf_d2,
+        }
+
+    @staticmethod
+    def _is_scalar(parameters):
+        return (
+            isinstance(parameters.stock_price, _SCALAR_TYPES)
+            and isinstance(parameters.strike_price, _SCALAR_TYPES)
+            and isinstance(parameters.risk_free_rate, _SCALAR_TYPES)
+            and isinstance(parameters.volatility, _SCALAR_TYPES)
+            and isinstance(parameters.maturity_time, _SCALAR_TYPES)
+            and parameters.volatility > 0
+            and parameters.maturity_time > 0
         )
+
+    @staticmethod
+    def _get_scalar_price(parameters, sign):
+        # math module twin of get_prices for a single quote; sign is 1 for calls and -1 for puts
+        volatility_term = parameters.volatility * math.sqrt(parameters.maturity_time)
+        d1 = (
+            math.log(parameters.stock_price / parameters.strike_price) + (parameters.risk_free_rate + parameters.volatility ** 2 / 2) * parameters.maturity_time
+        ) / volatility_term
+        d2 = d1 - volatility_term
+
+        stock_term = parameters.stock_price * 0.5 * math.erfc(-sign * d1 / _SQRT_2)
+        bond_term = math.exp(-parameters.risk_free_rate * parameters.maturity_time) * parameters.strike_price * 0.5 * math.erfc(-sign * d2 / _SQRT_2)
+
+        return sign * (stock_term - bond_term)
+
+    def _get_d1_d2(self, parameters):
+        volatility_term = parameters.volatility * np.sqrt(parameters.maturity_time)
+        d1 = (
+            np.log(parameters.stock_price / parameters.strike_price) + (parameters.risk_free_rate + 1/2 * parameters.volatility**2) * parameters.maturity_time
+        ) / volatility_term
+
+        return d1, d1 - volatility_term
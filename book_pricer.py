@@ -0,0 +1,144 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import black_scholes
+from binomial_tree_american import BinomialTreeAmerican
+from binomial_tree_european import BinomialTreeEuropean
+from crr import CRRBinomialTreeParameters
+from option import Option
+
+
+class BookPricer:
+    ENGINE_BLACK_SCHOLES = "black_scholes"
+    ENGINE_EUROPEAN_TREE = "european_tree"
+    ENGINE_AMERICAN_TREE = "american_tree"
+
+    INPUT_COLUMNS = ["strike_price", "maturity", "is_call"]
+    OUTPUT_COLUMNS = ["prices", "delta", "gamma", "theta", "vega", "rho"]
+
+    def __init__(self, risk_free_rate, period_count=200, executor=None, black_scholes_shard_size=100_000,
+                 tree_shard_size=16):
+        self.risk_free_rate = risk_free_rate
+        self.period_count = period_count
+        self.executor = executor
+        self.black_scholes_shard_size = black_scholes_shard_size
+        self.tree_shard_size = tree_shard_size
+
+    def price_book(self, book, stock_price, volatility):
+        # book columns: amount, type ("call" / "put"), strike_price, maturity and optionally engine
+        engines = book["engine"].to_numpy() if "engine" in book else np.full(len(book), BookPricer.ENGINE_BLACK_SCHOLES)
+
+        # rows are grouped by engine so that every shard is a contiguous slice of one engine
+        order = np.argsort(engines, kind="stable")
+        engines = engines[order]
+
+        columns = np.empty((len(BookPricer.INPUT_COLUMNS) + len(BookPricer.OUTPUT_COLUMNS), len(book)))
+        columns[0] = book["strike_price"].to_numpy(dtype=float)[order]
+        columns[1] = book["maturity"].to_numpy(dtype=float)[order]
+        columns[2] = (book["type"].to_numpy() == "call")[order]
+
+        shards = self._get_shards(engines)
+        market = (stock_price, volatility, self.risk_free_rate, self.period_count)
+
+        if self.executor is None:
+            for engine, start, end in shards:
+                _price_rows(columns, start, end, engine, *market)
+        else:
+            columns = self._price_shared_columns(columns, shards, market)
+
+        outputs = np.empty((len(BookPricer.OUTPUT_COLUMNS), len(book)))
+        outputs[:, order] = columns[len(BookPricer.INPUT_COLUMNS):]
+
+        result = book.copy()
+        result["prices"] = outputs[0]
+        result["total_prices"] = result.amount * result.prices
+        for name, values in zip(BookPricer.OUTPUT_COLUMNS[1:], outputs[1:]):
+            result[name] = values
+
+        return result
+
+    def _price_shared_columns(self, columns, shards, market):
+        # workers attach to the same shared block and write their rows in place; only shard bounds are pickled
+        shared_block = shared_memory.SharedMemory(create=True, size=max(columns.nbytes, 1))
+        try:
+            shared_columns = np.ndarray(columns.shape, dtype=columns.dtype, buffer=shared_block.buf)
+            shared_columns[:] = columns
+
+            futures = [
+                self.executor.submit(_price_shared_rows, shared_block.name, columns.shape, start, end, engine, *market)
+                for engine, start, end in shards
+            ]
+            for future in futures:
+                future.result()
+
+            return shared_columns.copy()
+        finally:
+            shared_block.close()
+            shared_block.unlink()
+
+    def _get_shards(self, engines):
+        shards = []
+        for engine in np.unique(engines):
+            start, end = np.searchsorted(engines, engine, side="left"), np.searchsorted(engines, engine, side="right")
+            shard_size = self.black_scholes_shard_size if engine == BookPricer.ENGINE_BLACK_SCHOLES else self.tree_shard_size
+
+            shards.extend((engine, shard_start, min(shard_start + shard_size, end)) for shard_start in range(start, end, shard_size))
+
+        # expensive tree shards go first so that cheap black scholes shards fill the gaps at the end
+        return sorted(shards, key=lambda shard: shard[0] == BookPricer.ENGINE_BLACK_SCHOLES)
+
+
+def _price_shared_rows(shared_block_name, shape, start, end, engine, stock_price, volatility, risk_free_rate, period_count):
+    shared_block = shared_memory.SharedMemory(name=shared_block_name)
+    try:
+        columns = np.ndarray(shape, dtype=float, buffer=shared_block.buf)
+        _price_rows(columns, start, end, engine, stock_price, volatility, risk_free_rate, period_count)
+        del columns
+    finally:
+        shared_block.close()
+
+
+def _price_rows(columns, start, end, engine, stock_price, volatility, risk_free_rate, period_count):
+    strike_price, maturity, is_call = columns[:3, start:end]
+    is_call = is_call.astype(bool)
+    outputs = columns[3:, start:end]
+
+    if engine == BookPricer.ENGINE_BLACK_SCHOLES:
+        bs_option = black_scholes.Option()
+        parameters = black_scholes.Option.OptionParameters(stock_price, strike_price, risk_free_rate, volatility, maturity)
+        greeks = bs_option.get_greeks(parameters, is_call)
+
+        bs_option.get_prices(parameters, is_call, out=outputs[0])
+        for output, name in zip(outputs[1:], BookPricer.OUTPUT_COLUMNS[1:]):
+            output[:] = greeks[name]
+    elif engine in (BookPricer.ENGINE_EUROPEAN_TREE, BookPricer.ENGINE_AMERICAN_TREE):
+        american = engine == BookPricer.ENGINE_AMERICAN_TREE
+
+        for row in range(end - start):
+            # one lattice build gives price, delta, gamma and theta; vega and rho take four price only rebuilds
+            tree, crr_parameters = _get_tree(black_scholes.Option.OptionParameters(
+                stock_price, strike_price[row], risk_free_rate, volatility, maturity[row]
+            ), is_call[row], american, period_count)
+            greeks = tree.calculate_greeks(crr_parameters)
+            outputs[:, row] = [greeks[name] for name in ["price"] + BookPricer.OUTPUT_COLUMNS[1:]]
+    else:
+        raise RuntimeError("unexpected engine %s" % engine)
+
+
+def _get_tree(parameters, is_call, american, period_count):
+    crr_parameters = CRRBinomialTreeParameters(parameters.volatility, parameters.maturity_time, period_count)
+    option_factory = Option.long_call_option if is_call else Option.long_put_option
+
+    tree = BinomialTreeEuropean(
+        up_factor=crr_parameters.get_up_factor(),
+        down_factor=crr_parameters.get_down_factor(),
+        period_discount_rate=parameters.risk_free_rate * parameters.maturity_time / period_count,
+        period_count=period_count,
+        stock_price=parameters.stock_price,
+        option=option_factory(parameters.strike_price),
+        recombining=True,
+        price_only=True,
+    )
+
+    return (BinomialTreeAmerican(tree) if american else tree), crr_parameters
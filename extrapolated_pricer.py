@@ -0,0 +1,65 @@
+import numpy as np
+
+import black_scholes
+from binomial_tree_european import BinomialTreeEuropean
+from crr import CRRBinomialTreeParameters
+from option import Option, BarrierOption
+from rolling_lattice import RollingLattice
+from utils import get_discount_rate
+
+
+class ExtrapolatedBinomialPricer:
+    def __init__(self, stock_price, stock_price_volatility, time_horizon, interest_rate, option, period_count,
+                 early_exercise=False):
+        # interest rate follows the convention of utils.get_discount_rate
+        if period_count < 2 or period_count % 2 != 0:
+            raise RuntimeError("period count must be even and at least 2, got %d" % period_count)
+        if isinstance(option, BarrierOption):
+            raise RuntimeError("black scholes smoothing is not supported for barrier options")
+
+        self.stock_price = stock_price
+        self.stock_price_volatility = stock_price_volatility
+        self.time_horizon = time_horizon
+        self.interest_rate = interest_rate
+        self.option = option
+        self.period_count = period_count
+        self.early_exercise = early_exercise
+
+    def calculate_price(self):
+        # binomial black scholes with richardson extrapolation (BBSR): the last period of the lattice is replaced by
+        # one period black scholes prices, which makes the error close to c / n, and 2 * P(n) - P(n / 2) cancels it
+        fine_price = self._calculate_lattice_price(self.period_count)
+        coarse_price = self._calculate_lattice_price(self.period_count // 2)
+
+        return 2 * fine_price - coarse_price
+
+    def _calculate_lattice_price(self, period_count):
+        crr_parameters = CRRBinomialTreeParameters(self.stock_price_volatility, self.time_horizon, period_count)
+
+        european_tree = BinomialTreeEuropean(
+            up_factor=crr_parameters.get_up_factor(),
+            down_factor=crr_parameters.get_down_factor(),
+            period_discount_rate=get_discount_rate(self.interest_rate, self.time_horizon / period_count),
+            period_count=period_count,
+            stock_price=self.stock_price,
+            option=self.option,
+            recombining=True,
+            price_only=True,
+        )
+
+        return RollingLattice(
+            european_tree,
+            early_exercise=self.early_exercise,
+            penultimate_price_gen=lambda stock_prices: self._get_black_scholes_prices(stock_prices, self.time_horizon / period_count),
+        ).calculate_price()
+
+    def _get_black_scholes_prices(self, stock_prices, maturity_time):
+        is_call = self.option.option_type in (Option.OPTION_TYPE_LONG_CALL, Option.OPTION_TYPE_SHORT_CALL)
+        is_long = self.option.option_type in (Option.OPTION_TYPE_LONG_CALL, Option.OPTION_TYPE_LONG_PUT)
+
+        parameters = black_scholes.Option.OptionParameters(
+            stock_prices, self.option.strike_price, np.log(1 + self.interest_rate), self.stock_price_volatility, maturity_time
+        )
+        prices = black_scholes.Option().get_prices(parameters, is_call)
+
+        return prices if is_long else -prices
@@ -0,0 +1,200 @@
+import numpy as np
+import scipy.linalg
+
+from option import BarrierOption
+
+
+class CrankNicolsonEngine:
+    # the first time steps are damped by implicit half steps (rannacher start) so that the payout kink does not
+    # leave crank nicolson oscillations in gamma
+    RANNACHER_STEP_COUNT = 2
+    PENALTY = 1e8
+    MAX_PENALTY_ITERATION_COUNT = 50
+
+    class Result:
+        def __init__(self, price, delta, gamma, theta):
+            # theta is the derivative with respect to maturity time, as in GreekCalculator
+            self.price = price
+            self.delta = delta
+            self.gamma = gamma
+            self.theta = theta
+
+    def __init__(self, stock_price, risk_free_rate, volatility, time_horizon, option, price_step_count=400,
+                 time_step_count=400, early_exercise=False, grid_width=5):
+        # risk free rate is continuously compounded, as in black_scholes; the price grid spans
+        # [0, max(stock price, strike) * exp(grid_width * volatility * sqrt(time_horizon))]
+        self.stock_price = stock_price
+        self.risk_free_rate = risk_free_rate
+        self.volatility = volatility
+        self.time_horizon = time_horizon
+        self.option = option
+        self.price_step_count = price_step_count
+        self.time_step_count = time_step_count
+        self.early_exercise = early_exercise
+        self.grid_width = grid_width
+
+    def calculate_price(self):
+        if not isinstance(self.option, BarrierOption):
+            return self._solve_vanilla(self.option)
+        if self.stock_price >= self.option.barrier_price:
+            # already knocked in
+            return self._solve_vanilla(self.option.option)
+
+        return self._solve_knock_in()
+
+    def _solve_vanilla(self, option):
+        stock_prices = self._get_stock_prices(self._get_price_step())
+
+        payouts = option.get_payouts(stock_prices, stock_prices)
+        prices, previous_prices = self._roll_back(stock_prices, payouts)
+
+        return self._get_result(stock_prices, prices, previous_prices)
+
+    def _solve_knock_in(self):
+        # up and in: below the barrier the option is worth nothing at expiry, and on the barrier it turns into the
+        # underlying option, so the knock in grid [0, barrier] gets the underlying option values as its upper boundary
+        barrier_price = self.option.barrier_price
+        price_step = self._get_price_step()
+        barrier_index = max(int(round(barrier_price / price_step)), 2)
+        price_step = barrier_price / barrier_index
+
+        stock_prices = self._get_stock_prices(price_step)
+        knock_in_stock_prices = stock_prices[:barrier_index + 1]
+
+        vanilla_payouts = self.option.option.get_payouts(stock_prices, stock_prices)
+        # the barrier node is hit, the nodes below are not
+        knock_in_payouts = self.option.get_payouts(knock_in_stock_prices, knock_in_stock_prices)
+
+        vanilla_operator = self._get_operator(len(stock_prices))
+        knock_in_operator = self._get_operator(len(knock_in_stock_prices))
+
+        vanilla_prices = previous_knock_in_prices = vanilla_payouts
+        knock_in_prices = knock_in_payouts
+
+        for step_length, implicit_weight in self._get_time_steps():
+            previous_knock_in_prices = knock_in_prices
+
+            vanilla_prices = self._step(vanilla_operator, vanilla_prices, vanilla_payouts, step_length, implicit_weight)
+            knock_in_prices = self._step(
+                knock_in_operator, knock_in_prices, knock_in_payouts, step_length, implicit_weight,
+                upper_boundary=vanilla_prices[barrier_index],
+            )
+
+        return self._get_result(knock_in_stock_prices, knock_in_prices, previous_knock_in_prices)
+
+    def _roll_back(self, stock_prices, payouts):
+        operator = self._get_operator(len(stock_prices))
+
+        prices = previous_prices = payouts
+        for step_length, implicit_weight in self._get_time_steps():
+            previous_prices = prices
+            prices = self._step(operator, prices, payouts, step_length, implicit_weight)
+
+        return prices, previous_prices
+
+    def _step(self, operator, prices, exercise_prices, step_length, implicit_weight, upper_boundary=None):
+        # theta scheme step (I - w dt L) V_new = (I + (1 - w) dt L) V; early exercise is enforced with the penalty
+        # method, i.e. the system is re-solved with a large penalty on the nodes where V_new falls below the payout
+        right_hand_side = prices + (1 - implicit_weight) * step_length * self._apply_operator(operator, prices)
+
+        system = -implicit_weight * step_length * operator
+        system[1] += 1
+
+        if upper_boundary is not None:
+            system[1, -1] = 1
+            system[2, -2] = 0
+            right_hand_side[-1] = upper_boundary
+
+        new_prices = scipy.linalg.solve_banded((1, 1), system, right_hand_side)
+        if not self.early_exercise:
+            return new_prices
+
+        for _ in range(CrankNicolsonEngine.MAX_PENALTY_ITERATION_COUNT):
+            penalty = np.where(new_prices < exercise_prices, CrankNicolsonEngine.PENALTY, 0)
+            if upper_boundary is not None:
+                penalty[-1] = 0
+
+            penalized_system = system.copy()
+            penalized_system[1] += penalty
+            next_prices = scipy.linalg.solve_banded(
+                (1, 1), penalized_system, right_hand_side + penalty * exercise_prices
+            )
+
+            converged = np.array_equal(next_prices < exercise_prices, new_prices < exercise_prices)
+            new_prices = next_prices
+            if converged:
+                break
+
+        return new_prices
+
+    def _get_operator(self, node_count):
+        # banded (upper, diagonal, lower) discretization of 1/2 s^2 S^2 V_SS + r S V_S - r V on S_i = i * dS;
+        # at S = 0 it degenerates to -r V, at the upper edge V_SS = 0 is assumed and V_S is one sided
+        indices = np.arange(node_count, dtype=float)
+        diffusion = self.volatility ** 2 * indices ** 2
+        drift = self.risk_free_rate * indices
+
+        operator = np.zeros((3, node_count))
+        operator[0, 1:] = (diffusion / 2 + drift / 2)[:-1]
+        operator[1] = -diffusion - self.risk_free_rate
+        operator[2, :-1] = (diffusion / 2 - drift / 2)[1:]
+
+        operator[1, -1] = drift[-1] - self.risk_free_rate
+        operator[2, -2] = -drift[-1]
+
+        return operator
+
+    @staticmethod
+    def _apply_operator(operator, prices):
+        result = operator[1] * prices
+        result[:-1] += operator[0, 1:] * prices[1:]
+        result[1:] += operator[2, :-1] * prices[:-1]
+        return result
+
+    def _get_time_steps(self):
+        step_length = self.time_horizon / self.time_step_count
+        rannacher_step_count = min(CrankNicolsonEngine.RANNACHER_STEP_COUNT, self.time_step_count)
+
+        return (
+            [(step_length / 2, 1)] * (2 * rannacher_step_count)
+            + [(step_length, 0.5)] * (self.time_step_count - rannacher_step_count)
+        )
+
+    def _get_price_step(self):
+        # the stock price is put on a node, so that the greeks do not depend on the interpolation between nodes
+        price_step = self._get_max_stock_price() / self.price_step_count
+        return self.stock_price / max(round(self.stock_price / price_step), 1)
+
+    def _get_stock_prices(self, price_step):
+        return price_step * np.arange(int(np.ceil(self._get_max_stock_price() / price_step)) + 1, dtype=float)
+
+    def _get_max_stock_price(self):
+        vanilla_option = self.option.option if isinstance(self.option, BarrierOption) else self.option
+        max_stock_price = max(self.stock_price, vanilla_option.strike_price) * np.exp(
+            self.grid_width * self.volatility * np.sqrt(self.time_horizon)
+        )
+
+        if isinstance(self.option, BarrierOption):
+            max_stock_price = max(max_stock_price, 1.5 * self.option.barrier_price)
+
+        return max_stock_price
+
+    def _get_result(self, stock_prices, prices, previous_prices):
+        # quadratic interpolation through the three nodes closest to the stock price
+        price_step = stock_prices[1] - stock_prices[0]
+        center = int(np.clip(np.round(self.stock_price / price_step), 1, len(stock_prices) - 2))
+        offset = (self.stock_price - stock_prices[center]) / price_step
+
+        def interpolate(values):
+            left_value, center_value, right_value = values[center - 1:center + 2]
+            first_difference = (right_value - left_value) / 2
+            second_difference = right_value - 2 * center_value + left_value
+
+            value = center_value + offset * first_difference + offset ** 2 / 2 * second_difference
+            return value, (first_difference + offset * second_difference) / price_step, second_difference / price_step ** 2
+
+        price, delta, gamma = interpolate(prices)
+        previous_price, _, _ = interpolate(previous_prices)
+        last_step_length, _ = self._get_time_steps()[-1]
+
+        return CrankNicolsonEngine.Result(price, delta, gamma, (price - previous_price) / last_step_length)
@@ -1,36 +1,87 @@
+from instrumentation import NULL_INSTRUMENTATION
 
 
 class GreekCalculator:
-    def __init__(self, price_callback):
+    def __init__(self, price_callback, batch_price_callback=None, instrumentation=None):
         self.price_callback = price_callback
+        self.batch_price_callback = batch_price_callback
+        self.instrumentation = instrumentation or NULL_INSTRUMENTATION
+
+    def all_greeks(self, parameters, step=1e-3):
+        # every greek is a finite difference stencil over (offset name, offset) points; the points shared
+        # between stencils (e.g. stock price bumps of delta and gamma, the unbumped price) are priced once
+        center = (None, 0)
+        stencils = {
+            "price": [center],
+            "delta": [("stock_price_offset", -step), ("stock_price_offset", step)],
+            "gamma": [("stock_price_offset", -step), center, ("stock_price_offset", step)],
+            "theta": [("maturity_time_offset", -step), ("maturity_time_offset", step)],
+            "vega": [("volatility_offset", -step), ("volatility_offset", step)],
+            "rho": [("risk_free_rate_offset", -step), ("risk_free_rate_offset", step)],
+        }
+
+        points = list(dict.fromkeys(point for stencil in stencils.values() for point in stencil))
+        prices = dict(zip(points, self._get_prices([
+            parameters.copy() if offset_name is None else parameters.copy(**{offset_name: offset})
+            for offset_name, offset in points
+        ])))
+
+        def central_difference(name):
+            left_point, right_point = stencils[name]
+            return (prices[right_point] - prices[left_point]) / (2 * step)
+
+        left_point, center_point, right_point = stencils["gamma"]
+
+        return {
+            "price": prices[center],
+            "delta": central_difference("delta"),
+            "gamma": (prices[right_point] - 2 * prices[center_point] + prices[left_point]) / step**2,
+            "theta": central_difference("theta"),
+            "vega": central_difference("vega"),
+            "rho": central_difference("rho"),
+        }
 
     def delta(self, parameters, step=1e-3):
-        left_price = self.price_callback(parameters.copy(stock_price_offset=-step))
-        right_price = self.price_callback(parameters.copy(stock_price_offset=step))
+        left_price, right_price = self._get_prices([
+            parameters.copy(stock_price_offset=-step), parameters.copy(stock_price_offset=step)
+        ])
 
         return (right_price - left_price) / (2 * step)
 
     def gamma(self, parameters, step=1e-3):
-        left_price = self.price_callback(parameters.copy(stock_price_offset=-step))
-        center_price = self.price_callback(parameters.copy())
-        right_price = self.price_callback(parameters.copy(stock_price_offset=step))
+        left_price, center_price, right_price = self._get_prices([
+            parameters.copy(stock_price_offset=-step), parameters.copy(), parameters.copy(stock_price_offset=step)
+        ])
 
-        return (right_price - 2 * center_price + left_price) / (4 * step**2)
+        return (right_price - 2 * center_price + left_price) / step**2
 
     def theta(self, parameters, step=1e-3):
-        left_price = self.price_callback(parameters.copy(maturity_time_offset=-step))
-        right_price = self.price_callback(parameters.copy(maturity_time_offset=step))
+        left_price, right_price = self._get_prices([
+            parameters.copy(maturity_time_offset=-step), parameters.copy(maturity_time_offset=step)
+        ])
 
         return (right_price - left_price) / (2 * step)
 
     def vega(self, parameters, step=1e-3):
-        left_price = self.price_callback(parameters.copy(volatility_offset=-step))
-        right_price = self.price_callback(parameters.copy(volatility_offset=step))
+        left_price, right_price = self._get_prices([
+            parameters.copy(volatility_offset=-step), parameters.copy(volatility_offset=step)
+        ])
 
         return (right_price - left_price) / (2 * step)
 
     def rho(self, parameters, step=1e-3):
-        left_price = self.price_callback(parameters.copy(risk_free_rate_offset=-step))
-        right_price = self.price_callback(parameters.copy(risk_free_rate_offset=step))
+        left_price, right_price = self._get_prices([
+            parameters.copy(risk_free_rate_offset=-step), parameters.copy(risk_free_rate_offset=step)
+        ])
 
         return (right_price - left_price) / (2 * step)
+
+    def _get_prices(self, parameters_list):
+        with self.instrumentation.run(), self.instrumentation.phase("pricing"):
+            self.instrumentation.add_pricing_callback_count(len(parameters_list))
+
+            if self.batch_price_callback is not None:
+                return list(self.batch_price_callback(parameters_list))
+
+            return [self.price_callback(parameters) for parameters in parameters_list]
+
@@ -0,0 +1,75 @@
+import numpy as np
+
+
+class HedgeSolver:
+    METHOD_LEAST_SQUARES = "least_squares"
+    METHOD_MINIMUM_COST = "minimum_cost"
+
+    class Result:
+        def __init__(self, weights, hedge_book, residual_greeks, hedging_cost):
+            self.weights = weights
+            self.hedge_book = hedge_book
+            self.residual_greeks = residual_greeks
+            self.hedging_cost = hedging_cost
+
+    def __init__(self, greek_names=("delta", "gamma"), method=METHOD_LEAST_SQUARES):
+        if method not in (HedgeSolver.METHOD_LEAST_SQUARES, HedgeSolver.METHOD_MINIMUM_COST):
+            raise RuntimeError("unexpected hedge method %s" % method)
+
+        self.greek_names = list(greek_names)
+        self.method = method
+
+    def solve(self, book_greeks, instrument_greeks, costs=None):
+        # book_greeks: (..., greek) totals of the books to neutralize, instrument_greeks: (..., instrument, greek)
+        # greeks of one unit of every hedge instrument; leading axes (books, scenarios) broadcast and are solved as
+        # one stack. Returns (..., instrument) weights such that book_greeks + weights @ instrument_greeks = 0.
+        # With more instruments than greeks the least squares method picks the minimum norm weights, the minimum
+        # cost method the weights minimizing sum(cost * weight ** 2); with fewer, the residual is least squares.
+        book_greeks = np.asarray(book_greeks, dtype=float)
+        # (..., greek, instrument) system matrix
+        system = np.swapaxes(np.asarray(instrument_greeks, dtype=float), -1, -2)
+
+        if self.method == HedgeSolver.METHOD_LEAST_SQUARES:
+            return -self._apply_pseudo_inverse(system, book_greeks)
+
+        if costs is None:
+            raise RuntimeError("minimum cost hedging needs instrument costs")
+
+        costs = np.asarray(costs, dtype=float)
+        if not (costs > 0).all():
+            raise RuntimeError("instrument costs must be positive, got %s" % costs)
+
+        # substituting weight = scaled_weight / sqrt(cost) turns the cost into the plain norm of scaled_weight
+        inverse_cost_root = 1 / np.sqrt(costs)
+        scaled_weights = self._apply_pseudo_inverse(system * inverse_cost_root[..., np.newaxis, :], book_greeks)
+
+        return -scaled_weights * inverse_cost_root
+
+    def hedge_book(self, priced_book, priced_instruments, costs=None):
+        # priced_book / priced_instruments: BookPricer outputs; the instruments are hedged per unit, their amount
+        # column is ignored. The greeks already computed are reused, nothing is repriced. Minimum cost hedging
+        # defaults the costs to the absolute instrument prices, zero priced instruments need explicit costs
+        book_greeks = self.get_total_greeks(priced_book)
+        instrument_greeks = priced_instruments[self.greek_names].to_numpy(dtype=float)
+
+        if costs is None and self.method == HedgeSolver.METHOD_MINIMUM_COST:
+            costs = np.abs(priced_instruments.prices.to_numpy(dtype=float))
+
+        weights = self.solve(book_greeks, instrument_greeks, costs)
+
+        hedge_book = priced_instruments.copy()
+        hedge_book["amount"] = weights
+        hedge_book["total_prices"] = weights * hedge_book.prices
+
+        residual_greeks = book_greeks + weights @ instrument_greeks
+
+        return HedgeSolver.Result(
+            weights, hedge_book, dict(zip(self.greek_names, residual_greeks)), hedge_book.total_prices.sum()
+        )
+
+    def get_total_greeks(self, priced_book):
+        return priced_book.amount.to_numpy(dtype=float) @ priced_book[self.greek_names].to_numpy(dtype=float)
+
+    @staticmethod
+    def _apply_pseudo_inverse(system, right_hand_side):
+        return (np.linalg.pinv(system) @ right_hand_side[..., np.newaxis])[..., 0]
@@ -0,0 +1,105 @@
+import numpy as np
+
+import black_scholes
+
+
+class ImpliedVolatilitySolver:
+    STATUS_CONVERGED = 0
+    STATUS_MAX_ITERATIONS = 1
+    STATUS_PRICE_OUT_OF_BOUNDS = 2
+
+    class Result:
+        def __init__(self, volatility, status, iteration_count):
+            self.volatility = volatility
+            self.status = status
+            self.iteration_count = iteration_count
+
+    def __init__(self, tolerance=1e-10, max_iteration_count=100, min_volatility=1e-6, max_volatility=10):
+        self.tolerance = tolerance
+        self.max_iteration_count = max_iteration_count
+        self.min_volatility = min_volatility
+        self.max_volatility = max_volatility
+        self.option = black_scholes.Option()
+
+    def solve(self, prices, stock_price, strike_price, risk_free_rate, maturity_time, is_call):
+        prices, stock_price, strike_price, risk_free_rate, maturity_time, is_call = np.broadcast_arrays(
+            *[np.asarray(value, dtype=float) for value in [prices, stock_price, strike_price, risk_free_rate, maturity_time]],
+            np.asarray(is_call, dtype=bool),
+        )
+
+        volatility = np.full(prices.shape, np.nan)
+        status = np.full(prices.shape, ImpliedVolatilitySolver.STATUS_MAX_ITERATIONS)
+        iteration_count = np.zeros(prices.shape, dtype=int)
+
+        discounted_strike_price = strike_price * np.exp(-risk_free_rate * maturity_time)
+        # every quote is solved as a call; puts are mapped through put-call parity
+        call_prices = np.where(is_call, prices, prices + stock_price - discounted_strike_price)
+
+        is_in_bounds = (call_prices > np.maximum(stock_price - discounted_strike_price, 0)) & (call_prices < stock_price)
+        status[~is_in_bounds] = ImpliedVolatilitySolver.STATUS_PRICE_OUT_OF_BOUNDS
+
+        active = np.flatnonzero(is_in_bounds)
+        parameters = black_scholes.Option.OptionParameters(
+            stock_price.ravel()[active],
+            strike_price.ravel()[active],
+            risk_free_rate.ravel()[active],
+            None,
+            maturity_time.ravel()[active],
+        )
+        targets = call_prices.ravel()[active]
+        sigma = self._get_initial_guess(targets, parameters, discounted_strike_price.ravel()[active])
+        lower = np.full(active.shape, self.min_volatility)
+        upper = np.full(active.shape, self.max_volatility)
+        # quotes running out of iterations report the last volatility actually priced, not the untried next step
+        evaluated_sigma = np.full(active.shape, np.nan)
+
+        for iteration in range(1, self.max_iteration_count + 1):
+            if len(active) == 0:
+                break
+
+            parameters.volatility = evaluated_sigma = sigma
+            price_errors = self.option.get_prices(parameters, True) - targets
+            vega = self.option.get_greeks(parameters, True)["vega"]
+
+            is_converged = np.abs(price_errors) < self.tolerance
+            volatility.ravel()[active[is_converged]] = sigma[is_converged]
+            status.ravel()[active[is_converged]] = ImpliedVolatilitySolver.STATUS_CONVERGED
+            iteration_count.ravel()[active] = iteration
+
+            # the price is increasing in volatility, so every evaluation tightens the bracket
+            upper = np.where(price_errors > 0, sigma, upper)
+            lower = np.where(price_errors < 0, sigma, lower)
+
+            with np.errstate(divide="ignore", invalid="ignore"):
+                newton_sigma = sigma - price_errors / vega
+            is_newton_safe = (newton_sigma > lower) & (newton_sigma < upper)
+            sigma = np.where(is_newton_safe, newton_sigma, (lower + upper) / 2)
+
+            is_active = ~is_converged
+            active, sigma, lower, upper, targets = active[is_active], sigma[is_active], lower[is_active], upper[is_active], targets[is_active]
+            evaluated_sigma = evaluated_sigma[is_active]
+            parameters = black_scholes.Option.OptionParameters(
+                parameters.stock_price[is_active],
+                parameters.strike_price[is_active],
+                parameters.risk_free_rate[is_active],
+                None,
+                parameters.maturity_time[is_active],
+            )
+
+        volatility.ravel()[active] = evaluated_sigma
+
+        return ImpliedVolatilitySolver.Result(volatility, status, iteration_count)
+
+    def _get_initial_guess(self, call_prices, parameters, discounted_strike_price):
+        # Corrado-Miller approximation, clipped to the search bracket
+        moneyness = parameters.stock_price - discounted_strike_price
+        centered_price = call_prices - moneyness / 2
+        discriminant = np.maximum(centered_price ** 2 - moneyness ** 2 / np.pi, 0)
+
+        total_volatility = np.sqrt(2 * np.pi) / (parameters.stock_price + discounted_strike_price) * (
+            centered_price + np.sqrt(discriminant)
+        )
+
+        return np.clip(
+            total_volatility / np.sqrt(parameters.maturity_time), 2 * self.min_volatility, self.max_volatility / 2
+        )
@@ -0,0 +1,87 @@
+import contextlib
+import time
+
+
+class PricingStats:
+    def __init__(self):
+        self.phase_timings = {}
+        self.node_count = 0
+        self.payout_call_count = 0
+        self.pricing_callback_count = 0
+        self.peak_node_memory_bytes = 0
+
+    def as_dict(self):
+        return {
+            "phase_timings": dict(self.phase_timings),
+            "node_count": self.node_count,
+            "payout_call_count": self.payout_call_count,
+            "pricing_callback_count": self.pricing_callback_count,
+            "peak_node_memory_bytes": self.peak_node_memory_bytes,
+        }
+
+
+class Instrumentation:
+    def __init__(self, callback=None):
+        self.stats = PricingStats()
+        self.callback = callback
+        self._run_depth = 0
+
+    @contextlib.contextmanager
+    def run(self):
+        # nested runs (e.g. the european build inside an american one) report once, when the outermost ends;
+        # every outermost run starts from fresh stats
+        if self._run_depth == 0:
+            self.stats = PricingStats()
+
+        self._run_depth += 1
+        try:
+            yield self.stats
+        finally:
+            self._run_depth -= 1
+            if self._run_depth == 0 and self.callback is not None:
+                self.callback(self.stats)
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stats.phase_timings[name] = self.stats.phase_timings.get(name, 0) + time.perf_counter() - start
+
+    def add_node_count(self, node_count):
+        self.stats.node_count += node_count
+
+    def add_payout_call_count(self, payout_call_count=1):
+        self.stats.payout_call_count += payout_call_count
+
+    def add_pricing_callback_count(self, pricing_callback_count):
+        self.stats.pricing_callback_count += pricing_callback_count
+
+    def record_node_memory(self, node_memory_bytes):
+        self.stats.peak_node_memory_bytes = max(self.stats.peak_node_memory_bytes, node_memory_bytes)
+
+
+class NullInstrumentation:
+    _NULL_CONTEXT = contextlib.nullcontext()
+
+    def run(self):
+        return NullInstrumentation._NULL_CONTEXT
+
+    def phase(self, _):
+        return NullInstrumentation._NULL_CONTEXT
+
+    def add_node_count(self, _):
+        pass
+
+    def add_payout_call_count(self, _=1):
+        pass
+
+    def add_pricing_callback_count(self, _):
+        pass
+
+    def record_node_memory(self, _):
+        pass
+
+
+NULL_INSTRUMENTATION = NullInstrumentation()
@@ -0,0 +1,22 @@
+import numpy as np
+
+
+class JarrowRuddBinomialTreeParameters:
+    def __init__(self, stock_price_volatility, time_horizon, period_count, interest_rate):
+        # interest rate follows the convention of utils.get_discount_rate
+        self.stock_price_volatility = stock_price_volatility
+        self.time_horizon = time_horizon
+        self.period_count = period_count
+        self.interest_rate = interest_rate
+
+    def get_up_factor(self):
+        return np.exp(self._get_drift() + self.stock_price_volatility * np.sqrt(self._get_period_length()))
+
+    def get_down_factor(self):
+        return np.exp(self._get_drift() - self.stock_price_volatility * np.sqrt(self._get_period_length()))
+
+    def _get_drift(self):
+        return (np.log(1 + self.interest_rate) - self.stock_price_volatility ** 2 / 2) * self._get_period_length()
+
+    def _get_period_length(self):
+        return self.time_horizon / self.period_count
@@ -0,0 +1,29 @@
+import collections
+
+import numpy as np
+
+
+class LatencyStats:
+    def __init__(self, max_sample_count=10_000):
+        # percentiles are taken over the most recent samples only, so long running services stay bounded
+        self.count = 0
+        self.total_latency = 0
+        self._latencies = collections.deque(maxlen=max_sample_count)
+
+    def record(self, latency):
+        self.count += 1
+        self.total_latency += latency
+        self._latencies.append(latency)
+
+    def as_dict(self):
+        if not self._latencies:
+            return {"count": self.count, "mean": None, "p50": None, "p99": None, "max": None}
+
+        latencies = np.fromiter(self._latencies, dtype=float)
+        return {
+            "count": self.count,
+            "mean": self.total_latency / self.count,
+            "p50": float(np.percentile(latencies, 50)),
+            "p99": float(np.percentile(latencies, 99)),
+            "max": float(latencies.max()),
+        }
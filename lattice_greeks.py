@@ -0,0 +1,131 @@
+import copy
+
+import numpy as np
+
+from option import BarrierOption
+from rolling_lattice import RollingLattice
+from utils import get_discount_rate
+
+
+class LatticeGreekCalculator:
+    TOP_LEVEL_COUNT = 3
+
+    def __init__(self, european_tree, tree_parameters, early_exercise=False):
+        # tree_parameters: the CRRBinomialTreeParameters (or jarrow rudd / leisen reimer ones) the tree factors
+        # were built from; bumped trees are rebuilt from them and they give the period length
+        if european_tree.period_count < 2:
+            raise RuntimeError("lattice greeks need at least 2 periods, got %d" % european_tree.period_count)
+        if european_tree.recombining and isinstance(european_tree.option, BarrierOption):
+            # the knock state of the middle node at level 2 depends on the path, so it has no single value
+            raise RuntimeError("lattice greeks are not supported on the recombining barrier lattice")
+
+        self._check_tree_parameters(european_tree, tree_parameters)
+
+        self.european_tree = european_tree
+        self.tree_parameters = tree_parameters
+        self.period_length = tree_parameters.time_horizon / tree_parameters.period_count
+        self.early_exercise = early_exercise
+
+    def get_top_prices(self, portfolio_tree):
+        # option values of the levels 0, 1 and 2 of a built portfolio tree; the last level holds payouts only
+        top_prices = []
+        for level in range(LatticeGreekCalculator.TOP_LEVEL_COUNT):
+            if level < portfolio_tree.get_period_count():
+                top_prices.append(portfolio_tree.get_prices(level))
+            else:
+                top_prices.append(self.european_tree.option.get_payouts(
+                    portfolio_tree.get_stock_prices(level), portfolio_tree.get_max_encountered(level)
+                ))
+
+        return top_prices
+
+    def calculate_rolling_top_prices(self):
+        return RollingLattice(self.european_tree, early_exercise=self.early_exercise).calculate_top_prices(
+            LatticeGreekCalculator.TOP_LEVEL_COUNT
+        )
+
+    def calculate_greeks(self, top_prices, volatility_step=1e-3, rate_step=1e-4):
+        # delta, gamma and theta are read from the levels 1 and 2 of the tree; for the european tree delta is the
+        # root share weight. theta is the derivative with respect to maturity time, as in GreekCalculator
+        stock_price = self.european_tree.stock_price
+        up_factor, down_factor = self.european_tree.up_factor, self.european_tree.down_factor
+
+        root_prices, level_1_prices, level_2_prices = top_prices
+        up_prices, down_prices = self.european_tree.split_children_values(level_2_prices)
+
+        up_stock_price, down_stock_price = stock_price * up_factor, stock_price * down_factor
+        level_2_stock_prices = stock_price * np.array([up_factor ** 2, up_factor * down_factor, down_factor ** 2])
+
+        delta = (level_1_prices[0] - level_1_prices[1]) / (up_stock_price - down_stock_price)
+        up_delta = (up_prices[0] - down_prices[0]) / (level_2_stock_prices[0] - level_2_stock_prices[1])
+        down_delta = (up_prices[1] - down_prices[1]) / (level_2_stock_prices[1] - level_2_stock_prices[2])
+        gamma = (up_delta - down_delta) / ((level_2_stock_prices[0] - level_2_stock_prices[2]) / 2)
+
+        # up-down and down-up nodes coincide on the recombining lattice; on the full tree they are averaged
+        middle_price = (down_prices[0] + up_prices[1]) / 2
+        theta = (root_prices[0] - middle_price) / (2 * self.period_length)
+
+        return {
+            "price": root_prices[0],
+            "delta": delta,
+            "gamma": gamma,
+            "theta": theta,
+            "vega": self._calculate_vega(volatility_step),
+            "rho": self._calculate_rho(rate_step),
+        }
+
+    def _calculate_vega(self, volatility_step):
+        volatility = self.tree_parameters.stock_price_volatility
+
+        left_price = self._calculate_bumped_price(stock_price_volatility=volatility - volatility_step)
+        right_price = self._calculate_bumped_price(stock_price_volatility=volatility + volatility_step)
+
+        return (right_price - left_price) / (2 * volatility_step)
+
+    def _calculate_rho(self, rate_step):
+        # rho is with respect to the continuously compounded rate period_discount_rate / period_length
+        continuous_rate = self.european_tree.period_discount_rate / self.period_length
+
+        left_price = self._calculate_bumped_price(continuous_rate=continuous_rate - rate_step)
+        right_price = self._calculate_bumped_price(continuous_rate=continuous_rate + rate_step)
+
+        return (right_price - left_price) / (2 * rate_step)
+
+    def _calculate_bumped_price(self, stock_price_volatility=None, continuous_rate=None):
+        # bumped trees are only priced, so they always use the price only recombining lattice; their factors are
+        # rebuilt from the bumped parameters, which also moves the rate dependent ones of jarrow rudd and leisen
+        # reimer
+        bumped_parameters = copy.copy(self.tree_parameters)
+        bumped_tree = copy.copy(self.european_tree)
+
+        if stock_price_volatility is not None:
+            bumped_parameters.stock_price_volatility = stock_price_volatility
+        if continuous_rate is not None:
+            bumped_tree.period_discount_rate = continuous_rate * self.period_length
+            if hasattr(bumped_parameters, "interest_rate"):
+                # inverse of utils.get_discount_rate
+                bumped_parameters.interest_rate = np.exp(continuous_rate) - 1
+
+        bumped_tree.up_factor = bumped_parameters.get_up_factor()
+        bumped_tree.down_factor = bumped_parameters.get_down_factor()
+
+        return RollingLattice(bumped_tree, early_exercise=self.early_exercise).calculate_price()
+
+    @staticmethod
+    def _check_tree_parameters(european_tree, tree_parameters):
+        if tree_parameters.period_count != european_tree.period_count:
+            raise RuntimeError("tree parameters are for %d periods, the tree has %d" % (
+                tree_parameters.period_count, european_tree.period_count
+            ))
+
+        factors = [tree_parameters.get_up_factor(), tree_parameters.get_down_factor()]
+        if not np.allclose(factors, [european_tree.up_factor, european_tree.down_factor], rtol=1e-12, atol=0):
+            raise RuntimeError("tree factors were not built from the given tree parameters")
+
+        if hasattr(tree_parameters, "interest_rate"):
+            period_length = tree_parameters.time_horizon / tree_parameters.period_count
+            if not np.isclose(
+                get_discount_rate(tree_parameters.interest_rate, period_length), european_tree.period_discount_rate,
+                rtol=1e-12, atol=0,
+            ):
+                raise RuntimeError("tree discount rate does not match the interest rate of the tree parameters")
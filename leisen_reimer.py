@@ -0,0 +1,49 @@
+import numpy as np
+
+
+class LeisenReimerBinomialTreeParameters:
+    def __init__(self, stock_price, strike_price, stock_price_volatility, time_horizon, period_count, interest_rate):
+        # interest rate follows the convention of utils.get_discount_rate; the lattice is centred on the strike,
+        # which only holds for an odd number of periods
+        if period_count % 2 != 1:
+            raise RuntimeError("leisen reimer lattice needs an odd period count, got %d" % period_count)
+
+        self.stock_price = stock_price
+        self.strike_price = strike_price
+        self.stock_price_volatility = stock_price_volatility
+        self.time_horizon = time_horizon
+        self.period_count = period_count
+        self.interest_rate = interest_rate
+
+    def get_up_factor(self):
+        d1, d2 = self._get_d1_d2()
+        return self._get_growth_factor() * self._invert_normal_cdf(d1) / self._invert_normal_cdf(d2)
+
+    def get_down_factor(self):
+        d1, d2 = self._get_d1_d2()
+        up_probability = self._invert_normal_cdf(d2)
+        return (self._get_growth_factor() - up_probability * self.get_up_factor()) / (1 - up_probability)
+
+    def _invert_normal_cdf(self, z):
+        # Peizer-Pratt method 2 inversion: probability of the binomial tail matching the normal cdf at z
+        n = self.period_count
+        exponent = -(z / (n + 1 / 3 + 0.1 / (n + 1))) ** 2 * (n + 1 / 6)
+        return 0.5 + np.sign(z) * 0.5 * np.sqrt(1 - np.exp(exponent))
+
+    def _get_d1_d2(self):
+        volatility_term = self.stock_price_volatility * np.sqrt(self.time_horizon)
+        d1 = (
+            np.log(self.stock_price / self.strike_price)
+            + (self._get_continuous_interest_rate() + self.stock_price_volatility ** 2 / 2) * self.time_horizon
+        ) / volatility_term
+
+        return d1, d1 - volatility_term
+
+    def _get_growth_factor(self):
+        return np.exp(self._get_continuous_interest_rate() * self._get_period_length())
+
+    def _get_continuous_interest_rate(self):
+        return np.log(1 + self.interest_rate)
+
+    def _get_period_length(self):
+        return self.time_horizon / self.period_count
@@ -0,0 +1,74 @@
+import numpy as np
+
+
+class MonteCarloEngine:
+    class Result:
+        def __init__(self, price, standard_error, sample_count):
+            self.price = price
+            self.standard_error = standard_error
+            self.sample_count = sample_count
+
+    def __init__(self, stock_price, risk_free_rate, volatility, time_horizon, period_count, option,
+                 path_count=100_000, chunk_size=10_000, antithetic=True, seed=None):
+        self.stock_price = stock_price
+        self.risk_free_rate = risk_free_rate
+        self.volatility = volatility
+        self.time_horizon = time_horizon
+        self.period_count = period_count
+        self.option = option
+        self.path_count = path_count
+        self.chunk_size = chunk_size
+        self.antithetic = antithetic
+        self.seed = seed
+
+    def calculate_price(self, executor=None):
+        # every chunk gets its own child seed, so the result does not depend on how chunks are scheduled
+        chunk_path_counts = [
+            min(self.chunk_size, self.path_count - chunk_start) for chunk_start in range(0, self.path_count, self.chunk_size)
+        ]
+        chunk_seeds = np.random.SeedSequence(self.seed).spawn(len(chunk_path_counts))
+
+        map_function = map if executor is None else executor.map
+        chunk_sums = list(map_function(self._simulate_chunk, chunk_seeds, chunk_path_counts))
+
+        payout_sum = sum(chunk_sum[0] for chunk_sum in chunk_sums)
+        squared_payout_sum = sum(chunk_sum[1] for chunk_sum in chunk_sums)
+        sample_count = sum(chunk_sum[2] for chunk_sum in chunk_sums)
+
+        discount_factor = np.exp(-self.risk_free_rate * self.time_horizon)
+        mean = payout_sum / sample_count
+        variance = max(squared_payout_sum / sample_count - mean ** 2, 0) * sample_count / max(sample_count - 1, 1)
+
+        return MonteCarloEngine.Result(
+            discount_factor * mean, discount_factor * np.sqrt(variance / sample_count), sample_count
+        )
+
+    def _simulate_chunk(self, seed, path_count):
+        random_generator = np.random.default_rng(seed)
+        period_length = self.time_horizon / self.period_count
+        drift = (self.risk_free_rate - self.volatility ** 2 / 2) * period_length
+        diffusion = self.volatility * np.sqrt(period_length)
+
+        sample_count = (path_count + 1) // 2 if self.antithetic else path_count
+        simulated_count = 2 * sample_count if self.antithetic else sample_count
+
+        log_prices = np.zeros(simulated_count)
+        max_log_prices = np.zeros(simulated_count)
+        shocks = np.empty(simulated_count)
+
+        for _ in range(self.period_count):
+            random_generator.standard_normal(sample_count, out=shocks[:sample_count])
+            if self.antithetic:
+                np.negative(shocks[:sample_count], out=shocks[sample_count:])
+
+            log_prices += drift + diffusion * shocks
+            np.maximum(max_log_prices, log_prices, out=max_log_prices)
+
+        payouts = self.option.get_payouts(
+            self.stock_price * np.exp(log_prices), self.stock_price * np.exp(max_log_prices)
+        )
+        if self.antithetic:
+            # antithetic pairs are averaged first, so the standard error reflects the variance reduction
+            payouts = (payouts[:sample_count] + payouts[sample_count:]) / 2
+
+        return payouts.sum(), (payouts ** 2).sum(), sample_count
@@ -1,3 +1,6 @@
+import numpy as np
+
+
 class PriceInfo:
     def __init__(self, stock_price, max_encountered):
         self.stock_price = stock_price
@@ -26,6 +29,23 @@ class Option:
     def short_put_option(cls, strike_price):
         return cls(Option.OPTION_TYPE_SHORT_PUT, strike_price)
 
+    @staticmethod
+    def get_chain_payouts(options, stock_prices):
+        # (stock price, option) payout matrix of a chain of vanilla options in a single pass
+        option_types = np.array([option.option_type for option in options])
+        strike_prices = np.array([option.strike_price for option in options], dtype=float)
+
+        if not np.isin(option_types, [
+            Option.OPTION_TYPE_LONG_CALL, Option.OPTION_TYPE_LONG_PUT, Option.OPTION_TYPE_SHORT_CALL, Option.OPTION_TYPE_SHORT_PUT
+        ]).all():
+            raise RuntimeError("unexpected option types %s" % option_types)
+
+        call_sign = np.where(np.isin(option_types, [Option.OPTION_TYPE_LONG_CALL, Option.OPTION_TYPE_SHORT_CALL]), 1.0, -1.0)
+        long_sign = np.where(np.isin(option_types, [Option.OPTION_TYPE_LONG_CALL, Option.OPTION_TYPE_LONG_PUT]), 1.0, -1.0)
+
+        intrinsic_values = call_sign * (np.asarray(stock_prices, dtype=float)[:, np.newaxis] - strike_prices)
+        return long_sign * np.maximum(intrinsic_values, 0)
+
     def __init__(self, option_type, strike_price):
         self.option_type = option_type
         self.strike_price = strike_price
@@ -44,6 +64,20 @@ class Option:
         else:
             raise RuntimeError("unexpected option type %d", self.option_type)
 
+    def get_payouts(self, stock_prices, max_encountered, out=None):
+        stock_prices = np.asarray(stock_prices, dtype=float)
+
+        if self.option_type == Option.OPTION_TYPE_LONG_CALL:
+            return np.maximum(np.subtract(stock_prices, self.strike_price, out=out), 0, out=out)
+        elif self.option_type == Option.OPTION_TYPE_SHORT_CALL:
+            return np.minimum(np.subtract(self.strike_price, stock_prices, out=out), 0, out=out)
+        elif self.option_type == Option.OPTION_TYPE_LONG_PUT:
+            return np.maximum(np.subtract(self.strike_price, stock_prices, out=out), 0, out=out)
+        elif self.option_type == Option.OPTION_TYPE_SHORT_PUT:
+            return np.minimum(np.subtract(stock_prices, self.strike_price, out=out), 0, out=out)
+        else:
+            raise RuntimeError("unexpected option type %d", self.option_type)
+
 
 class BarrierOption:
     def __init__(self, option, barrier_price):
@@ -55,3 +89,7 @@ class BarrierOption:
             return 0
 
         return self.option.get_payout(price_info)
+
+    def get_payouts(self, stock_prices, max_encountered, out=None):
+        payouts = self.option.get_payouts(stock_prices, max_encountered, out=out)
+        return np.multiply(payouts, np.asarray(max_encountered) >= self.barrier_price, out=out)
@@ -1,23 +1,114 @@
+import numpy as np
+
+from portfolios import OptionExecutionPortfolio
+
+
 class PortfolioTree:
-    def __init__(self, portfolio_map, stock_price_map, period_count):
-        self._portfolio_map = portfolio_map
-        self._stock_price_map = stock_price_map
+    class _PortfolioView:
+        __slots__ = ("_tree", "_level", "_index")
+
+        def __init__(self, tree, level, index):
+            self._tree = tree
+            self._level = level
+            self._index = index
+
+        @property
+        def share_weight(self):
+            return self._tree._share_weights[self._level][self._index]
+
+        @property
+        def bond_weight(self):
+            return self._tree._bond_weights[self._level][self._index]
+
+        @property
+        def stock_price(self):
+            return self._tree._stock_prices[self._level][self._index]
+
+        @property
+        def price(self):
+            return self._tree._prices[self._level][self._index]
+
+        @property
+        def should_execute(self):
+            return bool(self._tree._should_execute[self._level][self._index])
+
+        def get_price(self):
+            return self.price
+
+    class _PriceInfoView:
+        __slots__ = ("_tree", "_level", "_index")
+
+        def __init__(self, tree, level, index):
+            self._tree = tree
+            self._level = level
+            self._index = index
+
+        @property
+        def curr(self):
+            return self._tree._stock_prices[self._level][self._index]
+
+        @property
+        def max_encountered(self):
+            return self._tree._max_encountered[self._level][self._index]
+
+    def __init__(self, period_count, stock_prices=None, max_encountered=None):
+        # one contiguous array per field and level; stock data has an extra terminal level
         self.period_count = period_count
+        self._stock_prices = stock_prices or [np.zeros(self._get_level_size(level)) for level in range(period_count + 1)]
+        self._max_encountered = max_encountered or [np.zeros(self._get_level_size(level)) for level in range(period_count + 1)]
+        self._share_weights = [np.zeros(self._get_level_size(level)) for level in range(period_count)]
+        self._bond_weights = [np.zeros(self._get_level_size(level)) for level in range(period_count)]
+        self._prices = [np.zeros(self._get_level_size(level)) for level in range(period_count)]
+        self._should_execute = [np.zeros(self._get_level_size(level), dtype=bool) for level in range(period_count)]
+
+    def get_stock_prices(self, level):
+        return self._stock_prices[level]
+
+    def get_max_encountered(self, level):
+        return self._max_encountered[level]
+
+    def get_share_weights(self, level):
+        return self._share_weights[level]
+
+    def get_bond_weights(self, level):
+        return self._bond_weights[level]
+
+    def get_prices(self, level):
+        return self._prices[level]
+
+    def get_should_execute(self, level):
+        return self._should_execute[level]
+
+    @staticmethod
+    def split_children_values(values):
+        return values[0::2], values[1::2]
 
     def get_stock_price_data(self, level, index):
-        return self._stock_price_map[(level, index)]
+        return PortfolioTree._PriceInfoView(self, level, index)
+
+    def get_children_stock_price_data(self, level, index):
+        index_up, index_down = self._get_children_indices(index)
+        return self.get_stock_price_data(level + 1, index_up), self.get_stock_price_data(level + 1, index_down)
 
     def update_portfolio(self, level, index, portfolio):
-        self._portfolio_map[(level, index)] = portfolio
+        if isinstance(portfolio, OptionExecutionPortfolio):
+            self._should_execute[level][index] = portfolio.should_execute
+        else:
+            self._share_weights[level][index] = portfolio.share_weight
+            self._bond_weights[level][index] = portfolio.bond_weight
+            self._should_execute[level][index] = False
+
+        self._prices[level][index] = portfolio.get_price()
 
     def get_root_portfolio(self):
         return self.get_portfolio(0, 0)
 
     def get_portfolio(self, level, index):
-        return self._portfolio_map[(level, index)]
+        return PortfolioTree._PortfolioView(self, level, index)
 
     def get_children_portfolios(self, level, index):
-        return self._portfolio_map[(level + 1, 2 * index)], self._portfolio_map[(level + 1, 2 * index + 1)]
+        index_up, index_down = self._get_children_indices(index)
+        return self.get_portfolio(level + 1, index_up), self.get_portfolio(level + 1, index_down)
 
     def has_children_portfolios(self, level, _):
         return level < self.period_count - 1
@@ -27,4 +118,23 @@ class PortfolioTree:
 
     def get_node_count_at_period(self, period):
         assert period < self.period_count
-        return 2 ** period
+        return self._get_level_size(period)
+
+    def get_node_count(self):
+        return sum(len(level_stock_prices) for level_stock_prices in self._stock_prices)
+
+    def get_memory_size(self):
+        return sum(
+            level_values.nbytes
+            for field_levels in [
+                self._stock_prices, self._max_encountered, self._share_weights, self._bond_weights, self._prices,
+                self._should_execute,
+            ]
+            for level_values in field_levels
+        )
+
+    def _get_level_size(self, level):
+        return 2 ** level
+
+    def _get_children_indices(self, index):
+        return 2 * index, 2 * index + 1
@@ -0,0 +1,196 @@
+import asyncio
+import json
+import math
+import time
+
+import numpy as np
+
+import black_scholes
+from latency_stats import LatencyStats
+from option import Option
+from stock_lattice import StockLattice
+
+
+class PricingServer:
+    ENGINE_BLACK_SCHOLES = "black_scholes"
+    ENGINE_EUROPEAN_LATTICE = "european_lattice"
+    ENGINE_AMERICAN_LATTICE = "american_lattice"
+
+    ENGINES = [ENGINE_BLACK_SCHOLES, ENGINE_EUROPEAN_LATTICE, ENGINE_AMERICAN_LATTICE]
+    PARAMETER_NAMES = ["stock_price", "strike_price", "risk_free_rate", "volatility", "maturity_time"]
+    # the rate may be zero or negative, the other parameters price to nan outside of the positive domain
+    POSITIVE_PARAMETER_NAMES = ["stock_price", "strike_price", "volatility", "maturity_time"]
+
+    def __init__(self, batch_window=1e-3, max_batch_size=1024, period_count=200):
+        # requests arriving within batch_window of the first pending one are priced together, up to max_batch_size
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self.period_count = period_count
+
+        self.latency_stats = LatencyStats()
+        self.request_count = 0
+        self.batch_count = 0
+        self.start_time = time.perf_counter()
+
+        self._bs_option = black_scholes.Option()
+        self._pending = []
+        self._flush_handle = None
+
+    async def price(self, request):
+        # request: engine (black scholes by default), is_call and the black scholes option parameters;
+        # risk free rate is continuously compounded for every engine
+        request = self._parse_request(request)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((request, future, time.perf_counter()))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.batch_window, self._flush)
+
+        return await future
+
+    @staticmethod
+    def _parse_request(request):
+        # malformed requests are rejected here, before they can join (and fail) a batch
+        if not isinstance(request, dict):
+            raise RuntimeError("request must be an object, got %s" % type(request).__name__)
+
+        engine = request.get("engine", PricingServer.ENGINE_BLACK_SCHOLES)
+        if not isinstance(engine, str) or engine not in PricingServer.ENGINES:
+            raise RuntimeError("unexpected engine %s" % engine)
+
+        missing_names = [name for name in PricingServer.PARAMETER_NAMES + ["is_call"] if name not in request]
+        if missing_names:
+            raise RuntimeError("missing request fields %s" % missing_names)
+
+        parsed_request = {"engine": engine, "is_call": request["is_call"]}
+        if not isinstance(parsed_request["is_call"], bool):
+            raise RuntimeError("is_call must be a boolean, got %r" % (parsed_request["is_call"],))
+
+        for name in PricingServer.PARAMETER_NAMES:
+            value = request[name]
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+                raise RuntimeError("%s must be a finite number, got %r" % (name, value))
+            if name in PricingServer.POSITIVE_PARAMETER_NAMES and value <= 0:
+                raise RuntimeError("%s must be positive, got %r" % (name, value))
+            parsed_request[name] = float(value)
+
+        return parsed_request
+
+    def get_stats(self):
+        elapsed_time = time.perf_counter() - self.start_time
+
+        return {
+            "request_count": self.request_count,
+            "batch_count": self.batch_count,
+            "mean_batch_size": self.request_count / self.batch_count if self.batch_count else None,
+            "throughput": self.request_count / elapsed_time if elapsed_time > 0 else None,
+            "latency": self.latency_stats.as_dict(),
+        }
+
+    async def start_unix_server(self, path):
+        return await asyncio.start_unix_server(self._handle_connection, path=path)
+
+    async def start_server(self, host="127.0.0.1", port=0):
+        return await asyncio.start_server(self._handle_connection, host=host, port=port)
+
+    async def _handle_connection(self, reader, writer):
+        # newline delimited json: {"id": ..., "type": "price", ...} or {"id": ..., "type": "stats"}; requests of one
+        # connection are served concurrently, so responses may come out of order and carry the request id
+        tasks = set()
+        try:
+            async for line in reader:
+                task = asyncio.create_task(self._respond(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+
+            await asyncio.gather(*tasks)
+        finally:
+            writer.close()
+
+    async def _respond(self, line, writer):
+        response = {"id": None}
+        try:
+            message = json.loads(line)
+            if not isinstance(message, dict):
+                raise RuntimeError("message must be an object, got %s" % type(message).__name__)
+
+            response["id"] = message.get("id")
+
+            if message.get("type") == "stats":
+                response["stats"] = self.get_stats()
+            else:
+                response["price"] = await self.price(message)
+        except Exception as error:
+            # every message gets a reply, whatever failed its batch
+            response["error"] = str(error)
+
+        writer.write((json.dumps(response) + "\n").encode())
+        await writer.drain()
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        self.batch_count += 1
+        self.request_count += len(batch)
+
+        engine_batches = {}
+        for item in batch:
+            engine_batches.setdefault(item[0]["engine"], []).append(item)
+
+        for engine, engine_batch in engine_batches.items():
+            try:
+                prices = self._price_batch(engine, [request for request, _, _ in engine_batch])
+            except Exception as error:
+                # this runs as a loop callback, anything escaping would leave the futures pending forever
+                for _, future, _ in engine_batch:
+                    if not future.done():
+                        future.set_exception(error)
+                continue
+
+            end_time = time.perf_counter()
+            for (_, future, start_time), price in zip(engine_batch, prices):
+                self.latency_stats.record(end_time - start_time)
+                if not future.done():
+                    future.set_result(float(price))
+
+    def _price_batch(self, engine, requests):
+        columns = {
+            name: np.array([request[name] for request in requests], dtype=float) for name in PricingServer.PARAMETER_NAMES
+        }
+        is_call = np.array([request["is_call"] for request in requests])
+
+        if engine == PricingServer.ENGINE_BLACK_SCHOLES:
+            return self._bs_option.get_prices(black_scholes.Option.OptionParameters(**columns), is_call)
+
+        return self._price_lattice_batch(columns, is_call, engine == PricingServer.ENGINE_AMERICAN_LATTICE)
+
+    def _price_lattice_batch(self, columns, is_call, early_exercise):
+        # requests sharing a stock lattice (stock price, volatility, maturity, rate) are priced as one strike chain
+        prices = np.empty(len(is_call))
+        lattice_keys = np.column_stack([
+            columns["stock_price"], columns["volatility"], columns["maturity_time"], columns["risk_free_rate"]
+        ])
+
+        for lattice_key in np.unique(lattice_keys, axis=0):
+            rows = np.flatnonzero((lattice_keys == lattice_key).all(axis=1))
+            stock_price, volatility, maturity_time, risk_free_rate = lattice_key
+
+            lattice = StockLattice.get_cached(
+                stock_price, volatility, maturity_time, self.period_count, np.exp(risk_free_rate) - 1
+            )
+            options = [
+                (Option.long_call_option if is_call[row] else Option.long_put_option)(columns["strike_price"][row])
+                for row in rows
+            ]
+            prices[rows] = lattice.calculate_prices(options, early_exercise=early_exercise)
+
+        return prices
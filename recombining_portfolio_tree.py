@@ -0,0 +1,24 @@
+import numpy as np
+
+from portfolio_tree import PortfolioTree
+
+
+class RecombiningPortfolioTree(PortfolioTree):
+    # node index is the number of down moves taken to reach the node
+
+    def __init__(self, period_count, stock_prices=None, max_encountered=None):
+        super().__init__(period_count, stock_prices, max_encountered)
+
+        # running maximum is path dependent and therefore not tracked by the recombining lattice
+        for level_max_encountered in self._max_encountered:
+            level_max_encountered.fill(np.nan)
+
+    @staticmethod
+    def split_children_values(values):
+        return values[:-1], values[1:]
+
+    def _get_level_size(self, level):
+        return level + 1
+
+    def _get_children_indices(self, index):
+        return index, index + 1
@@ -0,0 +1,126 @@
+import asyncio
+import time
+
+from book_pricer import BookPricer
+from latency_stats import LatencyStats
+
+
+class RepricingService:
+    GREEK_COLUMNS = ["delta", "gamma", "theta", "vega", "rho"]
+
+    class MarketUpdate:
+        def __init__(self, underlying, stock_price, volatility, tick_time):
+            self.underlying = underlying
+            self.stock_price = stock_price
+            self.volatility = volatility
+            self.tick_time = tick_time
+
+    class Snapshot:
+        def __init__(self, underlying, stock_price, volatility, book, tick_time, latency):
+            self.underlying = underlying
+            self.stock_price = stock_price
+            self.volatility = volatility
+            self.book = book
+            self.tick_time = tick_time
+            self.latency = latency
+
+        def get_total_price(self):
+            return self.book.total_prices.sum()
+
+        def get_total_greeks(self):
+            # amount weighted greeks of the positions on the underlying
+            return {
+                name: (self.book.amount * self.book[name]).sum() for name in RepricingService.GREEK_COLUMNS
+            }
+
+    _STOP = object()
+
+    def __init__(self, book, risk_free_rate, executor=None, period_count=200, publish_callback=None):
+        # book columns: underlying and the BookPricer columns; tree engines are priced in the executor, the event
+        # loop's default one when not given
+        self.book_pricer = BookPricer(risk_free_rate, period_count=period_count)
+        self.executor = executor
+        self.publish_callback = publish_callback
+
+        self.latency_stats = LatencyStats()
+        self.tick_count = 0
+        self.coalesced_tick_count = 0
+        self.ignored_tick_count = 0
+
+        self._books = {underlying: positions for underlying, positions in book.groupby("underlying")}
+        self._snapshots = {}
+        self._queue = asyncio.Queue()
+
+    def submit(self, underlying, stock_price, volatility):
+        # in process feed; ticks are queued as they come and coalesced by the running service
+        self.tick_count += 1
+        self._queue.put_nowait(RepricingService.MarketUpdate(underlying, stock_price, volatility, time.perf_counter()))
+
+    def stop(self):
+        # the service prices the ticks queued before the stop and returns from run
+        self._queue.put_nowait(RepricingService._STOP)
+
+    def get_snapshot(self, underlying):
+        return self._snapshots.get(underlying)
+
+    def get_stats(self):
+        return {
+            "tick_count": self.tick_count,
+            "coalesced_tick_count": self.coalesced_tick_count,
+            "ignored_tick_count": self.ignored_tick_count,
+            "latency": self.latency_stats.as_dict(),
+        }
+
+    async def run(self):
+        while True:
+            updates, should_stop = await self._get_latest_updates()
+
+            await asyncio.gather(*(self._reprice(update) for update in updates))
+
+            if should_stop:
+                return
+
+    async def _get_latest_updates(self):
+        # waits for one tick, then drains whatever arrived meanwhile; only the latest tick per underlying is kept
+        latest_updates = {}
+        update = await self._queue.get()
+
+        while update is not RepricingService._STOP:
+            if update.underlying not in self._books:
+                self.ignored_tick_count += 1
+            else:
+                if update.underlying in latest_updates:
+                    self.coalesced_tick_count += 1
+                latest_updates[update.underlying] = update
+
+            if self._queue.empty():
+                return list(latest_updates.values()), False
+            update = self._queue.get_nowait()
+
+        return list(latest_updates.values()), True
+
+    async def _reprice(self, update):
+        positions = self._books[update.underlying]
+
+        if self._has_tree_positions(positions):
+            # without an executor the loop's default one is used, tree books never block tick intake
+            priced_book = await asyncio.get_running_loop().run_in_executor(
+                self.executor, self.book_pricer.price_book, positions, update.stock_price, update.volatility
+            )
+        else:
+            priced_book = self.book_pricer.price_book(positions, update.stock_price, update.volatility)
+
+        latency = time.perf_counter() - update.tick_time
+        self.latency_stats.record(latency)
+
+        snapshot = RepricingService.Snapshot(
+            update.underlying, update.stock_price, update.volatility, priced_book, update.tick_time, latency
+        )
+        self._snapshots[update.underlying] = snapshot
+
+        if self.publish_callback is not None:
+            self.publish_callback(snapshot)
+
+    @staticmethod
+    def _has_tree_positions(positions):
+        return "engine" in positions and (positions.engine != BookPricer.ENGINE_BLACK_SCHOLES).any()
@@ -0,0 +1,130 @@
+import numpy as np
+
+from barrier_portfolio_tree import BarrierPortfolioTree
+from instrumentation import NULL_INSTRUMENTATION
+from option import BarrierOption
+from stock_lattice import StockLattice
+from utils import get_risk_neutral_probability
+
+
+class RollingLattice:
+    def __init__(self, european_tree, early_exercise=False, instrumentation=None, penultimate_price_gen=None):
+        self.up_factor = european_tree.up_factor
+        self.down_factor = european_tree.down_factor
+        self.period_discount_rate = european_tree.period_discount_rate
+        self.period_count = european_tree.period_count
+        self.stock_price = european_tree.stock_price
+        self.option = european_tree.option
+        self.discount_rate_factor_gen = european_tree.discount_rate_factor_gen
+        self.early_exercise = early_exercise
+        self.instrumentation = instrumentation or getattr(european_tree, "instrumentation", NULL_INSTRUMENTATION)
+        # when set, maps the stock prices of level period_count - 1 to option values replacing the last period,
+        # e.g. one period black scholes prices to smooth the lattice (BBS)
+        self.penultimate_price_gen = penultimate_price_gen
+
+    def calculate_price(self):
+        with self.instrumentation.run(), self.instrumentation.phase("backward_induction"):
+            if isinstance(self.option, BarrierOption):
+                if self.penultimate_price_gen is not None:
+                    raise RuntimeError("penultimate prices are not supported for barrier options")
+
+                return self._calculate_barrier_price()
+
+            return self._calculate_top_prices(1)[0][0]
+
+    def calculate_top_prices(self, level_count):
+        # option values of the levels 0 .. level_count - 1, e.g. for the greeks read from the first levels
+        if isinstance(self.option, BarrierOption):
+            raise RuntimeError("top level prices are not supported for barrier options")
+
+        with self.instrumentation.run(), self.instrumentation.phase("backward_induction"):
+            return self._calculate_top_prices(level_count)
+
+    def _calculate_top_prices(self, level_count):
+        # rolls a single level sized buffer backward: level values overwrite the head of the previous level
+        up_weight, down_weight = self._get_transition_weights()
+        stock_prices = self._get_terminal_stock_prices()
+        top_level = self.period_count
+
+        if self.penultimate_price_gen is None:
+            prices = self.option.get_payouts(stock_prices, stock_prices)
+        else:
+            top_level -= 1
+            stock_prices = stock_prices[:-1] / self.up_factor
+            prices = np.array(self.penultimate_price_gen(stock_prices), dtype=float)
+
+            if self.early_exercise:
+                np.maximum(prices, self.option.get_payouts(stock_prices, stock_prices), out=prices)
+
+        top_prices = {}
+        if top_level < level_count:
+            top_prices[top_level] = prices.copy()
+
+        down_prices = np.empty(top_level)
+        execution_prices = np.empty(top_level)
+
+        for level in reversed(range(top_level)):
+            size = level + 1
+            level_prices = prices[:size]
+
+            np.multiply(prices[1:size + 1], down_weight, out=down_prices[:size])
+            np.multiply(level_prices, up_weight, out=level_prices)
+            np.add(level_prices, down_prices[:size], out=level_prices)
+
+            if self.early_exercise:
+                level_stock_prices = np.divide(stock_prices[:size], self.up_factor, out=stock_prices[:size])
+                self.option.get_payouts(level_stock_prices, level_stock_prices, out=execution_prices[:size])
+                np.maximum(level_prices, execution_prices[:size], out=level_prices)
+
+            if level < level_count:
+                top_prices[level] = level_prices.copy()
+
+        self._record_lattice(
+            stock_prices.nbytes + prices.nbytes + down_prices.nbytes + execution_prices.nbytes,
+            payout_call_count=self.period_count + 1 if self.early_exercise else 1,
+        )
+
+        return [top_prices[level] for level in range(level_count)]
+
+    def _calculate_barrier_price(self):
+        # knock states as in BarrierPortfolioTree
+        up_weight, down_weight = self._get_transition_weights()
+        stock_prices = self._get_terminal_stock_prices()
+        is_root_hit = self.stock_price >= self.option.barrier_price
+
+        prices = BarrierPortfolioTree.get_payouts(self.option, stock_prices)
+
+        for level in reversed(range(self.period_count)):
+            size = level + 1
+            is_child_hit = is_root_hit | (stock_prices[:size + 1] >= self.option.barrier_price)
+            up_prices, down_prices = BarrierPortfolioTree.split_children_values(prices[:size + 1], is_child_hit)
+
+            level_prices = prices[:size]
+            np.multiply(up_prices, up_weight, out=level_prices)
+            level_prices += down_prices * down_weight
+
+            level_stock_prices = np.divide(stock_prices[:size], self.up_factor, out=stock_prices[:size])
+            if self.early_exercise:
+                np.maximum(level_prices, BarrierPortfolioTree.get_payouts(self.option, level_stock_prices), out=level_prices)
+
+        self._record_lattice(
+            stock_prices.nbytes + prices.nbytes,
+            payout_call_count=2 * (self.period_count + 1) if self.early_exercise else 2,
+            state_count=2,
+        )
+
+        root_state = BarrierPortfolioTree.KNOCKED_IN if is_root_hit else BarrierPortfolioTree.NOT_KNOCKED_IN
+        return prices[0, root_state]
+
+    def _record_lattice(self, buffer_memory_bytes, payout_call_count, state_count=1):
+        self.instrumentation.add_node_count(state_count * (self.period_count + 1) * (self.period_count + 2) // 2)
+        self.instrumentation.add_payout_call_count(payout_call_count)
+        self.instrumentation.record_node_memory(buffer_memory_bytes)
+
+    def _get_transition_weights(self):
+        discount_factor = self.discount_rate_factor_gen(self.period_discount_rate)
+        up_probability = get_risk_neutral_probability(discount_factor, self.up_factor, self.down_factor)
+        return up_probability / discount_factor, (1 - up_probability) / discount_factor
+
+    def _get_terminal_stock_prices(self):
+        return StockLattice.get_level_stock_prices(self.stock_price, self.up_factor, self.down_factor, self.period_count)
@@ -0,0 +1,68 @@
+import numpy as np
+
+import black_scholes
+
+
+class ScenarioRiskEngine:
+    # maturities rolled to or past expiry are priced at this residual maturity, i.e. close to intrinsic value
+    MIN_MATURITY = 1e-8
+
+    class Result:
+        def __init__(self, full_revaluation_pnl, taylor_pnl):
+            # both grids are indexed by (stock price shock, volatility shock, maturity shock)
+            self.full_revaluation_pnl = full_revaluation_pnl
+            self.taylor_pnl = taylor_pnl
+
+    def __init__(self, risk_free_rate, block_size=10_000):
+        self.risk_free_rate = risk_free_rate
+        self.block_size = block_size
+        self.option = black_scholes.Option()
+
+    def calculate_pnl(self, book, stock_price, volatility, stock_price_shocks, volatility_shocks, maturity_shocks):
+        # book columns: amount, type ("call" / "put"), strike_price, maturity
+        stock_price_shocks = np.asarray(stock_price_shocks, dtype=float).reshape(1, -1, 1, 1)
+        volatility_shocks = np.asarray(volatility_shocks, dtype=float).reshape(1, 1, -1, 1)
+        maturity_shocks = np.asarray(maturity_shocks, dtype=float).reshape(1, 1, 1, -1)
+
+        grid_shape = (stock_price_shocks.shape[1], volatility_shocks.shape[2], maturity_shocks.shape[3])
+        full_revaluation_pnl = np.zeros(grid_shape)
+        taylor_pnl = np.zeros(grid_shape)
+
+        amounts = book["amount"].to_numpy(dtype=float)
+        is_call = book["type"].to_numpy() == "call"
+        strike_prices = book["strike_price"].to_numpy(dtype=float)
+        maturities = book["maturity"].to_numpy(dtype=float)
+
+        # positions are processed in blocks so that the (position x scenario) tensor stays bounded
+        for start in range(0, len(book), self.block_size):
+            block = slice(start, start + self.block_size)
+            block_amounts = amounts[block].reshape(-1, 1, 1, 1)
+            block_is_call = is_call[block].reshape(-1, 1, 1, 1)
+
+            base_parameters = black_scholes.Option.OptionParameters(
+                stock_price, strike_prices[block], self.risk_free_rate, volatility, maturities[block]
+            )
+            base_prices = self.option.get_prices(base_parameters, is_call[block]).reshape(-1, 1, 1, 1)
+            greeks = {
+                name: values.reshape(-1, 1, 1, 1)
+                for name, values in self.option.get_greeks(base_parameters, is_call[block]).items()
+            }
+
+            shocked_parameters = black_scholes.Option.OptionParameters(
+                stock_price + stock_price_shocks,
+                strike_prices[block].reshape(-1, 1, 1, 1),
+                self.risk_free_rate,
+                volatility + volatility_shocks,
+                np.maximum(maturities[block].reshape(-1, 1, 1, 1) + maturity_shocks, ScenarioRiskEngine.MIN_MATURITY),
+            )
+            shocked_prices = self.option.get_prices(shocked_parameters, block_is_call)
+
+            full_revaluation_pnl += (block_amounts * (shocked_prices - base_prices)).sum(axis=0)
+            taylor_pnl += (block_amounts * (
+                greeks["delta"] * stock_price_shocks
+                + 0.5 * greeks["gamma"] * stock_price_shocks ** 2
+                + greeks["theta"] * maturity_shocks
+                + greeks["vega"] * volatility_shocks
+            )).sum(axis=0)
+
+        return ScenarioRiskEngine.Result(full_revaluation_pnl, taylor_pnl)
@@ -0,0 +1,62 @@
+import functools
+
+import numpy as np
+
+from crr import CRRBinomialTreeParameters
+from option import Option
+from utils import get_discount_factor, get_discount_rate, get_risk_neutral_probability
+
+
+class StockLattice:
+    CACHE_SIZE = 32
+
+    def __init__(self, stock_price, stock_price_volatility, time_horizon, period_count, interest_rate):
+        # interest rate follows the convention of utils.get_discount_rate
+        crr_parameters = CRRBinomialTreeParameters(stock_price_volatility, time_horizon, period_count)
+
+        self.stock_price = stock_price
+        self.period_count = period_count
+        self.up_factor = crr_parameters.get_up_factor()
+        self.down_factor = crr_parameters.get_down_factor()
+        self.period_discount_rate = get_discount_rate(interest_rate, time_horizon / period_count)
+
+        self._stock_prices = [
+            StockLattice.get_level_stock_prices(self.stock_price, self.up_factor, self.down_factor, level)
+            for level in range(period_count + 1)
+        ]
+        for level_stock_prices in self._stock_prices:
+            # lattices are shared through the cache, so they must not be modified by their users
+            level_stock_prices.flags.writeable = False
+
+    @staticmethod
+    def get_cached(stock_price, stock_price_volatility, time_horizon, period_count, interest_rate):
+        return _get_cached_stock_lattice(stock_price, stock_price_volatility, time_horizon, period_count, interest_rate)
+
+    @staticmethod
+    def get_level_stock_prices(stock_price, up_factor, down_factor, level):
+        # recombining lattice level, node j is reached by level - j up moves and j down moves
+        return stock_price * up_factor ** np.arange(level, -1, -1, dtype=float) * down_factor ** np.arange(level + 1, dtype=float)
+
+    def get_stock_prices(self, level):
+        return self._stock_prices[level]
+
+    def calculate_prices(self, options, early_exercise=False):
+        # backward induction over a (level node, option) array for a chain of vanilla options
+        discount_factor = get_discount_factor(self.period_discount_rate)
+        up_probability = get_risk_neutral_probability(discount_factor, self.up_factor, self.down_factor)
+        up_weight, down_weight = up_probability / discount_factor, (1 - up_probability) / discount_factor
+
+        prices = Option.get_chain_payouts(options, self._stock_prices[self.period_count])
+
+        for level in reversed(range(self.period_count)):
+            prices = prices[:-1] * up_weight + prices[1:] * down_weight
+
+            if early_exercise:
+                np.maximum(prices, Option.get_chain_payouts(options, self._stock_prices[level]), out=prices)
+
+        return prices[0]
+
+
+@functools.lru_cache(maxsize=StockLattice.CACHE_SIZE)
+def _get_cached_stock_lattice(stock_price, stock_price_volatility, time_horizon, period_count, interest_rate):
+    return StockLattice(stock_price, stock_price_volatility, time_horizon, period_count, interest_rate)
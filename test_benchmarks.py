@@ -0,0 +1,75 @@
+import json
+import os
+import tempfile
+import tracemalloc
+import unittest
+
+from benchmarks import BenchmarkSuite, main
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+    def test_compare(self):
+        baseline = [
+            {"name": "black_scholes_batch", "size": 100, "wall_time": 1.0},
+            {"name": "european_lattice", "size": 100, "wall_time": 1.0},
+        ]
+        results = [
+            {"name": "black_scholes_batch", "size": 100, "wall_time": 1.1},
+            {"name": "european_lattice", "size": 100, "wall_time": 1.5},
+            {"name": "european_lattice", "size": 200, "wall_time": 5.0},
+        ]
+
+        regressions = BenchmarkSuite.compare(results, baseline, threshold=0.2)
+
+        self.assertEqual([("european_lattice", 100, 1.0)], [
+            (regression["name"], regression["size"], regression["baseline_wall_time"]) for regression in regressions
+        ])
+
+    def test_quick_run_writes_results(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output_path = os.path.join(directory, "results.json")
+
+            self.assertEqual(0, main(["--quick", "--repeat", "1", "--output", output_path]))
+            with open(output_path) as output_file:
+                results = json.load(output_file)
+
+            self.assertIn(("american_barrier_tree", 8), [(result["name"], result["size"]) for result in results])
+            self.assertIn(("greek_calculator_all_greeks", 10), [(result["name"], result["size"]) for result in results])
+            for result in results:
+                self.assertGreater(result["wall_time"], 0)
+                self.assertGreater(result["peak_memory_bytes"], 0)
+
+    def test_allocations_count_freed_memory(self):
+        def allocate_and_free():
+            for _ in range(100):
+                values = [object() for _ in range(100)]
+                del values
+
+        tracemalloc.start()
+        try:
+            allocated_blocks, allocated_bytes = BenchmarkSuite._count_allocations(allocate_and_free)
+        finally:
+            tracemalloc.stop()
+
+        self.assertGreaterEqual(allocated_blocks, 100 * 100)
+        self.assertGreater(allocated_bytes, 0)
+
+    def test_allocations_exclude_sampler(self):
+        def noop():
+            pass
+
+        def call_noop():
+            for _ in range(1000):
+                noop()
+
+        tracemalloc.start()
+        try:
+            allocated_blocks, _ = BenchmarkSuite._count_allocations(call_noop)
+        finally:
+            tracemalloc.stop()
+
+        self.assertLess(allocated_blocks, 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,6 @@
 import unittest
+from concurrent.futures import ProcessPoolExecutor
+
 from binomial_tree_american import BinomialTreeAmerican
 from binomial_tree_european import BinomialTreeEuropean
 from option import Option, BarrierOption
@@ -87,6 +89,123 @@ class TestBinomialTree(unittest.TestCase):
         self.assertAlmostEqual(-2 / 9, portfolio.bond_weight, delta=1e-9)
         self.assertAlmostEqual(4 / 9 * 100, portfolio.get_price(), delta=1e-9)
 
+    def test_option_pricing_no_discounting_european_recombining(self):
+        tree = BinomialTreeEuropean(2, 0.5, 0, 2, 1, Option.long_call_option(0.5), lambda r: 1 + r, recombining=True)
+        portfolio_tree = tree.calculate_replicating_portfolios()
+
+        portfolio_up = portfolio_tree.get_portfolio(1, 0)
+        self.assertAlmostEqual(1, portfolio_up.share_weight, delta=1e-9)
+        self.assertAlmostEqual(-0.25, portfolio_up.bond_weight, delta=1e-9)
+        self.assertAlmostEqual(1.5, portfolio_up.get_price(), delta=1e-9)
+
+        portfolio_down = portfolio_tree.get_portfolio(1, 1)
+        self.assertAlmostEqual(2 / 3, portfolio_down.share_weight, delta=1e-9)
+        self.assertAlmostEqual(-1 / 3, portfolio_down.bond_weight, delta=1e-9)
+        self.assertAlmostEqual(1 / 6, portfolio_down.get_price(), delta=1e-9)
+
+        portfolio_root = portfolio_tree.get_portfolio(0, 0)
+        self.assertAlmostEqual(8 / 9, portfolio_root.share_weight, delta=1e-9)
+        self.assertAlmostEqual(-5 / 18, portfolio_root.bond_weight, delta=1e-9)
+        self.assertAlmostEqual(11 / 18, portfolio_root.get_price(), delta=1e-9)
+
+    def test_option_pricing_with_discounting_american_recombining(self):
+        tree = BinomialTreeAmerican(BinomialTreeEuropean(
+            1.1, 0.9, 0.05, 2, 100, Option.long_put_option(100), lambda r: 1 + r, recombining=True
+        ))
+        portfolio_tree = tree.calculate_replicating_portfolios()
+
+        self.assertAlmostEqual(0.238, portfolio_tree.get_portfolio(1, 0).get_price(), delta=1e-4)
+        self.assertAlmostEqual(10, portfolio_tree.get_portfolio(1, 1).get_price(), delta=1e-9)
+        self.assertAlmostEqual(2.551, portfolio_tree.get_root_portfolio().get_price(), delta=1e-3)
+
+    def test_option_pricing_no_discounting_barrier_recombining(self):
+        tree = BinomialTreeEuropean(
+            1.1, 0.9, 0, 2, 100, BarrierOption(Option.long_put_option(100), 101), lambda r: 1 + r, recombining=True
+        )
+        portfolio_tree = tree.calculate_replicating_portfolios()
+
+        portfolio_up = portfolio_tree.get_portfolio(1, 0)
+        self.assertAlmostEqual(0.5, portfolio_up.get_price(), delta=1e-9)
+
+        portfolio_down = portfolio_tree.get_portfolio(1, 1)
+        self.assertAlmostEqual(0, portfolio_down.get_price(), delta=1e-9)
+
+        portfolio_root = portfolio_tree.get_portfolio(0, 0)
+        self.assertAlmostEqual(0.25, portfolio_root.get_price(), delta=1e-9)
+
+        with self.assertRaises(RuntimeError):
+            portfolio_tree.get_portfolio(1, 0, knocked_in=False)
+
+    def test_barrier_recombining_knock_states(self):
+        tree = BinomialTreeEuropean(
+            1.1, 0.9, 0, 3, 100, BarrierOption(Option.long_put_option(100), 105), lambda r: 1 + r, recombining=True
+        )
+        portfolio_tree = tree.calculate_replicating_portfolios()
+
+        # the middle node at level 2 is reached both through the knocked in up-down path and the down-up path
+        self.assertAlmostEqual(0, portfolio_tree.get_portfolio(2, 1).get_price(), delta=1e-9)
+        self.assertAlmostEqual(
+            0.5 * (100 - 99 * 0.9),
+            portfolio_tree.get_portfolio(2, 1, knocked_in=True).get_price(),
+            delta=1e-9
+        )
+
+    def test_american_recombining_barrier_portfolios_are_not_supported(self):
+        tree = BinomialTreeAmerican(BinomialTreeEuropean(
+            1.1, 0.9, 0, 2, 100, BarrierOption(Option.long_put_option(100), 101), recombining=True
+        ))
+
+        with self.assertRaises(RuntimeError):
+            tree.calculate_replicating_portfolios()
+
+    def test_american_exercise_region(self):
+        for recombining in [False, True]:
+            with self.subTest(recombining=recombining):
+                tree = BinomialTreeAmerican(BinomialTreeEuropean(
+                    1.1, 0.9, 0.05, 2, 100, Option.long_put_option(100), lambda r: 1 + r, recombining=recombining
+                ))
+                price, exercise_flags = tree.calculate_exercise_region()
+
+                self.assertAlmostEqual(2.551, price, delta=1e-3)
+                self.assertEqual([False], list(exercise_flags[0]))
+                self.assertEqual([False, True], list(exercise_flags[1]))
+
+    def test_parallel_price(self):
+        options = [Option.long_put_option(100), BarrierOption(Option.long_put_option(100), 108)]
+
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            for option in options:
+                tree = BinomialTreeEuropean(1.03, 0.97, 0.002, 10, 100, option)
+                for split_level in [1, 3, 9]:
+                    with self.subTest(option=option, split_level=split_level):
+                        self.assertAlmostEqual(
+                            tree.calculate_price(), tree.calculate_parallel_price(split_level, executor), delta=1e-9
+                        )
+
+    def test_subtree_max_encountered(self):
+        option = BarrierOption(Option.long_put_option(100), 101)
+
+        self.assertAlmostEqual(
+            0.25, BinomialTreeEuropean(1.1, 0.9, 0, 2, 100, option, lambda r: 1 + r).calculate_price(), delta=1e-9
+        )
+        self.assertAlmostEqual(
+            BinomialTreeEuropean(1.1, 0.9, 0, 2, 100, option.option, lambda r: 1 + r).calculate_price(),
+            BinomialTreeEuropean(1.1, 0.9, 0, 2, 100, option, lambda r: 1 + r, max_encountered=105).calculate_price(),
+            delta=1e-9
+        )
+
+    def test_parallel_price_split_level(self):
+        tree = BinomialTreeEuropean(1.1, 0.9, 0, 3, 100, Option.long_put_option(100), lambda r: 1 + r)
+
+        for split_level in [0, 3]:
+            with self.assertRaises(RuntimeError):
+                tree.calculate_parallel_price(split_level)
+
+        self.assertAlmostEqual(tree.calculate_price(), tree.calculate_parallel_price(2), delta=1e-9)
+
+        with self.assertRaises(RuntimeError):
+            BinomialTreeEuropean(1.1, 0.9, 0, 3, 100, Option.long_put_option(100), recombining=True).calculate_parallel_price(1)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,11 +1,15 @@
+import subprocess
+import sys
 import unittest
 
 from binomial_tree_european import BinomialTreeEuropean
 from option import Option
 from crr import CRRBinomialTreeParameters
 import black_scholes
+from greek_calculator import GreekCalculator
 from utils import get_discount_factor
 import pandas as pd
+import numpy as np
 
 
 class TestBinomialTree(unittest.TestCase):
@@ -49,5 +53,122 @@ class TestBinomialTree(unittest.TestCase):
         }))
 
 
+class TestBlackScholesBatch(unittest.TestCase):
+    def setUp(self):
+        self.option = black_scholes.Option()
+        self.parameters = black_scholes.Option.OptionParameters(
+            stock_price=np.array([230, 230, 100, 80, 120]),
+            strike_price=np.array([235, 231, 100, 100, 100]),
+            risk_free_rate=np.array([5e-3, 5e-3, 0.05, 0.01, 0.03]),
+            volatility=np.array([0.3, 0.3, 0.2, 0.5, 0.1]),
+            maturity_time=np.array([1 / 12, 2 / 12, 1, 0.5, 2]),
+        )
+        self.is_call = np.array([True, False, True, False, False])
+
+    def get_scalar_parameters(self, index):
+        return black_scholes.Option.OptionParameters(
+            self.parameters.stock_price[index],
+            self.parameters.strike_price[index],
+            self.parameters.risk_free_rate[index],
+            self.parameters.volatility[index],
+            self.parameters.maturity_time[index],
+        )
+
+    def test_matches_scalar_prices(self):
+        prices = self.option.get_prices(self.parameters, self.is_call)
+
+        for index, is_call in enumerate(self.is_call):
+            price_callback = self.option.get_call_price if is_call else self.option.get_put_price
+            self.assertAlmostEqual(price_callback(self.get_scalar_parameters(index)), prices[index], delta=1e-9)
+
+    def test_put_call_parity(self):
+        call_prices = self.option.get_prices(self.parameters, True)
+        put_prices = self.option.get_prices(self.parameters, False)
+
+        strike_price_present_value = self.parameters.strike_price * np.exp(
+            -self.parameters.risk_free_rate * self.parameters.maturity_time
+        )
+        np.testing.assert_allclose(call_prices + strike_price_present_value, put_prices + self.parameters.stock_price)
+
+    def test_output_buffer(self):
+        out = np.empty(5)
+        prices = self.option.get_prices(self.parameters, self.is_call, out=out)
+
+        self.assertIs(out, prices)
+        np.testing.assert_allclose(self.option.get_prices(self.parameters, self.is_call), out)
+
+
+class TestBlackScholesScalar(unittest.TestCase):
+    parameters = black_scholes.Option.OptionParameters(230, 235, 5e-3, 0.3, 1 / 12)
+
+    def test_matches_batch_prices(self):
+        option = black_scholes.Option()
+        array_parameters = black_scholes.Option.OptionParameters(*(
+            np.array(value) for value in [230, 235, 5e-3, 0.3, 1 / 12]
+        ))
+
+        self.assertIsInstance(option.get_call_price(self.parameters), float)
+        self.assertAlmostEqual(option.get_prices(array_parameters, True), option.get_call_price(self.parameters), delta=1e-12)
+        self.assertAlmostEqual(option.get_prices(array_parameters, False), option.get_put_price(self.parameters), delta=1e-12)
+
+    def test_expired_option(self):
+        with np.errstate(divide="ignore"):
+            price = black_scholes.Option().get_call_price(black_scholes.Option.OptionParameters(240, 235, 5e-3, 0.3, 0))
+
+        self.assertAlmostEqual(5, price, delta=1e-12)
+
+    def test_import_does_not_load_scipy(self):
+        output = subprocess.run(
+            [sys.executable, "-c", "import sys, black_scholes; print('scipy' in sys.modules)"],
+            capture_output=True, text=True, check=True,
+        ).stdout
+
+        self.assertEqual("False", output.strip())
+
+
+class TestBlackScholesGreeks(unittest.TestCase):
+    greek_names = ["delta", "gamma", "theta", "vega", "rho"]
+
+    def test_matches_finite_differences(self):
+        option = black_scholes.Option()
+
+        for is_call in [True, False]:
+            for parameters in [
+                black_scholes.Option.OptionParameters(230, 235, 5e-3, 0.3, 1 / 12),
+                black_scholes.Option.OptionParameters(100, 80, 0.05, 0.2, 2),
+                black_scholes.Option.OptionParameters(100, 120, 0.01, 0.5, 0.5),
+            ]:
+                with self.subTest(is_call=is_call, strike_price=parameters.strike_price):
+                    calculator = GreekCalculator(option.get_call_price if is_call else option.get_put_price)
+                    greeks = option.get_call_greeks(parameters) if is_call else option.get_put_greeks(parameters)
+
+                    for name in self.greek_names:
+                        self.assertAlmostEqual(
+                            getattr(calculator, name)(parameters), greeks[name], delta=1e-4 * max(1, abs(greeks[name]))
+                        )
+
+    def test_batch_matches_scalar(self):
+        option = black_scholes.Option()
+        parameters = black_scholes.Option.OptionParameters(
+            stock_price=230,
+            strike_price=np.array([235, 231, 234]),
+            risk_free_rate=5e-3,
+            volatility=0.3,
+            maturity_time=np.array([1, 2, 2]) / 12,
+        )
+        is_call = np.array([True, False, True])
+
+        greeks = option.get_greeks(parameters, is_call)
+
+        for index in range(3):
+            scalar_parameters = black_scholes.Option.OptionParameters(
+                230, parameters.strike_price[index], 5e-3, 0.3, parameters.maturity_time[index]
+            )
+            scalar_greeks = option.get_greeks(scalar_parameters, is_call[index])
+
+            for name in self.greek_names:
+                self.assertAlmostEqual(scalar_greeks[name], greeks[name][index], delta=1e-12)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -4,6 +4,7 @@ import black_scholes
 import pandas as pd
 import numpy as np
 from greek_calculator import GreekCalculator
+from hedge_solver import HedgeSolver
 pd.set_option('display.max_columns', None)
 
 
@@ -87,37 +88,14 @@ class TestBinomialTree(unittest.TestCase):
             self.original_volatility + self.delta_volatility
         )
 
-        parameter_matrix = np.array([
-            neutralization_portfolio.delta,
-            neutralization_portfolio.gamma
-        ])
-
-        non_neutral_parameters = np.array([
-            original_delta,
-            original_gamma
-        ])
-
-        neutralization_weights = np.matmul(
-            np.linalg.inv(parameter_matrix),
-            -non_neutral_parameters
-        )
-
-        # now we recalculate neutralization portfolio using given weights
-
-        neutralization_portfolio = self.fill_book(
-            pd.DataFrame({
-                "amount": neutralization_weights,
-                "type": ["call", "put"],
-                "strike_price": [235, self.original_stock_price + self.delta_stock_price],
-                "maturity": np.array([4, 3]) / 12
-            }),
-            self.original_stock_price + self.delta_stock_price,
-            self.original_volatility + self.delta_volatility
-        )
+        # the greeks computed above are reused, the hedge instruments are not repriced
+        hedge_result = HedgeSolver(["delta", "gamma"]).hedge_book(non_neutral_portfolio, neutralization_portfolio)
+        neutralization_weights = hedge_result.weights
+        neutralization_portfolio = hedge_result.hedge_book
 
         non_neutral_price = sum(non_neutral_portfolio.total_prices)
 
-        hedging_cost = neutralization_portfolio.total_prices.sum()
+        hedging_cost = hedge_result.hedging_cost
 
         neutralized_portfolio = pd.concat([non_neutral_portfolio, neutralization_portfolio]).reset_index().drop(columns=["index"])
 
@@ -132,10 +110,11 @@ class TestBinomialTree(unittest.TestCase):
             "rho": get_total_parameter("rho")
         })
 
-        print("parameter matrix")
-        print(parameter_matrix)
+        self.assertAlmostEqual(0, neutralized_portfolio_parameters.delta[0], delta=1e-6)
+        self.assertAlmostEqual(0, neutralized_portfolio_parameters.gamma[0], delta=1e-6)
+
         print("non neutral parameters")
-        print(non_neutral_parameters)
+        print([original_delta, original_gamma])
         print("neutralization weights")
         print(neutralization_weights)
         print("hedging cost")
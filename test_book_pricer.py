@@ -0,0 +1,77 @@
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import black_scholes
+from book_pricer import BookPricer
+from greek_calculator import GreekCalculator
+
+
+class TestBookPricer(unittest.TestCase):
+    risk_free_rate = 5e-3
+    stock_price = 230
+    volatility = 0.3
+
+    book = pd.DataFrame({
+        "amount": [34_000, 37_000, 20_000, 1_000, 2_000, 3_000],
+        "type": ["call", "put", "call", "put", "call", "put"],
+        "strike_price": [235, 231, 234, 240, 220, 225],
+        "maturity": np.array([1, 2, 2, 3, 4, 5]) / 12,
+        "engine": [
+            BookPricer.ENGINE_BLACK_SCHOLES, BookPricer.ENGINE_AMERICAN_TREE, BookPricer.ENGINE_EUROPEAN_TREE,
+            BookPricer.ENGINE_BLACK_SCHOLES, BookPricer.ENGINE_AMERICAN_TREE, BookPricer.ENGINE_EUROPEAN_TREE,
+        ]
+    })
+
+    def test_black_scholes_engine_matches_greek_calculator(self):
+        book = self.book.drop(columns=["engine"])
+        priced_book = BookPricer(self.risk_free_rate).price_book(book, self.stock_price, self.volatility)
+        bs_option = black_scholes.Option()
+
+        for row in priced_book.itertuples():
+            with self.subTest(row=row.Index):
+                price_callback = bs_option.get_call_price if row.type == "call" else bs_option.get_put_price
+                greeks = GreekCalculator(price_callback).all_greeks(black_scholes.Option.OptionParameters(
+                    self.stock_price, row.strike_price, self.risk_free_rate, self.volatility, row.maturity
+                ))
+
+                self.assertAlmostEqual(greeks["price"], row.prices, delta=1e-9)
+                self.assertAlmostEqual(row.amount * greeks["price"], row.total_prices, delta=1e-6)
+                for name in ["delta", "gamma", "theta", "vega", "rho"]:
+                    self.assertAlmostEqual(greeks[name], getattr(row, name), delta=1e-3 * max(1, abs(greeks[name])))
+
+    def test_tree_engines_are_close_to_black_scholes(self):
+        priced_book = BookPricer(self.risk_free_rate).price_book(self.book, self.stock_price, self.volatility)
+        bs_book = BookPricer(self.risk_free_rate).price_book(self.book.drop(columns=["engine"]), self.stock_price, self.volatility)
+
+        european_rows = priced_book.engine == BookPricer.ENGINE_EUROPEAN_TREE
+        np.testing.assert_allclose(bs_book.prices[european_rows], priced_book.prices[european_rows], rtol=1e-2)
+        np.testing.assert_allclose(bs_book.delta[european_rows], priced_book.delta[european_rows], atol=1e-3)
+        np.testing.assert_allclose(bs_book.gamma[european_rows], priced_book.gamma[european_rows], atol=1e-4)
+
+        # the american put is worth at least the european one, the american call on a non dividend stock the same
+        american_rows = priced_book.engine == BookPricer.ENGINE_AMERICAN_TREE
+        self.assertTrue((priced_book.prices[american_rows] >= bs_book.prices[american_rows] * (1 - 1e-2)).all())
+
+    def test_process_pool_matches_serial(self):
+        serial_book = BookPricer(self.risk_free_rate).price_book(self.book, self.stock_price, self.volatility)
+
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            parallel_book = BookPricer(
+                self.risk_free_rate, executor=executor, black_scholes_shard_size=1, tree_shard_size=1
+            ).price_book(self.book, self.stock_price, self.volatility)
+
+        pd.testing.assert_frame_equal(serial_book, parallel_book)
+
+    def test_unexpected_engine(self):
+        book = self.book.copy()
+        book["engine"] = "unknown"
+
+        with self.assertRaises(RuntimeError):
+            BookPricer(self.risk_free_rate).price_book(book, self.stock_price, self.volatility)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+
+import numpy as np
+
+import black_scholes
+from binomial_tree_american import BinomialTreeAmerican
+from binomial_tree_european import BinomialTreeEuropean
+from crr import CRRBinomialTreeParameters
+from extrapolated_pricer import ExtrapolatedBinomialPricer
+from option import Option, BarrierOption
+from utils import get_discount_rate
+
+
+class TestExtrapolatedBinomialPricer(unittest.TestCase):
+    stock_price = 100
+    volatility = 0.25
+    time_horizon = 1
+    interest_rate = 0.05
+
+    def get_pricer(self, option, period_count, early_exercise=False):
+        return ExtrapolatedBinomialPricer(
+            self.stock_price, self.volatility, self.time_horizon, self.interest_rate, option, period_count,
+            early_exercise=early_exercise,
+        )
+
+    def get_crr_american_price(self, option, period_count):
+        crr_parameters = CRRBinomialTreeParameters(self.volatility, self.time_horizon, period_count)
+        tree = BinomialTreeEuropean(
+            up_factor=crr_parameters.get_up_factor(),
+            down_factor=crr_parameters.get_down_factor(),
+            period_discount_rate=get_discount_rate(self.interest_rate, self.time_horizon / period_count),
+            period_count=period_count,
+            stock_price=self.stock_price,
+            option=option,
+            recombining=True,
+            price_only=True,
+        )
+        return BinomialTreeAmerican(tree).calculate_price()
+
+    def test_european_matches_black_scholes(self):
+        for strike_price in [90, 100, 105, 110]:
+            for is_call in [True, False]:
+                with self.subTest(strike_price=strike_price, is_call=is_call):
+                    option = Option.long_call_option(strike_price) if is_call else Option.long_put_option(strike_price)
+                    expected_price = black_scholes.Option().get_prices(black_scholes.Option.OptionParameters(
+                        self.stock_price, strike_price, np.log(1 + self.interest_rate), self.volatility, self.time_horizon
+                    ), is_call)
+
+                    self.assertAlmostEqual(expected_price, self.get_pricer(option, 300).calculate_price(), delta=1e-4)
+
+    def test_short_option(self):
+        long_price = self.get_pricer(Option.long_put_option(105), 200).calculate_price()
+        short_price = self.get_pricer(Option.short_put_option(105), 200).calculate_price()
+
+        self.assertAlmostEqual(-long_price, short_price, delta=1e-12)
+
+    def test_american_put_beats_crr(self):
+        option = Option.long_put_option(105)
+        # averaging neighbouring step counts removes most of the odd / even oscillation of the reference
+        reference_price = (self.get_crr_american_price(option, 4000) + self.get_crr_american_price(option, 4001)) / 2
+
+        extrapolated_error = abs(self.get_pricer(option, 300, early_exercise=True).calculate_price() - reference_price)
+        crr_error = abs(self.get_crr_american_price(option, 300) - reference_price)
+
+        self.assertLess(extrapolated_error, 1e-3)
+        self.assertLess(extrapolated_error, crr_error)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(RuntimeError):
+            self.get_pricer(Option.long_put_option(105), 201)
+        with self.assertRaises(RuntimeError):
+            self.get_pricer(BarrierOption(Option.long_put_option(105), 110), 200)
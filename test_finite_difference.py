@@ -0,0 +1,91 @@
+import unittest
+
+import numpy as np
+
+import black_scholes
+from binomial_tree_american import BinomialTreeAmerican
+from binomial_tree_european import BinomialTreeEuropean
+from finite_difference import CrankNicolsonEngine
+from leisen_reimer import LeisenReimerBinomialTreeParameters
+from option import Option, BarrierOption
+from utils import get_discount_rate
+
+
+class TestCrankNicolsonEngine(unittest.TestCase):
+    risk_free_rate = 0.05
+
+    def get_engine(self, option, stock_price=100, **kwargs):
+        return CrankNicolsonEngine(stock_price, self.risk_free_rate, 0.25, 1, option, **kwargs)
+
+    def test_european_matches_black_scholes(self):
+        bs_option = black_scholes.Option()
+
+        for strike_price in [90, 105, 120]:
+            for is_call in [True, False]:
+                with self.subTest(strike_price=strike_price, is_call=is_call):
+                    parameters = black_scholes.Option.OptionParameters(100, strike_price, self.risk_free_rate, 0.25, 1)
+                    option = Option.long_call_option(strike_price) if is_call else Option.long_put_option(strike_price)
+
+                    result = self.get_engine(option).calculate_price()
+                    greeks = bs_option.get_greeks(parameters, is_call)
+
+                    self.assertAlmostEqual(bs_option.get_prices(parameters, is_call), result.price, delta=1e-3)
+                    self.assertAlmostEqual(greeks["delta"], result.delta, delta=1e-3)
+                    self.assertAlmostEqual(greeks["gamma"], result.gamma, delta=1e-4)
+                    self.assertAlmostEqual(greeks["theta"], result.theta, delta=1e-2)
+
+    def test_american_put_matches_tree(self):
+        # the tree rate convention is annual compounding, so the continuous rate is converted
+        interest_rate = np.exp(self.risk_free_rate) - 1
+        period_count = 2001
+        lattice_parameters = LeisenReimerBinomialTreeParameters(100, 105, 0.25, 1, period_count, interest_rate)
+        tree = BinomialTreeEuropean(
+            up_factor=lattice_parameters.get_up_factor(),
+            down_factor=lattice_parameters.get_down_factor(),
+            period_discount_rate=get_discount_rate(interest_rate, 1 / period_count),
+            period_count=period_count,
+            stock_price=100,
+            option=Option.long_put_option(105),
+            recombining=True,
+            price_only=True,
+        )
+
+        result = self.get_engine(Option.long_put_option(105), early_exercise=True).calculate_price()
+
+        self.assertAlmostEqual(BinomialTreeAmerican(tree).calculate_price(), result.price, delta=3e-3)
+        self.assertGreater(result.price, self.get_engine(Option.long_put_option(105)).calculate_price().price)
+
+    def test_knocked_in_barrier_is_vanilla(self):
+        vanilla_result = self.get_engine(Option.long_put_option(105), stock_price=115).calculate_price()
+        barrier_result = self.get_engine(BarrierOption(Option.long_put_option(105), 110), stock_price=115).calculate_price()
+
+        self.assertEqual(vanilla_result.price, barrier_result.price)
+
+    def test_barrier_limits(self):
+        vanilla_price = self.get_engine(Option.long_put_option(105)).calculate_price().price
+
+        close_barrier_price = self.get_engine(BarrierOption(Option.long_put_option(105), 100.05)).calculate_price().price
+        far_barrier_price = self.get_engine(BarrierOption(Option.long_put_option(105), 400)).calculate_price().price
+
+        self.assertLess(close_barrier_price, vanilla_price)
+        self.assertAlmostEqual(vanilla_price, close_barrier_price, delta=0.1)
+        self.assertAlmostEqual(0, far_barrier_price, delta=1e-6)
+
+    def test_barrier_put(self):
+        # continuously monitored up and in put, reference from a brownian bridge corrected monte carlo run
+        # with 4 million paths (standard error 4e-3)
+        result = self.get_engine(BarrierOption(Option.long_put_option(105), 110)).calculate_price()
+
+        self.assertAlmostEqual(3.6865, result.price, delta=1.2e-2)
+
+    def test_american_barrier(self):
+        option = BarrierOption(Option.long_put_option(105), 110)
+
+        european_price = self.get_engine(option).calculate_price().price
+        american_price = self.get_engine(option, early_exercise=True).calculate_price().price
+
+        self.assertGreater(american_price, european_price)
+
+
+if __name__ == '__main__':
+    unittest.main()
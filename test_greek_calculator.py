@@ -0,0 +1,56 @@
+import unittest
+import numpy as np
+import black_scholes
+from greek_calculator import GreekCalculator
+
+
+class TestGreekCalculator(unittest.TestCase):
+    parameters = black_scholes.Option.OptionParameters(230, 235, 5e-3, 0.3, 1 / 12)
+
+    def test_all_greeks_matches_single_greeks(self):
+        option = black_scholes.Option()
+        calculator = GreekCalculator(option.get_put_price)
+
+        greeks = calculator.all_greeks(self.parameters)
+
+        self.assertAlmostEqual(option.get_put_price(self.parameters), greeks["price"], delta=1e-12)
+        for name in ["delta", "gamma", "theta", "vega", "rho"]:
+            self.assertAlmostEqual(getattr(calculator, name)(self.parameters), greeks[name], delta=1e-9)
+
+    def test_all_greeks_prices_each_point_once(self):
+        option = black_scholes.Option()
+        priced_parameters = []
+
+        def price_callback(parameters):
+            priced_parameters.append(parameters)
+            return option.get_call_price(parameters)
+
+        GreekCalculator(price_callback).all_greeks(self.parameters)
+
+        self.assertEqual(9, len(priced_parameters))
+
+    def test_batch_price_callback(self):
+        option = black_scholes.Option()
+        batch_sizes = []
+
+        def batch_price_callback(parameters_list):
+            batch_sizes.append(len(parameters_list))
+            return option.get_prices(black_scholes.Option.OptionParameters(
+                np.array([parameters.stock_price for parameters in parameters_list]),
+                np.array([parameters.strike_price for parameters in parameters_list]),
+                np.array([parameters.risk_free_rate for parameters in parameters_list]),
+                np.array([parameters.volatility for parameters in parameters_list]),
+                np.array([parameters.maturity_time for parameters in parameters_list]),
+            ), True)
+
+        greeks = GreekCalculator(option.get_call_price, batch_price_callback).all_greeks(self.parameters)
+        expected_greeks = GreekCalculator(option.get_call_price).all_greeks(self.parameters)
+
+        self.assertEqual([9], batch_sizes)
+        # scalar and batch prices agree to rounding only, which the gamma stencil amplifies by 1 / step ** 2
+        for name, value in expected_greeks.items():
+            self.assertAlmostEqual(value, greeks[name], delta=1e-7)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from book_pricer import BookPricer
+from hedge_solver import HedgeSolver
+
+
+class TestHedgeSolver(unittest.TestCase):
+    random_state = np.random.RandomState(0)
+    # (instrument, greek) greeks of four hedge instruments
+    instrument_greeks = random_state.uniform(-1, 1, (4, 3))
+    book_greeks = random_state.uniform(-100, 100, 3)
+
+    def test_square_system(self):
+        weights = HedgeSolver(["delta", "gamma"]).solve(self.book_greeks[:2], self.instrument_greeks[:2, :2])
+
+        np.testing.assert_allclose(np.linalg.solve(self.instrument_greeks[:2, :2].T, -self.book_greeks[:2]), weights)
+
+    def test_minimum_norm(self):
+        weights = HedgeSolver(["delta", "gamma", "vega"]).solve(self.book_greeks, self.instrument_greeks)
+
+        np.testing.assert_allclose(-self.book_greeks, weights @ self.instrument_greeks, atol=1e-9)
+        np.testing.assert_allclose(np.linalg.lstsq(self.instrument_greeks.T, -self.book_greeks, rcond=None)[0], weights)
+
+    def test_minimum_cost(self):
+        costs = np.array([1, 1, 1, 100])
+        solver = HedgeSolver(["delta", "gamma", "vega"], method=HedgeSolver.METHOD_MINIMUM_COST)
+
+        weights = solver.solve(self.book_greeks, self.instrument_greeks, costs)
+        minimum_norm_weights = HedgeSolver(["delta", "gamma", "vega"]).solve(self.book_greeks, self.instrument_greeks)
+
+        np.testing.assert_allclose(-self.book_greeks, weights @ self.instrument_greeks, atol=1e-9)
+        self.assertLess(costs @ weights ** 2, costs @ minimum_norm_weights ** 2)
+        self.assertLess(abs(weights[3]), abs(minimum_norm_weights[3]))
+
+        with self.assertRaises(RuntimeError):
+            solver.solve(self.book_greeks, self.instrument_greeks)
+
+    def test_non_positive_costs(self):
+        solver = HedgeSolver(["delta", "gamma", "vega"], method=HedgeSolver.METHOD_MINIMUM_COST)
+
+        for costs in [[1, 1, 0, 1], [1, -1, 1, 1], [1, np.nan, 1, 1]]:
+            with self.subTest(costs=costs), self.assertRaises(RuntimeError):
+                solver.solve(self.book_greeks, self.instrument_greeks, np.array(costs, dtype=float))
+
+    def test_zero_priced_instrument_needs_explicit_costs(self):
+        priced_book = pd.DataFrame({"amount": [1.0], "prices": [2.0], "delta": [0.5], "gamma": [0.1]})
+        priced_instruments = pd.DataFrame({"amount": [1.0, 1.0], "prices": [0.0, 1.0], "delta": [0.3, 0.6], "gamma": [0.2, 0.05]})
+        solver = HedgeSolver(method=HedgeSolver.METHOD_MINIMUM_COST)
+
+        with self.assertRaises(RuntimeError):
+            solver.hedge_book(priced_book, priced_instruments)
+
+        result = solver.hedge_book(priced_book, priced_instruments, costs=[1, 1])
+        self.assertTrue(np.isfinite(result.weights).all())
+
+    def test_overdetermined_system(self):
+        weights = HedgeSolver(["delta", "gamma", "vega"]).solve(self.book_greeks, self.instrument_greeks[:2])
+
+        np.testing.assert_allclose(np.linalg.lstsq(self.instrument_greeks[:2].T, -self.book_greeks, rcond=None)[0], weights)
+
+    def test_stacked_books(self):
+        book_greeks = self.random_state.uniform(-100, 100, (5, 7, 3))
+        instrument_greeks = self.random_state.uniform(-1, 1, (7, 4, 3))
+        solver = HedgeSolver(["delta", "gamma", "vega"])
+
+        weights = solver.solve(book_greeks, instrument_greeks)
+
+        self.assertEqual((5, 7, 4), weights.shape)
+        for book_index in range(5):
+            for scenario_index in range(7):
+                np.testing.assert_allclose(
+                    solver.solve(book_greeks[book_index, scenario_index], instrument_greeks[scenario_index]),
+                    weights[book_index, scenario_index],
+                )
+
+    def test_hedge_book(self):
+        book_pricer = BookPricer(5e-3)
+        priced_book = book_pricer.price_book(pd.DataFrame({
+            "amount": [34_000, 37_000, 20_000],
+            "type": ["call", "put", "call"],
+            "strike_price": [235, 231, 234],
+            "maturity": np.array([1, 2, 2]) / 12,
+        }), 236, 0.31)
+        priced_instruments = book_pricer.price_book(pd.DataFrame({
+            "amount": [1, 1, 1],
+            "type": ["call", "put", "call"],
+            "strike_price": [235, 236, 250],
+            "maturity": np.array([4, 3, 6]) / 12,
+        }), 236, 0.31)
+
+        for method in [HedgeSolver.METHOD_LEAST_SQUARES, HedgeSolver.METHOD_MINIMUM_COST]:
+            with self.subTest(method):
+                result = HedgeSolver(["delta", "gamma"], method=method).hedge_book(priced_book, priced_instruments)
+
+                for value in result.residual_greeks.values():
+                    self.assertAlmostEqual(0, value, delta=1e-6)
+                np.testing.assert_allclose(result.weights, result.hedge_book.amount)
+                self.assertAlmostEqual(
+                    (result.weights * priced_instruments.prices).sum(), result.hedging_cost, delta=1e-6
+                )
+
+    def test_unexpected_method(self):
+        with self.assertRaises(RuntimeError):
+            HedgeSolver(method="unknown")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+import numpy as np
+import black_scholes
+from implied_volatility import ImpliedVolatilitySolver
+
+
+class TestImpliedVolatilitySolver(unittest.TestCase):
+    def test_recovers_volatility(self):
+        random_state = np.random.RandomState(0)
+        quote_count = 10_000
+
+        parameters = black_scholes.Option.OptionParameters(
+            stock_price=100,
+            strike_price=random_state.uniform(60, 140, quote_count),
+            risk_free_rate=0.02,
+            volatility=random_state.uniform(0.05, 1.5, quote_count),
+            maturity_time=random_state.uniform(0.05, 3, quote_count),
+        )
+        is_call = random_state.uniform(size=quote_count) < 0.5
+        prices = black_scholes.Option().get_prices(parameters, is_call)
+
+        result = ImpliedVolatilitySolver().solve(
+            prices, parameters.stock_price, parameters.strike_price, parameters.risk_free_rate,
+            parameters.maturity_time, is_call
+        )
+
+        is_converged = result.status == ImpliedVolatilitySolver.STATUS_CONVERGED
+        self.assertGreater(is_converged.mean(), 0.99)
+
+        # quotes with negligible vega pin down the price but hardly the volatility
+        is_identifiable = is_converged & (black_scholes.Option().get_greeks(parameters, is_call)["vega"] > 1e-2)
+        np.testing.assert_allclose(parameters.volatility[is_identifiable], result.volatility[is_identifiable], atol=1e-6)
+
+        parameters.volatility = result.volatility
+        np.testing.assert_allclose(prices[is_converged], black_scholes.Option().get_prices(parameters, is_call)[is_converged], atol=1e-9)
+        self.assertLessEqual(result.iteration_count.max(), 100)
+
+    def test_max_iterations_reports_priced_volatility(self):
+        strike_prices = np.array([80, 100, 125])
+        prices = black_scholes.Option().get_call_price(black_scholes.Option.OptionParameters(100, strike_prices, 0.02, 0.4, 1))
+
+        for max_iteration_count in [1, 2, 3]:
+            with self.subTest(max_iteration_count=max_iteration_count):
+                solver = ImpliedVolatilitySolver(tolerance=1e-300, max_iteration_count=max_iteration_count)
+                priced_volatilities = []
+                get_prices = solver.option.get_prices
+
+                def record_volatility(parameters, is_call):
+                    priced_volatilities.append(np.array(parameters.volatility))
+                    return get_prices(parameters, is_call)
+
+                solver.option.get_prices = record_volatility
+                result = solver.solve(prices, 100, strike_prices, 0.02, 1, True)
+
+                np.testing.assert_array_equal(ImpliedVolatilitySolver.STATUS_MAX_ITERATIONS, result.status)
+                np.testing.assert_array_equal(priced_volatilities[-1], result.volatility)
+
+    def test_scalar_quote(self):
+        parameters = black_scholes.Option.OptionParameters(230, 235, 5e-3, 0.3, 1 / 12)
+        price = black_scholes.Option().get_put_price(parameters)
+
+        result = ImpliedVolatilitySolver().solve(price, 230, 235, 5e-3, 1 / 12, False)
+
+        self.assertEqual(ImpliedVolatilitySolver.STATUS_CONVERGED, result.status)
+        self.assertAlmostEqual(0.3, result.volatility, delta=1e-9)
+
+    def test_price_out_of_bounds(self):
+        result = ImpliedVolatilitySolver().solve(
+            np.array([0.5, 120, 10]), 100, np.array([50, 100, 100]), 0, 1, np.array([True, True, True])
+        )
+
+        self.assertEqual(
+            [ImpliedVolatilitySolver.STATUS_PRICE_OUT_OF_BOUNDS, ImpliedVolatilitySolver.STATUS_PRICE_OUT_OF_BOUNDS,
+             ImpliedVolatilitySolver.STATUS_CONVERGED],
+            list(result.status)
+        )
+        self.assertTrue(np.isnan(result.volatility[:2]).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+
+import black_scholes
+from binomial_tree_american import BinomialTreeAmerican
+from binomial_tree_european import BinomialTreeEuropean
+from crr import CRRBinomialTreeParameters
+from greek_calculator import GreekCalculator
+from instrumentation import Instrumentation
+from option import Option, BarrierOption
+from utils import get_discount_rate
+
+
+class TestInstrumentation(unittest.TestCase):
+    @staticmethod
+    def get_tree(period_count, option, **kwargs):
+        crr_parameters = CRRBinomialTreeParameters(stock_price_volatility=0.2, time_horizon=1, period_count=period_count)
+
+        return BinomialTreeEuropean(
+            up_factor=crr_parameters.get_up_factor(),
+            down_factor=crr_parameters.get_down_factor(),
+            period_discount_rate=get_discount_rate(continuous_interest_rate=0.05, period_length=1 / period_count),
+            period_count=period_count,
+            stock_price=100,
+            option=option,
+            **kwargs
+        )
+
+    def test_european_tree_stats(self):
+        reported_stats = []
+        instrumentation = Instrumentation(callback=reported_stats.append)
+
+        self.get_tree(4, Option.long_call_option(100), instrumentation=instrumentation).calculate_replicating_portfolios()
+
+        self.assertEqual(1, len(reported_stats))
+        stats = reported_stats[0]
+        self.assertEqual({"stock_tree", "payout", "portfolios"}, set(stats.phase_timings))
+        self.assertEqual(2 ** 5 - 1, stats.node_count)
+        self.assertEqual(1, stats.payout_call_count)
+        self.assertGreater(stats.peak_node_memory_bytes, 0)
+
+    def test_american_tree_reports_once(self):
+        reported_stats = []
+        instrumentation = Instrumentation(callback=reported_stats.append)
+        tree = self.get_tree(4, Option.long_put_option(100), instrumentation=instrumentation)
+
+        BinomialTreeAmerican(tree).calculate_replicating_portfolios()
+
+        self.assertEqual(1, len(reported_stats))
+        self.assertIn("european_tree", reported_stats[0].phase_timings)
+        self.assertIn("early_exercise", reported_stats[0].phase_timings)
+        self.assertEqual(1 + 5, reported_stats[0].payout_call_count)
+
+    def test_exercise_region_stats(self):
+        instrumentation = Instrumentation()
+        tree = self.get_tree(10, BarrierOption(Option.long_put_option(100), 110), recombining=True)
+
+        BinomialTreeAmerican(tree, instrumentation=instrumentation).calculate_exercise_region()
+
+        self.assertEqual(2 * 11 * 12 // 2, instrumentation.stats.node_count)
+        self.assertEqual(2 * 11, instrumentation.stats.payout_call_count)
+
+    def test_rolling_lattice_stats(self):
+        for option, state_count in [(Option.long_call_option(100), 1), (BarrierOption(Option.long_put_option(100), 110), 2)]:
+            with self.subTest(state_count):
+                instrumentation = Instrumentation()
+                tree = self.get_tree(50, option, recombining=True, price_only=True, instrumentation=instrumentation)
+
+                tree.calculate_price()
+
+                self.assertEqual(state_count * 51 * 52 // 2, instrumentation.stats.node_count)
+                self.assertIn("backward_induction", instrumentation.stats.phase_timings)
+
+    def test_greek_calculator_stats(self):
+        reported_stats = []
+        instrumentation = Instrumentation(callback=reported_stats.append)
+        calculator = GreekCalculator(black_scholes.Option().get_call_price, instrumentation=instrumentation)
+
+        calculator.all_greeks(black_scholes.Option.OptionParameters(100, 100, 0.05, 0.2, 1))
+
+        self.assertEqual(1, len(reported_stats))
+        self.assertEqual(9, reported_stats[0].pricing_callback_count)
+        self.assertIn("pricing", reported_stats[0].as_dict()["phase_timings"])
+
+    def test_stats_reset_between_runs(self):
+        reported_stats = []
+        instrumentation = Instrumentation(callback=reported_stats.append)
+        tree = self.get_tree(4, Option.long_call_option(100), instrumentation=instrumentation)
+
+        tree.calculate_replicating_portfolios()
+        tree.calculate_replicating_portfolios()
+
+        self.assertEqual(2, len(reported_stats))
+        self.assertIsNot(reported_stats[0], reported_stats[1])
+        self.assertEqual(2 ** 5 - 1, reported_stats[1].node_count)
+        self.assertEqual(1, reported_stats[1].payout_call_count)
+
+    def test_disabled_by_default(self):
+        tree = self.get_tree(4, Option.long_put_option(100))
+        instrumented_tree = self.get_tree(4, Option.long_put_option(100), instrumentation=Instrumentation())
+
+        self.assertEqual(
+            BinomialTreeAmerican(instrumented_tree).calculate_price(), BinomialTreeAmerican(tree).calculate_price()
+        )
@@ -2,7 +2,7 @@ import unittest
 
 from binomial_tree_european import BinomialTreeEuropean
 from binomial_tree_american import BinomialTreeAmerican
-from option import Option
+from option import Option, BarrierOption
 from crr import CRRBinomialTreeParameters
 from utils import get_discount_rate, get_discount_factor
 
@@ -77,6 +77,164 @@ class TestIntegration(unittest.TestCase):
 
                 print("call option price is %f; put option price is %f" % (call_price, put_price))
 
+    def test_recombining_matches_full_tree(self):
+        period_count = 10
+        total_length = 5
+        discount_rate = get_discount_rate(continuous_interest_rate=0.05, period_length=total_length / period_count)
+        crr_parameters = CRRBinomialTreeParameters(
+            stock_price_volatility=0.2, time_horizon=total_length, period_count=period_count
+        )
+
+        for option in [Option.long_call_option(100), Option.long_put_option(90), Option.short_call_option(110)]:
+            for tree_type in [lambda tree: tree, BinomialTreeAmerican]:
+                with self.subTest(option_type=option.option_type, tree_type=tree_type):
+                    def get_root_price(recombining):
+                        tree = tree_type(BinomialTreeEuropean(
+                            up_factor=crr_parameters.get_up_factor(), down_factor=crr_parameters.get_down_factor(),
+                            period_discount_rate=discount_rate, period_count=period_count, stock_price=100,
+                            option=option, recombining=recombining,
+                        ))
+                        return tree.calculate_replicating_portfolios().get_root_portfolio().get_price()
+
+                    self.assertAlmostEqual(get_root_price(False), get_root_price(True), delta=1e-9)
+
+    def test_recombining_barrier_matches_full_tree(self):
+        period_count = 10
+        total_length = 5
+        discount_rate = get_discount_rate(continuous_interest_rate=0.05, period_length=total_length / period_count)
+        crr_parameters = CRRBinomialTreeParameters(
+            stock_price_volatility=0.2, time_horizon=total_length, period_count=period_count
+        )
+
+        for barrier_price in [90, 100, 115, 140, 200]:
+            for option in [Option.long_call_option(100), Option.long_put_option(110)]:
+                with self.subTest(barrier_price=barrier_price, option_type=option.option_type):
+                    def get_root_price(recombining):
+                        tree = BinomialTreeEuropean(
+                            up_factor=crr_parameters.get_up_factor(), down_factor=crr_parameters.get_down_factor(),
+                            period_discount_rate=discount_rate, period_count=period_count, stock_price=100,
+                            option=BarrierOption(option, barrier_price), recombining=recombining,
+                        )
+                        return tree.calculate_replicating_portfolios().get_root_portfolio().get_price()
+
+                    self.assertAlmostEqual(get_root_price(False), get_root_price(True), delta=1e-9)
+
+    def test_recombining_barrier_large_period_count(self):
+        period_count = 500
+        total_length = 1
+        discount_rate = get_discount_rate(continuous_interest_rate=0.05, period_length=total_length / period_count)
+        crr_parameters = CRRBinomialTreeParameters(
+            stock_price_volatility=0.2, time_horizon=total_length, period_count=period_count
+        )
+
+        def get_root_price(option):
+            tree = BinomialTreeEuropean(
+                up_factor=crr_parameters.get_up_factor(), down_factor=crr_parameters.get_down_factor(),
+                period_discount_rate=discount_rate, period_count=period_count, stock_price=100,
+                option=option, recombining=True,
+            )
+            return tree.calculate_replicating_portfolios().get_root_portfolio().get_price()
+
+        vanilla_price = get_root_price(Option.long_put_option(100))
+        knocked_in_price = get_root_price(BarrierOption(Option.long_put_option(100), 110))
+
+        self.assertGreater(knocked_in_price, 0)
+        self.assertLess(knocked_in_price, vanilla_price)
+        self.assertAlmostEqual(vanilla_price, get_root_price(BarrierOption(Option.long_put_option(100), 100)), delta=1e-9)
+
+    def test_american_exercise_region_matches_full_tree(self):
+        period_count = 10
+        total_length = 5
+        discount_rate = get_discount_rate(continuous_interest_rate=0.05, period_length=total_length / period_count)
+        crr_parameters = CRRBinomialTreeParameters(
+            stock_price_volatility=0.2, time_horizon=total_length, period_count=period_count
+        )
+
+        for option in [
+            Option.long_put_option(100),
+            Option.long_call_option(90),
+            BarrierOption(Option.long_put_option(100), 120),
+            BarrierOption(Option.long_call_option(100), 110),
+        ]:
+            for recombining in [False, True]:
+                with self.subTest(option=option, recombining=recombining):
+                    def get_tree(recombining):
+                        return BinomialTreeAmerican(BinomialTreeEuropean(
+                            up_factor=crr_parameters.get_up_factor(), down_factor=crr_parameters.get_down_factor(),
+                            period_discount_rate=discount_rate, period_count=period_count, stock_price=100,
+                            option=option, recombining=recombining,
+                        ))
+
+                    expected_tree = get_tree(False).calculate_replicating_portfolios()
+                    price, exercise_flags = get_tree(recombining).calculate_exercise_region()
+
+                    self.assertAlmostEqual(expected_tree.get_root_portfolio().get_price(), price, delta=1e-9)
+                    if not recombining:
+                        for level in range(period_count):
+                            self.assertEqual(
+                                list(expected_tree.get_should_execute(level)), list(exercise_flags[level])
+                            )
+
+    def test_price_only_matches_full_lattice(self):
+        period_count = 200
+        total_length = 1
+        discount_rate = get_discount_rate(continuous_interest_rate=0.05, period_length=total_length / period_count)
+        crr_parameters = CRRBinomialTreeParameters(
+            stock_price_volatility=0.3, time_horizon=total_length, period_count=period_count
+        )
+
+        for option in [
+            Option.long_put_option(100),
+            Option.short_call_option(90),
+            BarrierOption(Option.long_put_option(100), 115),
+            BarrierOption(Option.long_call_option(100), 95),
+        ]:
+            for tree_type in [lambda tree, **kwargs: tree, BinomialTreeAmerican]:
+                with self.subTest(option=option, tree_type=tree_type):
+                    def get_tree(price_only):
+                        return tree_type(BinomialTreeEuropean(
+                            up_factor=crr_parameters.get_up_factor(), down_factor=crr_parameters.get_down_factor(),
+                            period_discount_rate=discount_rate, period_count=period_count, stock_price=100,
+                            option=option, recombining=True, price_only=price_only,
+                        ))
+
+                    self.assertAlmostEqual(get_tree(False).calculate_price(), get_tree(True).calculate_price(), delta=1e-9)
+
+                    with self.assertRaises(RuntimeError):
+                        get_tree(True).calculate_replicating_portfolios()
+
+    def test_price_only_requires_recombining(self):
+        with self.assertRaises(RuntimeError):
+            BinomialTreeEuropean(1.1, 0.9, 0, 2, 100, Option.long_call_option(100), price_only=True)
+
+        with self.assertRaises(RuntimeError):
+            BinomialTreeAmerican(BinomialTreeEuropean(1.1, 0.9, 0, 2, 100, Option.long_call_option(100)), price_only=True)
+
+    def test_recombining_vanilla_option_large_period_count(self):
+        period_count = 1000
+        total_length = 5
+        stock_price = 100
+        strike_price = 100
+        discount_rate = get_discount_rate(continuous_interest_rate=0.05, period_length=total_length / period_count)
+
+        crr_parameters = CRRBinomialTreeParameters(
+            stock_price_volatility=0.2, time_horizon=total_length, period_count=period_count
+        )
+
+        def get_root_price(option):
+            tree = BinomialTreeEuropean(
+                up_factor=crr_parameters.get_up_factor(), down_factor=crr_parameters.get_down_factor(),
+                period_discount_rate=discount_rate, period_count=period_count, stock_price=stock_price,
+                option=option, recombining=True,
+            )
+            return tree.calculate_replicating_portfolios().get_root_portfolio().get_price()
+
+        call_price = get_root_price(Option.long_call_option(strike_price))
+        put_price = get_root_price(Option.long_put_option(strike_price))
+        strike_price_present_value = strike_price / get_discount_factor(discount_rate) ** period_count
+
+        self.assertAlmostEqual(call_price + strike_price_present_value, put_price + stock_price, delta=1e-6)
+
 
 if __name__ == '__main__':
     unittest.main()
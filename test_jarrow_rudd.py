@@ -0,0 +1,34 @@
+import unittest
+
+import numpy as np
+
+from jarrow_rudd import JarrowRuddBinomialTreeParameters
+from utils import get_discount_rate, get_discount_factor, get_risk_neutral_probability
+
+
+class TestJarrowRudd(unittest.TestCase):
+    def test_zero_volatility(self):
+        parameters = JarrowRuddBinomialTreeParameters(0, 1, 1, 0)
+
+        self.assertAlmostEqual(1, parameters.get_up_factor(), delta=1e-9)
+        self.assertAlmostEqual(1, parameters.get_down_factor(), delta=1e-9)
+
+    def test_log_factors(self):
+        parameters = JarrowRuddBinomialTreeParameters(0.2, 1, 4, 0.05)
+        drift = (np.log(1.05) - 0.2 ** 2 / 2) / 4
+
+        self.assertAlmostEqual(drift + 0.1, np.log(parameters.get_up_factor()), delta=1e-12)
+        self.assertAlmostEqual(drift - 0.1, np.log(parameters.get_down_factor()), delta=1e-12)
+
+    def test_risk_neutral_probability_close_to_half(self):
+        parameters = JarrowRuddBinomialTreeParameters(0.2, 1, 1000, 0.05)
+
+        up_probability = get_risk_neutral_probability(
+            get_discount_factor(get_discount_rate(0.05, 1 / 1000)), parameters.get_up_factor(), parameters.get_down_factor()
+        )
+
+        self.assertAlmostEqual(0.5, up_probability, delta=1e-3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+import unittest
+
+import numpy as np
+
+import black_scholes
+from binomial_tree_american import BinomialTreeAmerican
+from binomial_tree_european import BinomialTreeEuropean
+from crr import CRRBinomialTreeParameters
+from jarrow_rudd import JarrowRuddBinomialTreeParameters
+from leisen_reimer import LeisenReimerBinomialTreeParameters
+from option import Option, BarrierOption
+from utils import get_discount_rate
+
+
+class TestLatticeGreeks(unittest.TestCase):
+    # annual rate whose continuously compounded equivalent is 5%
+    interest_rate = np.exp(0.05) - 1
+
+    @staticmethod
+    def get_crr_parameters(period_count):
+        return CRRBinomialTreeParameters(stock_price_volatility=0.25, time_horizon=1, period_count=period_count)
+
+    def get_tree(self, period_count, option, tree_parameters=None, **kwargs):
+        crr_parameters = tree_parameters or self.get_crr_parameters(period_count)
+
+        return BinomialTreeEuropean(
+            up_factor=crr_parameters.get_up_factor(),
+            down_factor=crr_parameters.get_down_factor(),
+            period_discount_rate=get_discount_rate(self.interest_rate, 1 / period_count),
+            period_count=period_count,
+            stock_price=100,
+            option=option,
+            **kwargs
+        )
+
+    def test_matches_black_scholes(self):
+        greeks = self.get_tree(1000, Option.long_put_option(105), recombining=True, price_only=True).calculate_greeks(
+            self.get_crr_parameters(1000)
+        )
+        expected_greeks = black_scholes.Option().get_put_greeks(black_scholes.Option.OptionParameters(100, 105, 0.05, 0.25, 1))
+
+        self.assertAlmostEqual(expected_greeks["delta"], greeks["delta"], delta=1e-3)
+        self.assertAlmostEqual(expected_greeks["gamma"], greeks["gamma"], delta=1e-4)
+        self.assertAlmostEqual(expected_greeks["theta"], greeks["theta"], delta=1e-2)
+        self.assertAlmostEqual(expected_greeks["vega"], greeks["vega"], delta=0.5)
+        self.assertAlmostEqual(expected_greeks["rho"], greeks["rho"], delta=5e-2)
+
+    def test_delta_is_root_share_weight(self):
+        tree = self.get_tree(6, Option.long_call_option(100))
+
+        greeks = tree.calculate_greeks(self.get_crr_parameters(6))
+        root_portfolio = tree.calculate_replicating_portfolios().get_root_portfolio()
+
+        self.assertAlmostEqual(root_portfolio.share_weight, greeks["delta"], delta=1e-12)
+        self.assertAlmostEqual(root_portfolio.get_price(), greeks["price"], delta=1e-12)
+
+    def test_tree_kinds_agree(self):
+        for option in [Option.long_call_option(100), Option.long_put_option(105)]:
+            for american in [False, True]:
+                with self.subTest(option_type=option.option_type, american=american):
+                    trees = [
+                        self.get_tree(6, option),
+                        self.get_tree(6, option, recombining=True),
+                        self.get_tree(6, option, recombining=True, price_only=True),
+                    ]
+                    if american:
+                        trees = [BinomialTreeAmerican(tree) for tree in trees]
+
+                    all_greeks = [tree.calculate_greeks(self.get_crr_parameters(6)) for tree in trees]
+
+                    for greeks in all_greeks[1:]:
+                        for name, value in all_greeks[0].items():
+                            self.assertAlmostEqual(value, greeks[name], delta=1e-9)
+
+    def test_american_put_greeks(self):
+        option = Option.long_put_option(105)
+
+        european_greeks = self.get_tree(200, option, recombining=True, price_only=True).calculate_greeks(
+            self.get_crr_parameters(200)
+        )
+        american_greeks = BinomialTreeAmerican(
+            self.get_tree(200, option, recombining=True, price_only=True)
+        ).calculate_greeks(self.get_crr_parameters(200))
+
+        self.assertGreater(american_greeks["price"], european_greeks["price"])
+        self.assertLess(american_greeks["delta"], european_greeks["delta"])
+        # early exercise shortens the effective life of the put, so it is less sensitive to the rate
+        self.assertGreater(american_greeks["rho"], european_greeks["rho"])
+
+    def test_full_tree_barrier(self):
+        option = BarrierOption(Option.long_put_option(105), 110)
+        greeks = self.get_tree(6, option).calculate_greeks(self.get_crr_parameters(6))
+
+        self.assertGreater(greeks["price"], 0)
+        self.assertGreater(greeks["vega"], 0)
+
+    def test_other_parameterizations_match_black_scholes(self):
+        expected_greeks = black_scholes.Option().get_put_greeks(black_scholes.Option.OptionParameters(100, 105, 0.05, 0.25, 1))
+
+        for tree_parameters in [
+            JarrowRuddBinomialTreeParameters(0.25, 1, 1001, self.interest_rate),
+            LeisenReimerBinomialTreeParameters(100, 105, 0.25, 1, 1001, self.interest_rate),
+        ]:
+            with self.subTest(type(tree_parameters).__name__):
+                tree = self.get_tree(
+                    1001, Option.long_put_option(105), tree_parameters, recombining=True, price_only=True
+                )
+                greeks = tree.calculate_greeks(tree_parameters)
+
+                self.assertAlmostEqual(expected_greeks["delta"], greeks["delta"], delta=1e-3)
+                self.assertAlmostEqual(expected_greeks["vega"], greeks["vega"], delta=0.5)
+                # the jarrow rudd factors move with the rate, shifting the nodes against the strike, so its rho
+                # oscillates with the period count
+                self.assertAlmostEqual(expected_greeks["rho"], greeks["rho"], delta=0.5)
+
+    def test_mismatched_tree_parameters(self):
+        tree = self.get_tree(6, Option.long_put_option(105))
+
+        for tree_parameters in [
+            self.get_crr_parameters(5),
+            CRRBinomialTreeParameters(stock_price_volatility=0.25, time_horizon=2, period_count=6),
+            JarrowRuddBinomialTreeParameters(0.25, 1, 6, self.interest_rate),
+        ]:
+            with self.subTest(type(tree_parameters).__name__), self.assertRaises(RuntimeError):
+                tree.calculate_greeks(tree_parameters)
+
+        jarrow_rudd_parameters = JarrowRuddBinomialTreeParameters(0.25, 1, 6, self.interest_rate)
+        with self.assertRaises(RuntimeError):
+            self.get_tree(6, Option.long_put_option(105), jarrow_rudd_parameters).calculate_greeks(
+                JarrowRuddBinomialTreeParameters(0.25, 1, 6, 0.1)
+            )
+
+    def test_unsupported_trees(self):
+        with self.assertRaises(RuntimeError):
+            self.get_tree(6, BarrierOption(Option.long_put_option(105), 110), recombining=True).calculate_greeks(
+                self.get_crr_parameters(6)
+            )
+        with self.assertRaises(RuntimeError):
+            self.get_tree(1, Option.long_put_option(105)).calculate_greeks(self.get_crr_parameters(1))
+
+
+if __name__ == '__main__':
+    unittest.main()
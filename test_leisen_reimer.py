@@ -0,0 +1,78 @@
+import unittest
+
+import numpy as np
+
+import black_scholes
+from binomial_tree_american import BinomialTreeAmerican
+from binomial_tree_european import BinomialTreeEuropean
+from leisen_reimer import LeisenReimerBinomialTreeParameters
+from option import Option
+from utils import get_discount_rate, get_discount_factor, get_risk_neutral_probability
+
+
+class TestLeisenReimer(unittest.TestCase):
+    interest_rate = 0.05
+
+    def get_price(self, parameters, period_count, option, american=False):
+        tree = BinomialTreeEuropean(
+            up_factor=parameters.get_up_factor(),
+            down_factor=parameters.get_down_factor(),
+            period_discount_rate=get_discount_rate(self.interest_rate, 1 / period_count),
+            period_count=period_count,
+            stock_price=100,
+            option=option,
+            recombining=True,
+            price_only=True,
+        )
+        return (BinomialTreeAmerican(tree) if american else tree).calculate_price()
+
+    def test_risk_neutral_probability(self):
+        parameters = LeisenReimerBinomialTreeParameters(100, 105, 0.25, 1, 11, self.interest_rate)
+
+        up_probability = get_risk_neutral_probability(
+            get_discount_factor(get_discount_rate(self.interest_rate, 1 / 11)), parameters.get_up_factor(), parameters.get_down_factor()
+        )
+
+        self.assertGreater(up_probability, 0)
+        self.assertLess(up_probability, 1)
+        self.assertGreater(parameters.get_up_factor(), 1)
+        self.assertLess(parameters.get_down_factor(), 1)
+
+    def test_european_matches_black_scholes(self):
+        for strike_price in [90, 100, 105, 110]:
+            with self.subTest(strike_price):
+                parameters = LeisenReimerBinomialTreeParameters(100, strike_price, 0.25, 1, 101, self.interest_rate)
+                expected_price = black_scholes.Option().get_put_price(black_scholes.Option.OptionParameters(
+                    100, strike_price, np.log(1 + self.interest_rate), 0.25, 1
+                ))
+
+                self.assertAlmostEqual(
+                    expected_price, self.get_price(parameters, 101, Option.long_put_option(strike_price)), delta=1e-4
+                )
+
+    def test_american_converges_smoothly(self):
+        # unlike crr the american error does not oscillate, it halves with every doubling of the period count
+        option = Option.long_put_option(105)
+        reference_price = self.get_price(
+            LeisenReimerBinomialTreeParameters(100, 105, 0.25, 1, 4001, self.interest_rate), 4001, option, american=True
+        )
+
+        errors = [
+            self.get_price(
+                LeisenReimerBinomialTreeParameters(100, 105, 0.25, 1, period_count, self.interest_rate), period_count, option,
+                american=True,
+            ) - reference_price
+            for period_count in [101, 201, 401]
+        ]
+
+        self.assertTrue(all(error < 0 for error in errors))
+        for coarse_error, fine_error in zip(errors[:-1], errors[1:]):
+            self.assertAlmostEqual(0.5, fine_error / coarse_error, delta=0.1)
+
+    def test_even_period_count(self):
+        with self.assertRaises(RuntimeError):
+            LeisenReimerBinomialTreeParameters(100, 105, 0.25, 1, 100, self.interest_rate)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+import black_scholes
+from binomial_tree_european import BinomialTreeEuropean
+from crr import CRRBinomialTreeParameters
+from monte_carlo import MonteCarloEngine
+from option import Option, BarrierOption
+
+
+class TestMonteCarloEngine(unittest.TestCase):
+    def test_vanilla_option_matches_black_scholes(self):
+        for option, price_callback in [
+            (Option.long_call_option(100), black_scholes.Option().get_call_price),
+            (Option.long_put_option(110), black_scholes.Option().get_put_price),
+        ]:
+            with self.subTest(option_type=option.option_type):
+                result = MonteCarloEngine(100, 0.05, 0.2, 1, 1, option, path_count=200_000, seed=1).calculate_price()
+                expected_price = price_callback(black_scholes.Option.OptionParameters(100, option.strike_price, 0.05, 0.2, 1))
+
+                self.assertAlmostEqual(expected_price, result.price, delta=4 * result.standard_error)
+
+    def test_barrier_option_matches_lattice(self):
+        period_count = 50
+        option = BarrierOption(Option.long_put_option(100), 110)
+
+        result = MonteCarloEngine(100, 0.05, 0.2, 1, period_count, option, path_count=200_000, seed=2).calculate_price()
+
+        crr_parameters = CRRBinomialTreeParameters(0.2, 1, period_count)
+        lattice_price = BinomialTreeEuropean(
+            crr_parameters.get_up_factor(), crr_parameters.get_down_factor(), 0.05 / period_count, period_count, 100,
+            option, recombining=True, price_only=True,
+        ).calculate_price()
+
+        self.assertAlmostEqual(lattice_price, result.price, delta=4 * result.standard_error + 0.02 * lattice_price)
+
+    def test_chunks_are_reproducible_across_executors(self):
+        engine = MonteCarloEngine(
+            100, 0.05, 0.2, 1, 10, BarrierOption(Option.long_call_option(100), 105), path_count=20_000,
+            chunk_size=3_000, seed=3
+        )
+
+        serial_result = engine.calculate_price()
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            parallel_result = engine.calculate_price(executor)
+
+        self.assertEqual(serial_result.price, parallel_result.price)
+        self.assertEqual(serial_result.standard_error, parallel_result.standard_error)
+        self.assertEqual(10_000, serial_result.sample_count)
+
+    def test_antithetic_variates_reduce_standard_error(self):
+        def get_standard_error(antithetic):
+            return MonteCarloEngine(
+                100, 0.05, 0.2, 1, 1, Option.long_call_option(100), path_count=100_000, antithetic=antithetic, seed=4
+            ).calculate_price().standard_error
+
+        self.assertLess(get_standard_error(True), get_standard_error(False))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,6 @@
 import unittest
-from option import Option, PriceInfo
+import numpy as np
+from option import Option, BarrierOption, PriceInfo
 
 
 class TestOption(unittest.TestCase):
@@ -23,6 +24,26 @@ class TestOption(unittest.TestCase):
         self.assertEqual(option.get_payout(PriceInfo(200, 200)), 0)
         self.assertEqual(option.get_payout(PriceInfo(50, 50)), -50)
 
+    def test_vectorized_payouts_match_scalar(self):
+        stock_prices = np.array([50, 99.5, 100, 100.5, 200])
+        max_encountered = np.array([120, 99.5, 105, 110, 200])
+
+        for option in [
+            Option.long_call_option(100),
+            Option.short_call_option(100),
+            Option.long_put_option(100),
+            Option.short_put_option(100),
+            BarrierOption(Option.long_put_option(100), 110),
+            BarrierOption(Option.long_call_option(100), 105),
+        ]:
+            with self.subTest(option=option):
+                payouts = option.get_payouts(stock_prices, max_encountered)
+
+                self.assertEqual(
+                    [option.get_payout(PriceInfo(*price_info)) for price_info in zip(stock_prices, max_encountered)],
+                    list(payouts)
+                )
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+import numpy as np
+from portfolio_tree import PortfolioTree
+from portfolios import OptionExecutionPortfolio, OptionReplicatingPortfolio
+from recombining_portfolio_tree import RecombiningPortfolioTree
+
+
+class TestPortfolioTree(unittest.TestCase):
+    def test_level_arrays(self):
+        portfolio_tree = PortfolioTree(3)
+
+        self.assertEqual([1, 2, 4, 8], [len(portfolio_tree.get_stock_prices(level)) for level in range(4)])
+        self.assertEqual([1, 2, 4], [len(portfolio_tree.get_prices(level)) for level in range(3)])
+        self.assertEqual(np.float64, portfolio_tree.get_share_weights(2).dtype)
+        self.assertEqual(4, portfolio_tree.get_node_count_at_period(2))
+
+    def test_views_follow_level_arrays(self):
+        portfolio_tree = PortfolioTree(2)
+        portfolio_tree.get_stock_prices(1)[:] = [110, 90]
+        portfolio_tree.get_share_weights(1)[:] = [0.5, 0.25]
+        portfolio_tree.get_prices(1)[:] = [3, 4]
+
+        portfolio_up, portfolio_down = portfolio_tree.get_children_portfolios(0, 0)
+        self.assertEqual(110, portfolio_up.stock_price)
+        self.assertEqual(0.5, portfolio_up.share_weight)
+        self.assertEqual(4, portfolio_down.get_price())
+
+        portfolio_tree.get_prices(1)[1] = 5
+        self.assertEqual(5, portfolio_down.get_price())
+
+    def test_update_portfolio(self):
+        portfolio_tree = PortfolioTree(2)
+
+        portfolio_tree.update_portfolio(1, 0, OptionReplicatingPortfolio(0.5, 0.25, 100))
+        self.assertEqual(0.25, portfolio_tree.get_portfolio(1, 0).bond_weight)
+        self.assertEqual(75, portfolio_tree.get_portfolio(1, 0).get_price())
+
+        portfolio_tree.update_portfolio(1, 1, OptionExecutionPortfolio(7, should_execute=True))
+        self.assertEqual(7, portfolio_tree.get_portfolio(1, 1).get_price())
+        self.assertTrue(portfolio_tree.get_portfolio(1, 1).should_execute)
+        self.assertFalse(portfolio_tree.get_portfolio(1, 0).should_execute)
+
+    def test_children_stock_price_data(self):
+        portfolio_tree = PortfolioTree(2)
+        portfolio_tree.get_stock_prices(2)[:] = [121, 99, 99, 81]
+        portfolio_tree.get_max_encountered(2)[:] = [121, 110, 100, 100]
+
+        price_info_up, price_info_down = portfolio_tree.get_children_stock_price_data(1, 1)
+        self.assertEqual(99, price_info_up.curr)
+        self.assertEqual(100, price_info_up.max_encountered)
+        self.assertEqual(81, price_info_down.curr)
+
+    def test_recombining_layout(self):
+        portfolio_tree = RecombiningPortfolioTree(3)
+        portfolio_tree.get_prices(2)[:] = [1, 2, 3]
+
+        self.assertEqual(3, portfolio_tree.get_node_count_at_period(2))
+        self.assertEqual([2, 3], [portfolio.get_price() for portfolio in portfolio_tree.get_children_portfolios(1, 1)])
+
+        up_values, down_values = portfolio_tree.split_children_values(np.array([1, 2, 3]))
+        self.assertEqual([1, 2], list(up_values))
+        self.assertEqual([2, 3], list(down_values))
+
+
+if __name__ == '__main__':
+    unittest.main()
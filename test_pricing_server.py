@@ -0,0 +1,222 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import black_scholes
+from option import Option
+from pricing_server import PricingServer
+from stock_lattice import StockLattice
+
+
+class TestPricingServer(unittest.TestCase):
+    @staticmethod
+    def get_request(strike_price, is_call=True, engine=PricingServer.ENGINE_BLACK_SCHOLES, **kwargs):
+        return dict({
+            "engine": engine,
+            "is_call": is_call,
+            "stock_price": 100,
+            "strike_price": strike_price,
+            "risk_free_rate": 0.02,
+            "volatility": 0.3,
+            "maturity_time": 0.5,
+        }, **kwargs)
+
+    def test_concurrent_requests_are_batched(self):
+        requests = [self.get_request(80 + index, is_call=index % 2 == 0) for index in range(40)]
+
+        async def run():
+            server = PricingServer(batch_window=1e-2)
+            prices = await asyncio.gather(*(server.price(request) for request in requests))
+            return server, prices
+
+        server, prices = asyncio.run(run())
+
+        bs_option = black_scholes.Option()
+        for request, price in zip(requests, prices):
+            parameters = black_scholes.Option.OptionParameters(*(request[name] for name in PricingServer.PARAMETER_NAMES))
+            expected_price = bs_option.get_call_price(parameters) if request["is_call"] else bs_option.get_put_price(parameters)
+            self.assertAlmostEqual(expected_price, price, delta=1e-9)
+
+        stats = server.get_stats()
+        self.assertEqual(1, stats["batch_count"])
+        self.assertEqual(40, stats["request_count"])
+        self.assertEqual(40, stats["latency"]["count"])
+
+    def test_max_batch_size(self):
+        async def run():
+            server = PricingServer(batch_window=10, max_batch_size=4)
+            await asyncio.gather(*(server.price(self.get_request(100)) for _ in range(12)))
+            return server
+
+        self.assertEqual(3, asyncio.run(run()).get_stats()["batch_count"])
+
+    def test_lattice_engines(self):
+        strike_prices = [90, 100, 110]
+
+        async def run():
+            server = PricingServer(period_count=100)
+            return await asyncio.gather(*(
+                server.price(self.get_request(strike_price, is_call=False, engine=engine))
+                for engine in [PricingServer.ENGINE_EUROPEAN_LATTICE, PricingServer.ENGINE_AMERICAN_LATTICE]
+                for strike_price in strike_prices
+            ))
+
+        prices = asyncio.run(run())
+
+        lattice = StockLattice(100, 0.3, 0.5, 100, np.exp(0.02) - 1)
+        options = [Option.long_put_option(strike_price) for strike_price in strike_prices]
+        np.testing.assert_allclose(lattice.calculate_prices(options), prices[:3], rtol=1e-12)
+        np.testing.assert_allclose(lattice.calculate_prices(options, early_exercise=True), prices[3:], rtol=1e-12)
+
+    def test_invalid_requests(self):
+        async def run():
+            server = PricingServer()
+            with self.assertRaises(RuntimeError):
+                await server.price(self.get_request(100, engine="unknown"))
+            with self.assertRaises(RuntimeError):
+                await server.price({"is_call": True})
+
+        asyncio.run(run())
+
+    def test_malformed_request_in_batch(self):
+        malformed_requests = [
+            self.get_request("abc"),
+            self.get_request({"value": 100}),
+            self.get_request([100]),
+            self.get_request(100, is_call="yes"),
+            self.get_request(float("nan")),
+            [100],
+        ]
+
+        async def run():
+            server = PricingServer(batch_window=1e-2)
+            results = await asyncio.wait_for(asyncio.gather(
+                *(server.price(self.get_request(80 + index)) for index in range(3)),
+                *(server.price(request) for request in malformed_requests),
+                *(server.price(self.get_request(80 + index, engine=PricingServer.ENGINE_EUROPEAN_LATTICE)) for index in range(3)),
+                return_exceptions=True,
+            ), timeout=5)
+            return server, results
+
+        server, results = asyncio.run(run())
+
+        for result in results[:3] + results[-3:]:
+            self.assertIsInstance(result, float)
+        for result in results[3:-3]:
+            self.assertIsInstance(result, RuntimeError)
+        self.assertEqual(6, server.get_stats()["request_count"])
+
+    def test_failing_batch_resolves_every_request(self):
+        async def run():
+            server = PricingServer(batch_window=1e-2)
+            server._price_batch = lambda engine, requests: {}["unexpected failure"]
+            return await asyncio.wait_for(asyncio.gather(
+                *(server.price(self.get_request(100)) for _ in range(3)), return_exceptions=True
+            ), timeout=5)
+
+        for result in asyncio.run(run()):
+            self.assertIsInstance(result, KeyError)
+
+    def test_out_of_domain_requests_get_errors(self):
+        bad_requests = [
+            dict(self.get_request(100, engine=engine), **{name: value})
+            for engine in PricingServer.ENGINES
+            for name in PricingServer.POSITIVE_PARAMETER_NAMES
+            for value in [0, -100]
+        ]
+
+        async def run(path):
+            server = PricingServer()
+            unix_server = await server.start_unix_server(path)
+
+            async with unix_server:
+                reader, writer = await asyncio.open_unix_connection(path)
+                for index, request in enumerate(bad_requests):
+                    writer.write((json.dumps(dict(request, id=index)) + "\n").encode())
+                await writer.drain()
+
+                responses = [json.loads(await reader.readline()) for _ in bad_requests]
+
+                writer.close()
+                await writer.wait_closed()
+
+            return responses
+
+        with tempfile.TemporaryDirectory() as directory:
+            responses = asyncio.run(run(os.path.join(directory, "pricing.sock")))
+
+        self.assertEqual(len(bad_requests), len(responses))
+        for response in responses:
+            self.assertIn("error", response)
+            self.assertNotIn("price", response)
+
+    def test_failing_batch_replies_on_socket(self):
+        async def run(path):
+            server = PricingServer()
+            server._price_batch = lambda engine, requests: 1 / 0
+            unix_server = await server.start_unix_server(path)
+
+            async with unix_server:
+                reader, writer = await asyncio.open_unix_connection(path)
+                for index in range(3):
+                    writer.write((json.dumps(dict(self.get_request(100), id=index)) + "\n").encode())
+                await writer.drain()
+
+                responses = [json.loads(await asyncio.wait_for(reader.readline(), timeout=5)) for _ in range(3)]
+
+                writer.close()
+                await writer.wait_closed()
+
+            return responses
+
+        with tempfile.TemporaryDirectory() as directory:
+            responses = asyncio.run(run(os.path.join(directory, "pricing.sock")))
+
+        self.assertEqual([0, 1, 2], sorted(response["id"] for response in responses))
+        for response in responses:
+            self.assertIn("division by zero", response["error"])
+
+    def test_unix_socket(self):
+        async def run(path):
+            server = PricingServer()
+            unix_server = await server.start_unix_server(path)
+
+            async with unix_server:
+                reader, writer = await asyncio.open_unix_connection(path)
+                for index, strike_price in enumerate([95, 105]):
+                    writer.write((json.dumps(dict(self.get_request(strike_price), id=index)) + "\n").encode())
+                writer.write((json.dumps({"id": "bad", "engine": "unknown"}) + "\n").encode())
+                writer.write(b"[1]\n")
+                await writer.drain()
+
+                responses = [json.loads(await reader.readline()) for _ in range(4)]
+
+                writer.write((json.dumps({"id": "stats", "type": "stats"}) + "\n").encode())
+                await writer.drain()
+                stats_response = json.loads(await reader.readline())
+
+                writer.close()
+                await writer.wait_closed()
+
+            return {response["id"]: response for response in responses}, stats_response
+
+        with tempfile.TemporaryDirectory() as directory:
+            responses, stats_response = asyncio.run(run(os.path.join(directory, "pricing.sock")))
+
+        bs_option = black_scholes.Option()
+        for index, strike_price in enumerate([95, 105]):
+            expected_price = bs_option.get_call_price(black_scholes.Option.OptionParameters(100, strike_price, 0.02, 0.3, 0.5))
+            self.assertAlmostEqual(expected_price, responses[index]["price"], delta=1e-9)
+        self.assertIn("error", responses["bad"])
+        self.assertIn("error", responses[None])
+
+        self.assertEqual(2, stats_response["stats"]["request_count"])
+        self.assertIsNotNone(stats_response["stats"]["latency"]["p99"])
+
+
+if __name__ == '__main__':
+    unittest.main()
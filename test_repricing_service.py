@@ -0,0 +1,112 @@
+import asyncio
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from book_pricer import BookPricer
+from repricing_service import RepricingService
+
+
+class TestRepricingService(unittest.TestCase):
+    risk_free_rate = 5e-3
+
+    book = pd.DataFrame({
+        "underlying": ["A", "A", "B", "B"],
+        "amount": [1_000, -2_000, 3_000, 500],
+        "type": ["call", "put", "call", "put"],
+        "strike_price": [100, 95, 50, 55],
+        "maturity": np.array([1, 2, 3, 6]) / 12,
+        "engine": [
+            BookPricer.ENGINE_BLACK_SCHOLES, BookPricer.ENGINE_AMERICAN_TREE,
+            BookPricer.ENGINE_BLACK_SCHOLES, BookPricer.ENGINE_EUROPEAN_TREE,
+        ],
+    })
+
+    def run_service(self, ticks, **kwargs):
+        snapshots = []
+
+        async def run():
+            service = RepricingService(
+                self.book, self.risk_free_rate, period_count=50, publish_callback=snapshots.append, **kwargs
+            )
+            for tick in ticks:
+                service.submit(*tick)
+            service.stop()
+
+            await service.run()
+            return service
+
+        return asyncio.run(run()), snapshots
+
+    def test_bursts_are_coalesced(self):
+        ticks = [("A", 100 + index, 0.2) for index in range(50)] + [("B", 50, 0.3), ("B", 51, 0.35)]
+
+        service, snapshots = self.run_service(ticks)
+
+        self.assertEqual(2, len(snapshots))
+        self.assertEqual(2, len(service.get_snapshot("A").book))
+        self.assertEqual((149, 0.2), (service.get_snapshot("A").stock_price, service.get_snapshot("A").volatility))
+        self.assertEqual((51, 0.35), (service.get_snapshot("B").stock_price, service.get_snapshot("B").volatility))
+
+        stats = service.get_stats()
+        self.assertEqual(52, stats["tick_count"])
+        self.assertEqual(50, stats["coalesced_tick_count"])
+        self.assertEqual(2, stats["latency"]["count"])
+        self.assertGreater(stats["latency"]["p99"], 0)
+
+    def test_only_changed_underlying_is_repriced(self):
+        service, snapshots = self.run_service([("B", 52, 0.25), ("C", 10, 0.1)])
+
+        self.assertEqual(["B"], [snapshot.underlying for snapshot in snapshots])
+        self.assertIsNone(service.get_snapshot("A"))
+        self.assertEqual(1, service.get_stats()["ignored_tick_count"])
+
+        expected_book = BookPricer(self.risk_free_rate, period_count=50).price_book(
+            self.book[self.book.underlying == "B"], 52, 0.25
+        )
+        pd.testing.assert_frame_equal(expected_book, snapshots[0].book)
+        self.assertAlmostEqual(expected_book.total_prices.sum(), snapshots[0].get_total_price(), delta=1e-9)
+        self.assertAlmostEqual(
+            (expected_book.amount * expected_book.delta).sum(), snapshots[0].get_total_greeks()["delta"], delta=1e-9
+        )
+
+    def test_executor_matches_inline(self):
+        ticks = [("A", 101, 0.2), ("B", 49, 0.3)]
+        _, inline_snapshots = self.run_service(ticks)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            _, executor_snapshots = self.run_service(ticks, executor=executor)
+
+        for inline_snapshot, executor_snapshot in zip(
+            sorted(inline_snapshots, key=lambda snapshot: snapshot.underlying),
+            sorted(executor_snapshots, key=lambda snapshot: snapshot.underlying),
+        ):
+            pd.testing.assert_frame_equal(inline_snapshot.book, executor_snapshot.book)
+
+    def test_tree_books_leave_the_event_loop(self):
+        pricing_threads = {}
+
+        async def run():
+            service = RepricingService(self.book, self.risk_free_rate, period_count=50)
+            price_book = service.book_pricer.price_book
+
+            def record_thread(positions, stock_price, volatility):
+                pricing_threads[positions.underlying.iloc[0]] = threading.get_ident()
+                return price_book(positions, stock_price, volatility)
+
+            service.book_pricer.price_book = record_thread
+            service.submit("A", 101, 0.2)
+            service.stop()
+
+            await service.run()
+
+        asyncio.run(run())
+
+        self.assertNotEqual(threading.get_ident(), pricing_threads["A"])
+
+
+if __name__ == '__main__':
+    unittest.main()
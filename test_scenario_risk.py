@@ -0,0 +1,79 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from book_pricer import BookPricer
+from scenario_risk import ScenarioRiskEngine
+
+
+class TestScenarioRiskEngine(unittest.TestCase):
+    risk_free_rate = 5e-3
+    stock_price = 230
+    volatility = 0.3
+
+    book = pd.DataFrame({
+        "amount": [34_000, 37_000, 20_000],
+        "type": ["call", "put", "call"],
+        "strike_price": [235, 231, 234],
+        "maturity": np.array([1, 2, 2]) / 12
+    })
+
+    stock_price_shocks = np.linspace(-10, 10, 21)
+    volatility_shocks = np.linspace(-0.05, 0.05, 11)
+    maturity_shocks = np.array([0, -1 / 365, -7 / 365])
+
+    def test_full_revaluation_matches_book_pricer(self):
+        result = ScenarioRiskEngine(self.risk_free_rate).calculate_pnl(
+            self.book, self.stock_price, self.volatility,
+            self.stock_price_shocks, self.volatility_shocks, self.maturity_shocks
+        )
+        self.assertEqual((21, 11, 3), result.full_revaluation_pnl.shape)
+        self.assertEqual((21, 11, 3), result.taylor_pnl.shape)
+
+        book_pricer = BookPricer(self.risk_free_rate)
+        original_book = book_pricer.price_book(self.book, self.stock_price, self.volatility)
+
+        for stock_price_index, volatility_index, maturity_index in [(16, 7, 1), (0, 0, 2), (10, 5, 0)]:
+            today_book = self.book.copy()
+            today_book.maturity += self.maturity_shocks[maturity_index]
+            today_book = book_pricer.price_book(
+                today_book,
+                self.stock_price + self.stock_price_shocks[stock_price_index],
+                self.volatility + self.volatility_shocks[volatility_index],
+            )
+
+            self.assertAlmostEqual(
+                (today_book.total_prices - original_book.total_prices).sum(),
+                result.full_revaluation_pnl[stock_price_index, volatility_index, maturity_index],
+                delta=1e-6
+            )
+
+    def test_blocks_do_not_change_result(self):
+        def calculate_pnl(block_size):
+            return ScenarioRiskEngine(self.risk_free_rate, block_size=block_size).calculate_pnl(
+                self.book, self.stock_price, self.volatility,
+                self.stock_price_shocks, self.volatility_shocks, self.maturity_shocks
+            )
+
+        result, block_result = calculate_pnl(10_000), calculate_pnl(1)
+
+        np.testing.assert_allclose(result.full_revaluation_pnl, block_result.full_revaluation_pnl)
+        np.testing.assert_allclose(result.taylor_pnl, block_result.taylor_pnl)
+
+    def test_taylor_approximation_for_small_shocks(self):
+        result = ScenarioRiskEngine(self.risk_free_rate).calculate_pnl(
+            self.book, self.stock_price, self.volatility, [-0.5, 0, 0.5], [-1e-3, 0, 1e-3], [0, -1e-3]
+        )
+
+        self.assertAlmostEqual(0, result.full_revaluation_pnl[1, 1, 0], delta=1e-9)
+        self.assertAlmostEqual(0, result.taylor_pnl[1, 1, 0], delta=1e-9)
+        # the approximation has no cross terms, so it is only compared along single factor shocks
+        for index in [(0, 1, 0), (2, 1, 0), (1, 0, 0), (1, 2, 0), (1, 1, 1)]:
+            self.assertAlmostEqual(
+                result.full_revaluation_pnl[index], result.taylor_pnl[index], delta=1e-2 * abs(result.taylor_pnl[index])
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+
+import numpy as np
+
+from binomial_tree_american import BinomialTreeAmerican
+from binomial_tree_european import BinomialTreeEuropean
+from option import Option, PriceInfo
+from stock_lattice import StockLattice
+
+
+class TestStockLattice(unittest.TestCase):
+    options = [
+        Option.long_call_option(90),
+        Option.long_call_option(100),
+        Option.long_put_option(100),
+        Option.long_put_option(110),
+        Option.short_call_option(105),
+        Option.short_put_option(95),
+    ]
+
+    def test_chain_payouts_match_scalar(self):
+        stock_prices = np.array([80, 95, 100, 120])
+        payouts = Option.get_chain_payouts(self.options, stock_prices)
+
+        self.assertEqual((4, 6), payouts.shape)
+        for stock_index, stock_price in enumerate(stock_prices):
+            for option_index, option in enumerate(self.options):
+                self.assertEqual(
+                    option.get_payout(PriceInfo(stock_price, stock_price)), payouts[stock_index, option_index]
+                )
+
+    def test_level_stock_prices_match_recombining_tree(self):
+        lattice = StockLattice(100, 0.2, 5, 10, 0.05)
+        tree = BinomialTreeEuropean(
+            lattice.up_factor, lattice.down_factor, lattice.period_discount_rate, 10, 100, self.options[0],
+            recombining=True,
+        )
+
+        for level, tree_stock_prices in enumerate(tree.calculate_stock_prices()[0]):
+            np.testing.assert_array_equal(lattice.get_stock_prices(level), tree_stock_prices)
+        np.testing.assert_allclose([110.25, 99.75, 90.25], StockLattice.get_level_stock_prices(100, 1.05, 0.95, 2))
+
+    def test_chain_prices_match_single_trees(self):
+        lattice = StockLattice(100, 0.2, 5, 50, 0.05)
+
+        for early_exercise in [False, True]:
+            with self.subTest(early_exercise=early_exercise):
+                prices = lattice.calculate_prices(self.options, early_exercise=early_exercise)
+
+                for option, price in zip(self.options, prices):
+                    tree = BinomialTreeEuropean(
+                        lattice.up_factor, lattice.down_factor, lattice.period_discount_rate, 50, 100, option,
+                        recombining=True, price_only=True,
+                    )
+                    tree = BinomialTreeAmerican(tree) if early_exercise else tree
+                    self.assertAlmostEqual(tree.calculate_price(), price, delta=1e-9)
+
+    def test_cache(self):
+        lattice = StockLattice.get_cached(100, 0.2, 1, 100, 0.01)
+
+        self.assertIs(lattice, StockLattice.get_cached(100, 0.2, 1, 100, 0.01))
+        self.assertIsNot(lattice, StockLattice.get_cached(100, 0.25, 1, 100, 0.01))
+        self.assertFalse(lattice.get_stock_prices(100).flags.writeable)
+
+        for period_count in range(StockLattice.CACHE_SIZE):
+            StockLattice.get_cached(100, 0.2, 1, period_count + 1, 0.02)
+        self.assertIsNot(lattice, StockLattice.get_cached(100, 0.2, 1, 100, 0.01))
+
+
+if __name__ == '__main__':
+    unittest.main()
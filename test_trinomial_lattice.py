@@ -0,0 +1,50 @@
+import unittest
+
+import numpy as np
+
+import black_scholes
+from option import Option, BarrierOption
+from trinomial_lattice import TrinomialTreeParameters, TrinomialLattice
+
+
+class TestTrinomialLattice(unittest.TestCase):
+    def test_probabilities(self):
+        probabilities = TrinomialTreeParameters(0.25, 1, 100, 0.05).get_probabilities()
+
+        self.assertAlmostEqual(1, sum(probabilities), delta=1e-12)
+        for probability in probabilities:
+            self.assertGreater(probability, 0)
+
+    def test_single_period(self):
+        parameters = TrinomialTreeParameters(0.25, 1, 1, 0.05)
+        up_probability, _, _ = parameters.get_probabilities()
+
+        price = TrinomialLattice(100, Option.long_call_option(100), parameters).calculate_price()
+
+        self.assertAlmostEqual(up_probability * (100 * parameters.get_up_factor() - 100) / 1.05, price, delta=1e-9)
+
+    def test_european_matches_black_scholes(self):
+        for strike_price in [90, 100, 110]:
+            for is_call in [True, False]:
+                with self.subTest(strike_price=strike_price, is_call=is_call):
+                    option = Option.long_call_option(strike_price) if is_call else Option.long_put_option(strike_price)
+                    expected_price = black_scholes.Option().get_prices(
+                        black_scholes.Option.OptionParameters(100, strike_price, np.log(1.05), 0.25, 1), is_call
+                    )
+
+                    price = TrinomialLattice(100, option, TrinomialTreeParameters(0.25, 1, 400, 0.05)).calculate_price()
+
+                    self.assertAlmostEqual(expected_price, price, delta=1e-2)
+
+    def test_early_exercise(self):
+        lattice = TrinomialLattice(100, Option.long_put_option(105), TrinomialTreeParameters(0.25, 1, 100, 0.05))
+
+        self.assertGreater(lattice.calculate_price(early_exercise=True), lattice.calculate_price())
+
+    def test_barrier_option(self):
+        with self.assertRaises(RuntimeError):
+            TrinomialLattice(100, BarrierOption(Option.long_put_option(105), 110), TrinomialTreeParameters(0.25, 1, 10, 0.05))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import numpy as np
+
+from option import Option
+from utils import get_discount_factor, get_discount_rate
+
+
+class TrinomialTreeParameters:
+    def __init__(self, stock_price_volatility, time_horizon, period_count, interest_rate):
+        # interest rate follows the convention of utils.get_discount_rate
+        self.stock_price_volatility = stock_price_volatility
+        self.time_horizon = time_horizon
+        self.period_count = period_count
+        self.interest_rate = interest_rate
+
+    def get_up_factor(self):
+        return np.exp(self.stock_price_volatility * np.sqrt(2 * self._get_period_length()))
+
+    def get_down_factor(self):
+        return 1 / self.get_up_factor()
+
+    def get_period_discount_rate(self):
+        return get_discount_rate(self.interest_rate, self._get_period_length())
+
+    def get_probabilities(self):
+        # (up, middle, down) risk neutral probabilities of the boyle lattice
+        half_growth_factor = get_discount_factor(self.get_period_discount_rate() / 2)
+        half_up_factor = np.exp(self.stock_price_volatility * np.sqrt(self._get_period_length() / 2))
+        half_down_factor = 1 / half_up_factor
+
+        up_probability = ((half_growth_factor - half_down_factor) / (half_up_factor - half_down_factor)) ** 2
+        down_probability = ((half_up_factor - half_growth_factor) / (half_up_factor - half_down_factor)) ** 2
+
+        return up_probability, 1 - up_probability - down_probability, down_probability
+
+    def _get_period_length(self):
+        return self.time_horizon / self.period_count
+
+
+class TrinomialLattice:
+    def __init__(self, stock_price, option, trinomial_parameters):
+        if not isinstance(option, Option):
+            raise RuntimeError("trinomial lattice supports vanilla options only, got %s" % type(option).__name__)
+
+        self.stock_price = stock_price
+        self.option = option
+        self.period_count = trinomial_parameters.period_count
+        self.up_factor = trinomial_parameters.get_up_factor()
+        self.period_discount_rate = trinomial_parameters.get_period_discount_rate()
+        self.probabilities = trinomial_parameters.get_probabilities()
+
+    def calculate_price(self, early_exercise=False):
+        # level l has 2 * l + 1 nodes, node j holds stock_price * up_factor ** (l - j); children of j are j, j + 1, j + 2
+        discount_factor = get_discount_factor(self.period_discount_rate)
+        up_weight, middle_weight, down_weight = (probability / discount_factor for probability in self.probabilities)
+
+        stock_prices = self._get_stock_prices(self.period_count)
+        prices = self.option.get_payouts(stock_prices, stock_prices)
+
+        for level in reversed(range(self.period_count)):
+            size = 2 * level + 1
+            prices = prices[:size] * up_weight + prices[1:size + 1] * middle_weight + prices[2:size + 2] * down_weight
+
+            if early_exercise:
+                stock_prices = self._get_stock_prices(level)
+                np.maximum(prices, self.option.get_payouts(stock_prices, stock_prices), out=prices)
+
+        return prices[0]
+
+    def _get_stock_prices(self, level):
+        return self.stock_price * self.up_factor ** np.arange(level, -level - 1, -1, dtype=float)